@@ -1,13 +1,15 @@
 # -*- coding: utf-8 -*-
-try:
-    import RPi.GPIO as GPIO
-except ImportError:
-    raise ImportError(
-        "You probably have to install RPi.GPIO"
-    )
+import collections
+import gc
+import threading
 import time
 import logging
 
+from hx711.ringbuffer import RingBuffer
+from hx711.samples import FAILURE_FLAGS, SampleBuffer
+# hx711.stats, hx711.metrics and hx711.replay are imported where they are used,
+# so "import hx711" does not import NumPy or http.server
+
 logger = logging.getLogger(__name__)
 
 __author__ = """Marco Roose"""
@@ -15,6 +17,168 @@ __email__ = 'marco.roose@gmx.de'
 __version__ = '1.1.2'
 
 
+def _import_rpi_gpio():
+    """
+    import RPi.GPIO on demand, so that other GPIO backends can be used without it
+
+    :return: the RPi.GPIO module
+    :raises ImportError
+    """
+    try:
+        import RPi.GPIO as GPIO
+    except ImportError:
+        raise ImportError(
+            "You probably have to install RPi.GPIO"
+        )
+    return GPIO
+
+
+def _decode(data_in):
+    """
+    validate a 24 bit word from the HX711 and convert it from 2's complement
+
+    :param data_in: the bits as they have come
+    :type data_in: int
+    :return: the signed value or False if the value is invalid
+    :rtype: int
+    """
+    # 0x800000 is the lowest
+    # 0x7fffff is the highest possible value from HX711
+    if data_in == 0x7fffff or data_in == 0x800000:
+        return False
+    if data_in & 0x800000:
+        return data_in - 0x1000000
+    return data_in
+
+
+class _FrameTimer(object):
+    """
+    Checks the timing of a whole frame instead of every single clock pulse.
+
+    A single pulse of 60µs or more makes a frame at least 60µs slower than the
+    usual frame, so such frames are rejected. Several small delays adding up
+    to 60µs are rejected as well, which is on the safe side. The usual frame
+    time is a running median, so rejected frames do not distort it.
+
+    There is no usual frame time to compare the first frame with. It is only
+    accepted if it took less than 60µs in total. A frame which is faster than
+    the usual one by 60µs or more shows that the usual time came from a slowed
+    down frame, so it replaces the usual time.
+    """
+    # relative step of the running median per frame
+    step = 0.02
+
+    def __init__(self, limit=0.00006):
+        """
+        :param limit: the HX711 powers down if PD_SCK is high for this time in seconds
+        :type limit: float
+        """
+        self.limit = limit
+        self.usual = None
+
+    def check(self, time_elapsed):
+        """
+        :param time_elapsed: time it took to clock out the frame
+        :type time_elapsed: float
+        :return: True if no clock pulse can have been too long
+        :rtype: bool
+        """
+        usual = self.usual
+        if usual is None:
+            self.usual = time_elapsed
+            return time_elapsed < self.limit
+        if usual - time_elapsed >= self.limit:
+            self.usual = time_elapsed
+            return True
+        if time_elapsed > usual:
+            self.usual = usual * (1 + self.step)
+        else:
+            self.usual = usual * (1 - self.step)
+        if time_elapsed - usual >= self.limit:
+            if logging.root.isEnabledFor(logging.DEBUG):
+                logging.debug('Reading data took {:0.8f}s longer than usual.'.format(time_elapsed - usual))
+            return False
+        return True
+
+
+class _ConversionClock(object):
+    """
+    Learns the conversion period of the HX711 from the times DOUT went low,
+    to predict when the next conversion will be ready.
+
+    Readings may skip conversions, so the time between two observed ready
+    edges is divided by the number of periods it spans. The period is a
+    running average of that.
+    """
+    # weight of a new observation in the running average, the first ones are averaged evenly
+    weight = 0.1
+    # conversion periods of the RATE pin set low (10 SPS) or high (80 SPS)
+    nominal_periods = (0.1, 0.0125)
+    # a longer time between two observations cannot be a single period
+    max_period = 0.15
+
+    def __init__(self):
+        self.period = None
+        self.last_ready = None
+        self._periods_observed = 0
+
+    def observe(self, ready_time):
+        """
+        :param ready_time: time.perf_counter() when DOUT went low
+        :type ready_time: float
+        """
+        last_ready = self.last_ready
+        self.last_ready = ready_time
+        if last_ready is None:
+            return
+        elapsed = ready_time - last_ready
+        period = self.period
+        if period is None or elapsed < 0.75 * period:
+            # the first period, or the one before spanned several periods
+            if elapsed <= self.max_period:
+                self.period = elapsed
+                self._periods_observed = 1
+            return
+        periods = round(elapsed / period)
+        measured = elapsed / periods
+        # ignore outliers, e.g. after a power down or a change of the setting
+        if abs(measured - period) < 0.1 * period:
+            self._periods_observed += 1
+            self.period = period + max(self.weight, 1 / self._periods_observed) * (measured - period)
+
+    def reset(self):
+        """
+        forget the phase of the conversions, e.g. after a power down. The period stays.
+        """
+        self.last_ready = None
+
+    def next_ready(self, now, margin=0.0):
+        """
+        :param now: time.perf_counter()
+        :type now: float
+        :param margin: a conversion expected up to margin seconds ago is still the next one
+        :type margin: float
+        :return: when the next conversion is expected, None if that is not known yet
+        :rtype: float
+        """
+        if self.period is None or self.last_ready is None:
+            return None
+        periods = max(1, -(-(now - margin - self.last_ready) // self.period))
+        return self.last_ready + periods * self.period
+
+    @property
+    def drift(self):
+        """
+        relative deviation of the conversion period from the nearest nominal period
+
+        :rtype: float
+        """
+        if self.period is None:
+            return None
+        nominal = min(self.nominal_periods, key=lambda nominal: abs(nominal - self.period))
+        return nominal / self.period - 1
+
+
 class GenericHX711Exception(Exception):
     pass
 
@@ -23,20 +187,75 @@ class ParameterValidationError(Exception):
     pass
 
 
+ReadResult = collections.namedtuple('ReadResult', ['values', 'status', 'failures'])
+ReadResult.__doc__ = """
+result of HX711.read_with_deadline and HX711.read_best_effort
+
+status is "ok" if all values requested were read. Otherwise it tells why not:
+"not_ready" if the HX711 had no data ready for longer than a conversion at
+10 SPS takes, "invalid", "timing_violation" or "unsettled" if the last reading
+was rejected for that reason, or "timeout" if the time was up while waiting for data.
+failures counts the rejected readings by reason.
+"""
+
+
 class HX711(object):
     # definitions for the hardware
     # defaults
     _channel = "A"
     _channel_a_gain = 64
+    _wait_mode = "poll"
+    _read_mode = "normal"
+    # number of PD_SCK pulses after the 24 data bits for channel A with gain 64
+    _gain_pulses = 3
     # properties
     _valid_channels = ['A', 'B']
     _valid_gains_for_channel_A = [64, 128]
+    _valid_wait_modes = ['poll', 'edge', 'predict']
+    _valid_read_modes = ['normal', 'fast']
+    # time between two checks of DOUT in "poll" mode
+    _poll_interval = 0.01
+    # longest single wait for the falling edge of DOUT in "edge" mode.
+    # DOUT may fall right before the wait starts, so do not wait much longer than that.
+    _edge_wait_slice = 0.005
+    # in "predict" mode sleep until this long before the next conversion is expected, then poll without sleeping
+    _spin_time = 0.0003
+    # in "predict" mode sleep this long between two checks of DOUT while the next conversion is not known
+    _predict_poll_interval = 0.0005
+    # running average of how much later than requested time.sleep() returns
+    _sleep_overshoot = 0.0
     # define the minimum and maximum count for measures for an aggregated measure
     # this prevents the function from running for too long
     min_measures = 2
     max_measures = 100
+    # continuous acquisition
+    stream_buffer = None
+    _stream_thread = None
+    # the exception which has ended the acquisition thread, raised again by iter_stream
+    stream_error = None
+    realtime_report = None
+    # counters and histograms of the readings, see enable_metrics
+    metrics = None
+    # why the last reading was rejected: "not_ready", "timing_violation", "invalid" or "unsettled"
+    _last_failure = None
+    # the bits of the last reading as they have come
+    _last_word = 0
+    # hx711.replay.FrameRecorder capturing every reading, see record_frames
+    recorder = None
+    # the output settles within 4 conversions after power up or a change of channel or gain,
+    # 400ms at 10 SPS, 50ms at 80 SPS
+    _settling_conversions = 4
+    # no data ready for this long means the HX711 is not connected or powered down.
+    # A conversion takes 100ms at 10 SPS.
+    _not_ready_timeout = 0.25
+    # readings to reject because the HX711 may have powered down and its output is not settled yet,
+    # see _restart_settling
+    _unsettled = 0
+    # disable the cyclic garbage collector while clocking out a reading, see hx711.realtime
+    suspend_gc = False
 
-    def __init__(self, dout_pin, pd_sck_pin, gain=128, channel='A'):
+    def __init__(self, dout_pin, pd_sck_pin, gain=128, channel='A', gpio=None, wait_mode='poll',
+                 read_mode='normal'):
         """
         :param dout_pin: GPIO DOUT is connected to
         :type dout_pin: int
@@ -46,6 +265,12 @@ class HX711(object):
         :type gain: int
         :param channel: selected channel
         :type channel: str
+        :param gpio: GPIO backend with the RPi.GPIO interface, defaults to RPi.GPIO
+        :param wait_mode: how to wait for data: "poll" DOUT every 10ms, wait for its falling "edge"
+            or "predict" the next conversion from the ones before and sleep until right before it
+        :type wait_mode: str
+        :param read_mode: "normal" checks the timing of every clock pulse, "fast" checks it once per reading
+        :type read_mode: str
         """
         if (isinstance(dout_pin, int) and
             isinstance(pd_sck_pin, int)):  # just check of it is integer
@@ -56,9 +281,18 @@ class HX711(object):
                             + str(dout_pin) + \
                             ' and pd_sck_pin: ' + str(pd_sck_pin) + '\n')
 
-        GPIO.setmode(GPIO.BCM)  # set pin mode to BCM numbering (GPIO numbers, not board pins)
-        GPIO.setup(self._pd_sck, GPIO.OUT)  # pin _pd_sck is output only
-        GPIO.setup(self._dout, GPIO.IN)  # pin _dout is input only
+        if gpio is None:
+            gpio = _import_rpi_gpio()
+        self._gpio = gpio
+
+        self._gpio.setmode(self._gpio.BCM)  # set pin mode to BCM numbering (GPIO numbers, not board pins)
+        self._gpio.setup(self._pd_sck, self._gpio.OUT)  # pin _pd_sck is output only
+        self._gpio.setup(self._dout, self._gpio.IN)  # pin _dout is input only
+        self._edge_detection = True
+        self._conversion_clock = _ConversionClock()
+        self.wait_mode = wait_mode
+        self.read_mode = read_mode
+        self._frame_timer = _FrameTimer()
         self.channel = channel
         self.channel_a_gain = gain
 
@@ -68,8 +302,10 @@ class HX711(object):
 
     @channel.setter
     def channel(self, channel):
+        self._check_not_streaming()
         self._validate_channel_name(channel)
         self._channel = channel
+        self._update_gain_pulses()
         self._apply_setting()
 
     @property
@@ -78,9 +314,11 @@ class HX711(object):
 
     @channel_a_gain.setter
     def channel_a_gain(self, channel_a_gain):
+        self._check_not_streaming()
         if self.channel == "A":
             self._validate_gain_A_value(channel_a_gain)
             self._channel_a_gain = channel_a_gain
+            self._update_gain_pulses()
             self._apply_setting()
         else:
             logging.warning(
@@ -88,28 +326,118 @@ class HX711(object):
                 """ current channel is '{channel}'""".format(channel=self.channel)
             )
 
-    def power_down(self):
+    @property
+    def wait_mode(self):
+        return self._wait_mode
+
+    @wait_mode.setter
+    def wait_mode(self, wait_mode):
+        self._validate_wait_mode(wait_mode)
+        self._wait_mode = wait_mode
+
+    @property
+    def sample_rate(self):
+        """
+        conversions per second measured in "predict" wait mode, None until measured
+
+        :rtype: float
+        """
+        period = self._conversion_clock.period
+        if period is None:
+            return None
+        return 1 / period
+
+    @property
+    def rate_drift(self):
+        """
+        relative deviation of the measured sample rate from 10 or 80 SPS, None until measured
+
+        :rtype: float
+        """
+        return self._conversion_clock.drift
+
+    @property
+    def read_mode(self):
+        return self._read_mode
+
+    @read_mode.setter
+    def read_mode(self, read_mode):
+        self._validate_read_mode(read_mode)
+        self._read_mode = read_mode
+
+    @staticmethod
+    def _pulses_for_setting(channel, channel_a_gain):
+        """
+        the number of pulses after the data bits selects channel and gain of the next reading.
+
+        :type channel: str
+        :type channel_a_gain: int
+        :rtype: int
+        """
+        if channel == 'A' and channel_a_gain == 128:
+            return 1  # send one bit
+        elif channel == 'A' and channel_a_gain == 64:
+            return 3  # send three bits
+        else:
+            return 2  # send two bits
+
+    def _update_gain_pulses(self):
+        """
+        Compute the number of pulses once when the setting changes instead of on every reading.
+        """
+        self._gain_pulses = self._pulses_for_setting(self._channel, self._channel_a_gain)
+
+    def power_down(self, wait=True):
         """
         turn off the HX711
+        :param wait: sleep 10ms. Without, the HX711 powers down 60µs after the return.
+        :type wait: bool
         :return: always True
         :rtype bool
         """
-        GPIO.output(self._pd_sck, False)
-        GPIO.output(self._pd_sck, True)
-        time.sleep(0.01)
+        self._gpio.output(self._pd_sck, False)
+        self._gpio.output(self._pd_sck, True)
+        self._conversion_clock.reset()
+        if wait:
+            time.sleep(0.01)
         return True
 
-    def power_up(self):
+    def power_up(self, wait=True):
         """
         power up the HX711
 
+        :param wait: sleep 10ms. Without, the first conversion is ready one conversion period after the return.
+        :type wait: bool
         :return: always True
         :rtype bool
         """
-        GPIO.output(self._pd_sck, False)
-        time.sleep(0.01)
+        self._gpio.output(self._pd_sck, False)
+        if wait:
+            time.sleep(0.01)
         return True
 
+    def conversions_to_discard(self):
+        """
+        how many conversions after power up are not settled for the current channel and gain.
+
+        The HX711 powers up with channel A and gain 128 and its output settles within 4 conversions.
+        Another setting is selected by the first reading and needs 4 more conversions.
+
+        :rtype: int
+        """
+        if self._channel == 'A' and self._channel_a_gain == 128:
+            return self._settling_conversions - 1
+        return self._settling_conversions
+
+    def _restart_settling(self):
+        """
+        the HX711 may have powered down during the last reading and reset to channel A and gain 128.
+
+        The pulses of the next reading select the channel and gain again, the readings until
+        the output has settled are rejected as "unsettled", see conversions_to_discard.
+        """
+        self._unsettled = self.conversions_to_discard()
+
     def reset(self):
         """
         reset the HX711 and prepare it for 	the next reading
@@ -162,6 +490,26 @@ class HX711(object):
         if gain_A not in self._valid_gains_for_channel_A:
             raise ParameterValidationError("{gain_A} is not a valid gain".format(gain_A=gain_A))
 
+    def _validate_wait_mode(self, wait_mode):
+        """
+        validate a given wait mode
+
+        :type wait_mode: str
+        :raises: ParameterValidationError
+        """
+        if wait_mode not in self._valid_wait_modes:
+            raise ParameterValidationError("{wait_mode} is not a valid wait mode".format(wait_mode=wait_mode))
+
+    def _validate_read_mode(self, read_mode):
+        """
+        validate a given read mode
+
+        :type read_mode: str
+        :raises: ParameterValidationError
+        """
+        if read_mode not in self._valid_read_modes:
+            raise ParameterValidationError("{read_mode} is not a valid read mode".format(read_mode=read_mode))
+
     def _apply_setting(self):
         """
         Setting the channel and gain bits at the end of the "conversation" configures the chip for the next reading.
@@ -169,6 +517,7 @@ class HX711(object):
         :return: True if successful
         :rtype bool
         """
+        self._check_not_streaming()
         # after changing channel or gain we have to wait >50ms to allow adjustment.
         # the data before is garbage and cannot be used.
         self._read()
@@ -182,12 +531,117 @@ class HX711(object):
         :rtype bool
         """
 
-        _is_ready = GPIO.input(self._dout) == 0
-        logging.debug("check data ready for reading: {result}".format(
-            result="YES" if _is_ready is True else "NO"
-        ))
+        _is_ready = self._gpio.input(self._dout) == 0
+        if logging.root.isEnabledFor(logging.DEBUG):
+            logging.debug("check data ready for reading: {result}".format(
+                result="YES" if _is_ready is True else "NO"
+            ))
         return _is_ready
 
+    def _wait_for_ready(self, max_tries=40):
+        """
+        wait until the HX711 has data ready for reading
+
+        The timeout is the same in all wait modes: max_tries times the poll interval.
+        :param max_tries: how often to poll DOUT in "poll" mode
+        :type max_tries: int
+        :return True if data is ready, False on timeout
+        :rtype bool
+        """
+        if self._wait_mode == 'edge':
+            return self._wait_for_falling_edge(timeout=max_tries * self._poll_interval)
+        if self._wait_mode == 'predict':
+            return self._wait_for_predicted_ready(timeout=max_tries * self._poll_interval)
+
+        # init the counter
+        ready_counter = 0
+
+        # loop until HX711 is ready
+        # halt when maximum number of tries is reached
+        while self._ready() is False:
+            time.sleep(self._poll_interval)  # sleep for 10ms before next try
+            ready_counter += 1  # increment counter
+            # check loop count
+            # and stop when defined maximum is reached
+            if ready_counter >= max_tries:
+                logging.debug('self._read() not ready after 40 trials\n')
+                return False
+        return True
+
+    def _wait_for_falling_edge(self, timeout):
+        """
+        wait for DOUT to go low using the edge detection of the GPIO backend.
+        Falls back to tight polling if edge detection is not available.
+
+        :param timeout: timeout in seconds
+        :type timeout: float
+        :return True if data is ready, False on timeout
+        :rtype bool
+        """
+        deadline = time.perf_counter() + timeout
+        while self._ready() is False:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                logging.debug('self._read() not ready after {:0.3f}s\n'.format(timeout))
+                return False
+            if self._edge_detection:
+                try:
+                    self._gpio.wait_for_edge(
+                        self._dout,
+                        self._gpio.FALLING,
+                        timeout=max(1, int(min(remaining, self._edge_wait_slice) * 1000))
+                    )
+                except (RuntimeError, AttributeError) as exception:
+                    logging.warning(
+                        'edge detection on DOUT is not available, falling back to polling: {exception}'.format(
+                            exception=exception
+                        )
+                    )
+                    self._edge_detection = False
+        return True
+
+    def _wait_for_predicted_ready(self, timeout):
+        """
+        sleep until shortly before the next conversion is expected, then poll DOUT without sleeping.
+        The times DOUT is seen going low teach the conversion period.
+
+        :param timeout: timeout in seconds
+        :type timeout: float
+        :return True if data is ready, False on timeout
+        :rtype bool
+        """
+        perf_counter = time.perf_counter
+        clock = self._conversion_clock
+        spin_time = self._spin_time
+        last_high = None
+        deadline = perf_counter() + timeout
+        while self._ready() is False:
+            now = perf_counter()
+            last_high = now
+            if now >= deadline:
+                logging.debug('self._read() not ready after {:0.3f}s\n'.format(timeout))
+                return False
+            expected = clock.next_ready(now, margin=spin_time)
+            if expected is None or now > expected + spin_time:
+                # not learned yet, or the conversion is late
+                time.sleep(min(self._predict_poll_interval, deadline - now))
+                continue
+            # wake up early enough despite the usual delay of the scheduler
+            wake_up = min(expected - spin_time - 2 * self._sleep_overshoot, deadline)
+            if now < wake_up:
+                time.sleep(wake_up - now)
+                overshoot = perf_counter() - wake_up
+                self._sleep_overshoot += 0.1 * (overshoot - self._sleep_overshoot)
+        ready_time = perf_counter()
+        if last_high is not None:
+            # only a DOUT seen high right before tells when the conversion was ready
+            if ready_time - last_high <= 2 * max(spin_time, self._predict_poll_interval):
+                clock.observe((last_high + ready_time) / 2)
+            else:
+                # the conversion was earlier than expected, learn its time anew
+                clock.reset()
+        return True
+
     def _set_channel_gain(self, num):
         """
         Finish data transmission from HX711 by setting
@@ -207,22 +661,22 @@ class HX711(object):
         for _ in range(num):
             logging.debug("_set_channel_gain called")
             start_counter = time.perf_counter()  # start timer now.
-            GPIO.output(self._pd_sck, True)  # set high
-            GPIO.output(self._pd_sck, False)  # set low
+            self._gpio.output(self._pd_sck, True)  # set high
+            self._gpio.output(self._pd_sck, False)  # set low
             end_counter = time.perf_counter()  # stop timer
             time_elapsed = float(end_counter - start_counter)
             # check if HX711 did not turn off...
             # if pd_sck pin is HIGH for 60µs or more the HX 711 enters power down mode.
-            if time_elapsed >= 0.00006:
+            if time_elapsed >= self._frame_timer.limit:
                 logging.warning(
                     'setting gain and channel took more than 60µs. '
                     'Time elapsed: {:0.8f}'.format(time_elapsed)
                 )
                 # hx711 has turned off. First few readings are inaccurate.
                 # Despite this reading was ok and data can be used.
-                result = self.get_raw_data(times=6)  # set for the next reading.
-                if result is False:
-                    raise GenericHX711Exception("channel was not set properly")
+                if self.metrics is not None:
+                    self.metrics.power_down_recoveries += 1
+                self._restart_settling()
         return True
 
     def _read(self, max_tries=40):
@@ -235,20 +689,75 @@ class HX711(object):
         :rtype: int
         """
         # start by pulling the clock line low
-        GPIO.output(self._pd_sck, False)
-        # init the counter
-        ready_counter = 0
+        self._gpio.output(self._pd_sck, False)
+        start_counter = time.perf_counter()
+        ready = self._wait_for_ready(max_tries=max_tries)
+        return self._finish_read(ready, start_counter)
 
-        # loop until HX711 is ready
-        # halt when maximum number of tries is reached
-        while self._ready() is False:
-            time.sleep(0.01)  # sleep for 10ms before next try
-            ready_counter += 1  # increment counter
-            # check loop count
-            # and stop when defined maximum is reached
-            if ready_counter >= max_tries:
-                logging.debug('self._read() not ready after 40 trials\n')
-                return False
+    def _finish_read(self, ready, start_counter):
+        """
+        clock out the reading once the wait for it has ended and update "metrics" and "recorder".
+        PD_SCK has to be low since the wait has started.
+
+        :param ready: True if the data is ready, False if the wait has timed out
+        :type ready: bool
+        :param start_counter: time.perf_counter() when the wait has started
+        :type start_counter: float
+        :return raw data
+        :rtype: int
+        """
+        metrics = self.metrics
+        recorder = self.recorder
+        timed = metrics is not None or recorder is not None
+        if timed:
+            ready_counter = time.perf_counter()
+        if metrics is not None:
+            metrics.ready_wait.observe(ready_counter - start_counter)
+            if not ready:
+                metrics.ready_timeouts += 1
+        if not ready:
+            self._last_failure = "not_ready"
+            if recorder is not None:
+                recorder.record(0, ready_counter - start_counter, 0, self._gain_pulses, self._last_failure)
+            return False
+
+        unsettled = self._unsettled
+        if unsettled:
+            # a timing violation while clocking out restarts the count
+            self._unsettled = unsettled - 1
+        if self.suspend_gc and gc.isenabled():
+            gc.disable()
+            try:
+                data = self._clock_out()
+            finally:
+                gc.enable()
+        else:
+            data = self._clock_out()
+        if unsettled and data is not False:
+            if metrics is not None:
+                metrics.unsettled_readings += 1
+            self._last_failure = "unsettled"
+            data = False
+
+        if timed:
+            done_counter = time.perf_counter()
+        if metrics is not None:
+            metrics.clock_out.observe(done_counter - ready_counter)
+            metrics.reads += 1
+        if recorder is not None:
+            recorder.record(self._last_word, ready_counter - start_counter, done_counter - ready_counter,
+                            self._gain_pulses, None if data is not False else self._last_failure)
+        return data
+
+    def _clock_out(self):
+        """
+        clock out and validate one reading. The data has to be ready.
+
+        :return raw data
+        :rtype: int
+        """
+        if self._read_mode == 'fast':
+            return self._clock_out_fast()
 
         data_in = 0  # 2's complement data from hx 711
         # read first 24 bits of data
@@ -256,28 +765,33 @@ class HX711(object):
             # start timer
             start_counter = time.perf_counter()
             # request next bit from HX711
-            GPIO.output(self._pd_sck, True)
-            GPIO.output(self._pd_sck, False)
+            self._gpio.output(self._pd_sck, True)
+            self._gpio.output(self._pd_sck, False)
             # stop timer
             end_counter = time.perf_counter()
             time_elapsed = float(end_counter - start_counter)
 
             # check if the hx711 did not turn off:
             # if pd_sck pin is HIGH for 60 us or more than the HX711 enters power down mode.
-            if time_elapsed >= 0.00006:
+            if time_elapsed >= self._frame_timer.limit:
                 logging.debug('Reading data took longer than 60µs. Time elapsed: {:0.8f}'.format(time_elapsed))
+                # finish the frame, so the next reading does not start in the middle of this one
+                for _ in range(23 - i + self._gain_pulses):
+                    self._gpio.output(self._pd_sck, True)
+                    self._gpio.output(self._pd_sck, False)
+                if self.metrics is not None:
+                    self.metrics.timing_violations += 1
+                self._last_failure = "timing_violation"
+                self._last_word = data_in
+                self._restart_settling()
                 return False
 
             # Shift the bits in to data_in variable.
             # Left shift by one bit then bitwise OR with the new bit.
-            data_in = (data_in << 1) | GPIO.input(self._dout)
+            data_in = (data_in << 1) | self._gpio.input(self._dout)
 
-        if self.channel == 'A' and self.channel_a_gain == 128:
-            self._set_channel_gain(num=1)  # send one bit
-        elif self.channel == 'A' and self.channel_a_gain == 64:
-            self._set_channel_gain(num=3)  # send three bits
-        else:
-            self._set_channel_gain(num=2)  # send two bits
+        self._last_word = data_in
+        self._set_channel_gain(num=self._gain_pulses)
 
         logging.debug('Binary value as it has come: ' + str(bin(data_in)))
 
@@ -286,6 +800,9 @@ class HX711(object):
         # 0x7fffff is the highest possible value from HX711
         if data_in == 0x7fffff or data_in == 0x800000:
             logging.debug('Invalid data detected: ' + str(data_in))
+            if self.metrics is not None:
+                self.metrics.invalid_frames += 1
+            self._last_failure = "invalid"
             return False
 
         # calculate int from 2's complement
@@ -299,22 +816,387 @@ class HX711(object):
 
         return signed_data
 
-    def get_raw_data(self, times=5):
+    def _clock_out_fast(self):
+        """
+        same as _clock_out, but with as little work as possible while PD_SCK is toggled:
+        GPIO functions are bound to locals, there is no logging and the timing
+        is checked once for the whole frame instead of for every pulse, see _FrameTimer.
+        :return raw data
+        :rtype: int
+        """
+        output = self._gpio.output
+        read_input = self._gpio.input
+        pd_sck = self._pd_sck
+        dout = self._dout
+        perf_counter = time.perf_counter
+
+        data_in = 0
+        start_counter = perf_counter()
+        for _ in range(24):
+            output(pd_sck, True)
+            output(pd_sck, False)
+            data_in = (data_in << 1) | read_input(dout)
+        for _ in range(self._gain_pulses):
+            output(pd_sck, True)
+            output(pd_sck, False)
+        time_elapsed = perf_counter() - start_counter
+        self._last_word = data_in
+
+        if not self._frame_timer.check(time_elapsed):
+            if self.metrics is not None:
+                self.metrics.timing_violations += 1
+            self._last_failure = "timing_violation"
+            self._restart_settling()
+            return False
+        data = _decode(data_in)
+        if data is False:
+            if self.metrics is not None:
+                self.metrics.invalid_frames += 1
+            self._last_failure = "invalid"
+        return data
+
+    def enable_metrics(self, labels=None):
+        """
+        count and time the readings from now on
+
+        :param labels: Prometheus labels of the metrics, defaults to the DOUT pin
+        :type labels: dict
+        :return: the metrics
+        :rtype: hx711.metrics.Metrics
+        """
+        from hx711.metrics import Metrics
+        if labels is None:
+            labels = {"dout": self._dout}
+        self.metrics = Metrics(labels=labels)
+        return self.metrics
+
+    def disable_metrics(self):
+        self.metrics = None
+
+    def record_frames(self, file):
         """
-        do some readings and aggregate them using the defined statistics function
+        write the raw frames of all readings from now on to a file, to be replayed with hx711.replay.ReplayGPIO
 
-        :param times: how many measures to aggregate
+        :param file: path of the file to create, or a binary file object to write to
+        :type file: str or file
+        :return: the recorder
+        :rtype: hx711.replay.FrameRecorder
+        """
+        self.stop_recording()
+        from hx711.replay import FrameRecorder
+        self.recorder = FrameRecorder(file)
+        return self.recorder
+
+    def stop_recording(self):
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+
+    def get_raw_data(self, times=5, as_array=False, timeout=None):
+        """
+        do some readings and return the raw values, see hx711.stats to aggregate them
+
+        :param times: how many values to read
         :type times: int
-        :return: the aggregate of the measured values
-        :rtype float
+        :param as_array: return an int32 NumPy array (array('i') without NumPy) instead of a list
+        :type as_array: bool
+        :param timeout: give up after this many seconds, None to retry until all values are read
+        :type timeout: float
+        :return: the measured values
+        :rtype list
+        :raises GenericHX711Exception: if not all values were read within the timeout
         """
 
         self._validate_measure_count(times)
+        self._check_not_streaming()
 
-        data_list = []
-        while len(data_list) < times:
-            data = self._read()
-            if data not in [False, -1]:
-                data_list.append(data)
+        if timeout is not None:
+            result = self.read_with_deadline(times=times, timeout=timeout)
+            if result.status != "ok":
+                raise GenericHX711Exception(
+                    "got {count} of {times} values within {timeout}s: {status}".format(
+                        count=len(result.values), times=times, timeout=timeout, status=result.status
+                    )
+                )
+            data_list = result.values
+        else:
+            data_list = []
+            while len(data_list) < times:
+                data = self._read()
+                if data is not False and data != -1:
+                    data_list.append(data)
+                elif self.metrics is not None:
+                    self.metrics.retries += 1
 
+        if as_array:
+            from hx711 import stats
+            return stats.to_array(data_list)
         return data_list
+
+    def read_with_deadline(self, times=5, timeout=1.0):
+        """
+        read up to "times" values, but never take longer than timeout.
+
+        Waiting for data is cut short to the time left. A HX711 without data
+        ready for longer than a conversion takes is given up on at once
+        instead of waiting until the timeout.
+
+        :param times: how many values, None for as many as possible
+        :type times: int
+        :param timeout: time budget in seconds
+        :type timeout: float
+        :return: the values read, even if not all, with the status
+        :rtype: ReadResult
+        """
+        self._check_not_streaming()
+        perf_counter = time.perf_counter
+        deadline = perf_counter() + timeout
+        values = []
+        failures = collections.Counter()
+        status = "timeout"
+        while times is None or len(values) < times:
+            remaining = deadline - perf_counter()
+            if remaining <= 0:
+                break
+            not_ready_tries = self._not_ready_timeout / self._poll_interval
+            max_tries = int(min(remaining / self._poll_interval, not_ready_tries))
+            if max_tries == 0 and not self._ready():
+                # no time to wait for the next conversion
+                break
+            data = self._read(max_tries=max(1, max_tries))
+            if data is not False and data != -1:
+                values.append(data)
+                status = "timeout"
+                continue
+            failure = self._last_failure if data is False else "invalid"
+            failures[failure] += 1
+            if self.metrics is not None:
+                self.metrics.retries += 1
+            if failure == "not_ready" and max_tries >= not_ready_tries:
+                status = failure
+                break
+            if failure != "not_ready":
+                status = failure
+        else:
+            status = "ok"
+        if times is None and values:
+            status = "ok"
+        return ReadResult(values, status, dict(failures))
+
+    def read_samples(self, times=5, samples=None):
+        """
+        do "times" readings and store them with timestamp, channel, gain and status, failed ones included
+
+        :param times: how many readings
+        :type times: int
+        :param samples: the buffer to append to, None for a new one
+        :type samples: hx711.samples.SampleBuffer
+        :return: the buffer
+        :rtype: hx711.samples.SampleBuffer
+        """
+        self._check_not_streaming()
+        if samples is None:
+            samples = SampleBuffer()
+        monotonic_ns = time.monotonic_ns
+        append = samples.append
+        for _ in range(times):
+            # the setting of this reading, the pulses of _read select the next one
+            channel = self._channel
+            gain = 32 if channel == 'B' else self._channel_a_gain
+            data = self._read()
+            timestamp = monotonic_ns()
+            if data is False:
+                append(timestamp, 0, channel, gain, FAILURE_FLAGS[self._last_failure])
+            else:
+                append(timestamp, data, channel, gain, 0)
+        return samples
+
+    def read_best_effort(self, timeout):
+        """
+        read as many values as possible within timeout
+
+        :param timeout: time budget in seconds
+        :type timeout: float
+        :return: the values with status "ok" if there is at least one
+        :rtype: ReadResult
+        """
+        return self.read_with_deadline(times=None, timeout=timeout)
+
+    @property
+    def streaming(self):
+        return self._stream_thread is not None
+
+    def _check_not_streaming(self):
+        """
+        the acquisition thread owns the HX711 while streaming
+
+        :raises GenericHX711Exception
+        """
+        if self._stream_thread is not None:
+            raise GenericHX711Exception("HX711 is streaming, stop the stream first")
+
+    def start_stream(self, buffer_size=1024, realtime=None):
+        """
+        start a thread reading every conversion into the ring buffer "stream_buffer"
+
+        :param buffer_size: how many samples to keep
+        :type buffer_size: int
+        :param realtime: realtime settings applied to the thread, the outcome is stored in "realtime_report"
+        :type realtime: hx711.realtime.RealtimeMode
+        :return: the ring buffer
+        :rtype: RingBuffer
+        :raises GenericHX711Exception
+        """
+        self._check_not_streaming()
+        self.stream_buffer = RingBuffer(buffer_size, 'i')
+        self.stream_error = None
+        self._stream_stop = threading.Event()
+        self._stream_thread = threading.Thread(
+            target=self._stream_loop,
+            args=(realtime,),
+            name="HX711 stream dout={dout}".format(dout=self._dout),
+        )
+        self._stream_thread.daemon = True
+        self._stream_thread.start()
+        return self.stream_buffer
+
+    def stop_stream(self, timeout=None):
+        """
+        stop the acquisition thread. The samples stay in "stream_buffer".
+
+        :param timeout: how long to wait for the thread in seconds
+        :type timeout: float
+        :return: True if the thread has stopped
+        :rtype bool
+        """
+        thread = self._stream_thread
+        if thread is None:
+            return True
+        self._stream_stop.set()
+        thread.join(timeout)
+        if thread.is_alive():
+            return False
+        self._stream_thread = None
+        return True
+
+    def _stream_loop(self, realtime=None):
+        """
+        body of the acquisition thread
+        """
+        suspend_gc = self.suspend_gc
+        if realtime is not None:
+            self.realtime_report = realtime.apply(self)
+        append = self.stream_buffer.append
+        stop = self._stream_stop
+        try:
+            while not stop.is_set():
+                data = self._read()
+                if data is not False and data != -1:
+                    append(data)
+        except Exception as error:
+            logging.warning('The stream of dout={dout} has ended: {error}'.format(dout=self._dout, error=error))
+            self.stream_error = error
+            self._stream_thread = None
+        finally:
+            # the realtime settings end with the thread
+            self.suspend_gc = suspend_gc
+
+    def latest(self, n=1):
+        """
+        get the latest n streamed samples without waiting for a conversion
+
+        :param n: how many samples
+        :type n: int
+        :rtype: array
+        :raises GenericHX711Exception
+        """
+        if self.stream_buffer is None:
+            raise GenericHX711Exception("no stream has been started")
+        return self.stream_buffer.latest(n)
+
+    def iter_stream(self, poll_interval=0.001, stop=None):
+        """
+        iterate over new samples of the running stream until it is stopped
+
+        :param poll_interval: how long to sleep when there is no new sample
+        :type poll_interval: float
+        :param stop: end the iteration once this is set, even while no samples come
+        :type stop: threading.Event
+        :raises GenericHX711Exception: also if an error has ended the stream, see "stream_error"
+        """
+        if self.stream_buffer is None:
+            raise GenericHX711Exception("no stream has been started")
+        buffer = self.stream_buffer
+        position = buffer.count
+        while stop is None or not stop.is_set():
+            running = self._stream_thread is not None
+            values, position = buffer.since(position)
+            for value in values:
+                yield value
+            if not running:
+                if self.stream_error is not None:
+                    raise GenericHX711Exception(
+                        "the stream has ended: {error}".format(error=self.stream_error)
+                    ) from self.stream_error
+                return
+            if not values:
+                time.sleep(poll_interval)
+
+    def iter_interleaved(self, settings=(('A', 128), ('B', 32)), count=None, max_tries=40):
+        """
+        read channels and gains in turn without the settle sleep of _apply_setting.
+
+        The pulses at the end of each reading select the next setting of the schedule,
+        so each reading belongs to the setting selected by the reading before. The first
+        reading is discarded, it was converted before the schedule took effect. After a
+        timing violation the HX711 may have powered down, the readings until its output
+        has settled are rejected, see _restart_settling.
+        When the iteration ends, one more reading restores the channel and gain of the instance.
+
+        :param settings: the schedule of (channel, gain) tuples, the gain of channel B is always 32
+        :type settings: tuple
+        :param count: stop after that many values, None for no limit
+        :type count: int
+        :param max_tries: how often to try to get data for each reading
+        :type max_tries: int
+        :return: generator of (channel, gain, value) tuples
+        :raises ParameterValidationError, GenericHX711Exception
+        """
+        schedule = []
+        for channel, gain in settings:
+            self._validate_channel_name(channel)
+            if channel == 'A':
+                self._validate_gain_A_value(gain)
+            else:
+                gain = 32
+            schedule.append((channel, gain, self._pulses_for_setting(channel, gain)))
+        if not schedule:
+            raise ParameterValidationError("the schedule needs at least one setting")
+        self._check_not_streaming()
+
+        current = None  # setting of the conversion that is read next, None if it is not known
+        discard = 1  # readings to discard, the first conversion is from before the schedule
+        index = 0
+        produced = 0
+        try:
+            while count is None or produced < count:
+                selected = schedule[index % len(schedule)]
+                self._gain_pulses = selected[2]
+                data = self._read(max_tries=max_tries)
+                if data is False and self._last_failure == "not_ready":
+                    raise GenericHX711Exception("HX711 is not ready")
+                index += 1
+                if data is False and self._last_failure == "timing_violation":
+                    # the HX711 may have reset to channel A and gain 128
+                    current = None
+                    continue
+                if discard:
+                    discard -= 1
+                elif data is not False and data != -1:
+                    produced += 1
+                    yield current[0], current[1], data
+                current = selected
+        finally:
+            self._update_gain_pulses()
+            if index and (current is None or current[2] != self._gain_pulses):
+                self._read(max_tries=max_tries)
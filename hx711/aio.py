@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+asyncio front end for the HX711 class.
+
+Only clocking out the 25 to 27 bits of a reading runs synchronously, because
+its timing is critical. Waiting for data and for settings to settle yields to
+the event loop, so one process can serve many sensors.
+"""
+import asyncio
+import functools
+import time
+
+from hx711 import HX711, GenericHX711Exception
+
+
+class AsyncHX711(object):
+    """
+    awaitable readings from a HX711 instance
+    """
+    # wait this long after changing channel or gain, see HX711._apply_setting
+    settle_time = 0.5
+
+    def __init__(self, hx711, poll_interval=0.001):
+        """
+        :param hx711: the HX711 instance to read from
+        :type hx711: HX711
+        :param poll_interval: time between two checks of DOUT while waiting for data
+        :type poll_interval: float
+        """
+        self.hx711 = hx711
+        self.poll_interval = poll_interval
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    async def create(cls, *args, poll_interval=0.001, **kwargs):
+        """
+        create the HX711 instance in an executor, since applying the initial setting blocks
+
+        :param args: passed on to HX711
+        :param kwargs: passed on to HX711
+        :rtype: AsyncHX711
+        """
+        loop = asyncio.get_running_loop()
+        hx711 = await loop.run_in_executor(None, functools.partial(HX711, *args, **kwargs))
+        return cls(hx711, poll_interval=poll_interval)
+
+    @property
+    def channel(self):
+        return self.hx711.channel
+
+    @property
+    def channel_a_gain(self):
+        return self.hx711.channel_a_gain
+
+    async def wait_ready(self, timeout=0.4):
+        """
+        wait for the HX711 to pull DOUT low without blocking the event loop
+
+        :param timeout: timeout in seconds
+        :type timeout: float
+        :return: True if data is ready, False on timeout
+        :rtype: bool
+        """
+        hx711 = self.hx711
+        deadline = time.perf_counter() + timeout
+        while hx711._ready() is False:
+            if time.perf_counter() >= deadline:
+                return False
+            await asyncio.sleep(self.poll_interval)
+        return True
+
+    async def _read(self, timeout):
+        hx711 = self.hx711
+        hx711._check_not_streaming()
+        # start by pulling the clock line low, see HX711._read
+        hx711._gpio.output(hx711._pd_sck, False)
+        start_counter = time.perf_counter()
+        ready = await self.wait_ready(timeout)
+        return hx711._finish_read(ready, start_counter)
+
+    async def read(self, timeout=0.4):
+        """
+        read one value
+
+        :param timeout: how long to wait for data in seconds
+        :type timeout: float
+        :return: the raw data or False if there was no valid data
+        :rtype: int
+        """
+        async with self._lock:
+            return await self._read(timeout)
+
+    async def get_raw_data(self, times=5, max_failures=10):
+        """
+        read "times" valid values, see HX711.get_raw_data
+
+        :param times: how many values
+        :type times: int
+        :param max_failures: raise GenericHX711Exception after that many failed readings in a row
+        :type max_failures: int
+        :rtype: list
+        """
+        self.hx711._validate_measure_count(times)
+        data_list = []
+        failures = 0
+        async with self._lock:
+            while len(data_list) < times:
+                data = await self._read(0.4)
+                if data is not False and data != -1:
+                    data_list.append(data)
+                    failures = 0
+                    continue
+                failures += 1
+                if failures >= max_failures:
+                    raise GenericHX711Exception(
+                        "no valid value in {count} readings".format(count=max_failures)
+                    )
+        return data_list
+
+    def stream(self, count=None, max_failures=10):
+        """
+        iterate over valid values as they are converted: "async for value in stream()"
+
+        :param count: stop after that many values, None for an endless stream
+        :type count: int
+        :param max_failures: raise GenericHX711Exception after that many failed readings in a row
+        :type max_failures: int
+        """
+        return _SampleStream(self, count, max_failures)
+
+    async def _apply_setting(self, channel, channel_a_gain):
+        hx711 = self.hx711
+        async with self._lock:
+            hx711._check_not_streaming()
+            hx711._channel = channel
+            hx711._channel_a_gain = channel_a_gain
+            hx711._update_gain_pulses()
+            # the pulses of the next reading apply the setting, the data of it is garbage.
+            # Readings which were not ready or had a timing violation have not applied it.
+            for _ in range(3):
+                data = await self._read(0.4)
+                if data is not False or hx711._last_failure in ("invalid", "unsettled"):
+                    break
+            else:
+                raise GenericHX711Exception(
+                    "the setting was not applied: {failure}".format(failure=hx711._last_failure)
+                )
+            await asyncio.sleep(self.settle_time)
+
+    async def set_channel(self, channel):
+        """
+        change the channel without blocking the event loop
+
+        :type channel: str
+        :raises ParameterValidationError
+        """
+        self.hx711._validate_channel_name(channel)
+        await self._apply_setting(channel, self.hx711.channel_a_gain)
+
+    async def set_channel_a_gain(self, channel_a_gain):
+        """
+        change the gain of channel A without blocking the event loop
+
+        :type channel_a_gain: int
+        :raises ParameterValidationError
+        """
+        self.hx711._validate_gain_A_value(channel_a_gain)
+        await self._apply_setting(self.hx711.channel, channel_a_gain)
+
+
+class _SampleStream(object):
+    """
+    asynchronous iterator over the values of an AsyncHX711
+    """
+
+    def __init__(self, sensor, count, max_failures):
+        self._sensor = sensor
+        self._left = count
+        self._max_failures = max_failures
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._left is not None:
+            if self._left <= 0:
+                raise StopAsyncIteration
+            self._left -= 1
+        for _ in range(self._max_failures):
+            data = await self._sensor.read()
+            if data is not False and data != -1:
+                return data
+        raise GenericHX711Exception(
+            "no valid value in {count} readings".format(count=self._max_failures)
+        )
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+Throughput and timing benchmarks for the HX711 class.
+
+The benchmarks run against any GPIO backend. Timing statistics of the single
+clock pulses are only available with a simulated chip.
+"""
+import threading
+import time
+
+from hx711.simulator import create_simulated_hx711
+
+
+def summarize(values):
+    """
+    describe the distribution of some values
+
+    :param values: the values to describe
+    :type values: iterable
+    :return: count, min, mean, median, p90, p99 and max of the values
+    :rtype: dict
+    """
+    values = sorted(values)
+    count = len(values)
+    if not count:
+        return {"count": 0}
+
+    def percentile(fraction):
+        return values[min(count - 1, int(fraction * count))]
+
+    return {
+        "count": count,
+        "min": values[0],
+        "mean": sum(values) / count,
+        "median": percentile(0.5),
+        "p90": percentile(0.9),
+        "p99": percentile(0.99),
+        "max": values[-1],
+    }
+
+
+def benchmark_get_raw_data(hx711, times=10, rounds=5, chip=None):
+    """
+    measure samples/s and CPU cost of HX711.get_raw_data
+
+    :param hx711: the instance to benchmark
+    :type hx711: HX711
+    :param times: how many measures per call of get_raw_data
+    :type times: int
+    :param rounds: how often get_raw_data is called
+    :type rounds: int
+    :param chip: simulated chip connected to hx711, enables the pulse statistics
+    :type chip: SimulatedHX711
+    :return: the benchmark report
+    :rtype: dict
+    """
+    if chip is not None:
+        chip.sck_high_times.clear()
+        chip.bit_periods.clear()
+        chip.ready_latencies.clear()
+        chip.frame_times.clear()
+        power_downs = chip.power_downs
+        overruns = chip.overruns
+
+    samples = 0
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    for _ in range(rounds):
+        samples += len(hx711.get_raw_data(times=times))
+    cpu_time = time.process_time() - cpu_start
+    wall_time = time.perf_counter() - wall_start
+
+    report = {
+        "samples": samples,
+        "wall_time": wall_time,
+        "samples_per_second": samples / wall_time,
+        "cpu_time_per_sample": cpu_time / samples,
+    }
+    if chip is not None:
+        report.update({
+            "bit_period": summarize(chip.bit_periods),
+            "ready_latency": summarize(chip.ready_latencies),
+            "frame_time": summarize(chip.frame_times),
+            "sck_high_time": summarize(chip.sck_high_times),
+            "violations": chip.power_downs - power_downs,
+            "overruns": chip.overruns - overruns,
+        })
+    return report
+
+
+def compare_read_modes(times=10, rounds=5, read_modes=('normal', 'fast'), **kwargs):
+    """
+    benchmark the read modes of HX711 against a simulated chip
+
+    :param times: how many measures per call of get_raw_data
+    :type times: int
+    :param rounds: how often get_raw_data is called
+    :type rounds: int
+    :param read_modes: the read modes to compare
+    :type read_modes: tuple
+    :param kwargs: passed on to create_simulated_hx711
+    :return: the benchmark report for every read mode
+    :rtype: dict
+    """
+    reports = {}
+    for read_mode in read_modes:
+        hx711, chip = create_simulated_hx711(read_mode=read_mode, **kwargs)
+        reports[read_mode] = benchmark_get_raw_data(hx711, times=times, rounds=rounds, chip=chip)
+    return reports
+
+
+def measure_violations(hx711, frames=200, realtime=None, chip=None):
+    """
+    count the readings rejected by HX711._read in a fresh thread
+
+    :param hx711: the instance to measure
+    :type hx711: HX711
+    :param frames: how many readings
+    :type frames: int
+    :param realtime: realtime settings for the reading thread, None for none
+    :type realtime: hx711.realtime.RealtimeMode
+    :param chip: simulated chip connected to hx711, adds the power downs it saw
+    :type chip: SimulatedHX711
+    :return: the number and the rate of rejected readings and the realtime report
+    :rtype: dict
+    """
+    report = {"frames": frames, "realtime": None}
+    if chip is not None:
+        power_downs = chip.power_downs
+
+    def measure():
+        if realtime is not None:
+            report["realtime"] = realtime.apply(hx711)
+        rejected = 0
+        for _ in range(frames):
+            data = hx711._read()
+            if data is False or data == -1:
+                rejected += 1
+        report["rejected"] = rejected
+
+    # the realtime settings apply to the calling thread only
+    thread = threading.Thread(target=measure, name="HX711 violation measurement")
+    suspend_gc = hx711.suspend_gc
+    thread.start()
+    thread.join()
+    hx711.suspend_gc = suspend_gc
+    report["rejection_rate"] = report["rejected"] / frames
+    if chip is not None:
+        report["violations"] = chip.power_downs - power_downs
+    return report
+
+
+def compare_realtime(realtime, frames=200, **kwargs):
+    """
+    measure the rejected readings of a simulated chip without and with realtime settings
+
+    :param realtime: the realtime settings to compare
+    :type realtime: hx711.realtime.RealtimeMode
+    :param frames: how many readings
+    :type frames: int
+    :param kwargs: passed on to create_simulated_hx711
+    :return: the reports "default" and "realtime", see measure_violations
+    :rtype: dict
+    """
+    reports = {}
+    for name, mode in (("default", None), ("realtime", realtime)):
+        hx711, chip = create_simulated_hx711(**kwargs)
+        reports[name] = measure_violations(hx711, frames=frames, realtime=mode, chip=chip)
+    return reports
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""
+Tare, scale and conversion of raw HX711 values into a unit like gram.
+
+Offset and scale are kept per channel and gain and can be persisted in a small
+JSON file, so a restart can convert values right away instead of taring again.
+"""
+import json
+import logging
+import os
+
+from hx711 import ParameterValidationError, stats
+
+
+def _setting_key(channel, gain):
+    # channel B has a fixed gain of 32
+    if channel == 'B':
+        gain = 32
+    return "{channel}/{gain}".format(channel=channel, gain=gain)
+
+
+class Calibration(object):
+    """
+    offset and scale for every channel and gain.
+
+    A raw value is converted by (raw - offset) / scale. The conversion is
+    cached as factor and bias, so converting costs one multiplication and
+    one addition per value.
+    """
+
+    def __init__(self, path=None):
+        """
+        :param path: file to load the calibration from, if it exists, and to save it to
+        :type path: str
+        """
+        self.path = path
+        self._entries = {}
+        self._transforms = {}
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    def get(self, channel, gain):
+        """
+        :return: offset and scale of the setting, (0, 1) if it is not calibrated
+        :rtype: tuple
+        """
+        return self._entries.get(_setting_key(channel, gain), (0, 1))
+
+    def set(self, channel, gain, offset=None, scale=None):
+        """
+        change offset and/or scale of a setting
+
+        :param offset: raw value with no load
+        :type offset: float
+        :param scale: raw counts per unit
+        :type scale: float
+        :raises ParameterValidationError
+        """
+        if scale == 0:
+            raise ParameterValidationError("the scale must not be 0")
+        key = _setting_key(channel, gain)
+        old_offset, old_scale = self._entries.get(key, (0, 1))
+        self._entries[key] = (
+            old_offset if offset is None else offset,
+            old_scale if scale is None else scale,
+        )
+        self._transforms.pop(key, None)
+
+    def transform(self, channel, gain):
+        """
+        :return: factor and bias converting a raw value of the setting by raw * factor + bias
+        :rtype: tuple
+        """
+        key = _setting_key(channel, gain)
+        try:
+            return self._transforms[key]
+        except KeyError:
+            offset, scale = self._entries.get(key, (0, 1))
+            factor = 1.0 / scale
+            self._transforms[key] = transform = (factor, -offset * factor)
+            return transform
+
+    def load(self, path=None):
+        """
+        :param path: the file to load, defaults to the path given on creation
+        :type path: str
+        """
+        path = self.path if path is None else path
+        with open(path, encoding='utf-8') as f:
+            entries = json.load(f)
+        self._entries = {key: (entry["offset"], entry["scale"]) for key, entry in entries.items()}
+        self._transforms.clear()
+        logging.debug("loaded the calibration of {keys} from {path}".format(keys=sorted(entries), path=path))
+
+    def save(self, path=None):
+        """
+        write the calibration atomically, so a crash cannot leave a broken file behind
+
+        :param path: the file to write, defaults to the path given on creation
+        :type path: str
+        """
+        path = self.path if path is None else path
+        if path is None:
+            raise ValueError("no path to save the calibration to")
+        entries = {
+            key: {"offset": offset, "scale": scale} for key, (offset, scale) in self._entries.items()
+        }
+        temporary = path + ".tmp"
+        with open(temporary, "w", encoding='utf-8') as f:
+            json.dump(entries, f, indent=2, sort_keys=True)
+        os.replace(temporary, path)
+
+
+class Scale(object):
+    """
+    weighing with a HX711 and a Calibration.
+
+    With a zero band, the offset follows slow drift of the load cell: every
+    value converted by track_zero within the band around zero moves the offset
+    a little towards it.
+    """
+
+    def __init__(self, hx711, calibration=None, zero_band=0, zero_tracking_rate=0.01):
+        """
+        :param hx711: the HX711 to read from
+        :type hx711: HX711
+        :param calibration: the calibration, or a path to load it from and save it to
+        :type calibration: Calibration or str
+        :param zero_band: track the zero point while the weight is within +/- zero_band, 0 to disable
+        :type zero_band: float
+        :param zero_tracking_rate: fraction of the deviation from zero corrected per value
+        :type zero_tracking_rate: float
+        """
+        if not isinstance(calibration, Calibration):
+            calibration = Calibration(calibration)
+        if not 0 < zero_tracking_rate <= 1:
+            raise ParameterValidationError(
+                "zero_tracking_rate has to be within (0, 1]. I got: " + str(zero_tracking_rate)
+            )
+        self.hx711 = hx711
+        self.calibration = calibration
+        self.zero_band = zero_band
+        self.zero_tracking_rate = zero_tracking_rate
+
+    @property
+    def setting(self):
+        """
+        :return: the current channel and gain of the HX711
+        :rtype: tuple
+        """
+        return self.hx711.channel, self.hx711.channel_a_gain
+
+    def _save(self):
+        if self.calibration.path is not None:
+            self.calibration.save()
+
+    def tare(self, times=15, save=True):
+        """
+        take the median of "times" readings as the offset of the current setting
+
+        :param times: how many readings
+        :type times: int
+        :param save: save the calibration if it has a path
+        :type save: bool
+        :return: the new offset
+        :rtype: float
+        """
+        offset = stats.median(self.hx711.get_raw_data(times=times))
+        channel, gain = self.setting
+        self.calibration.set(channel, gain, offset=offset)
+        if save:
+            self._save()
+        return offset
+
+    def calibrate(self, known_weight, times=15, save=True):
+        """
+        determine the scale of the current setting with a known weight on the tared load cell
+
+        :param known_weight: the weight on the load cell in the unit values are converted to
+        :type known_weight: float
+        :param times: how many readings
+        :type times: int
+        :param save: save the calibration if it has a path
+        :type save: bool
+        :return: the new scale
+        :rtype: float
+        :raises ParameterValidationError
+        """
+        if not known_weight:
+            raise ParameterValidationError("the known weight must not be 0")
+        channel, gain = self.setting
+        offset, _ = self.calibration.get(channel, gain)
+        scale = (stats.median(self.hx711.get_raw_data(times=times)) - offset) / known_weight
+        self.calibration.set(channel, gain, scale=scale)
+        if save:
+            self._save()
+        return scale
+
+    def convert(self, values):
+        """
+        convert raw values of the current setting
+
+        :param values: a raw value or many of them
+        :type values: int or list or array
+        :return: the converted value, or the converted values as list (NumPy array if installed)
+        :rtype: float or list
+        """
+        factor, bias = self.calibration.transform(*self.setting)
+        if isinstance(values, (int, float)):
+            return values * factor + bias
+        if stats.numpy is not None:
+            return stats.numpy.asarray(values, dtype=stats.numpy.float64) * factor + bias
+        return [value * factor + bias for value in values]
+
+    def get_weight(self, times=5):
+        """
+        :param times: how many readings to take the median of
+        :type times: int
+        :rtype: float
+        """
+        return self.convert(stats.median(self.hx711.get_raw_data(times=times)))
+
+    def track_zero(self, value):
+        """
+        convert a raw value and move the offset towards it if the weight is within the zero band
+
+        :param value: raw value
+        :type value: int
+        :rtype: float
+        """
+        channel, gain = self.setting
+        calibration = self.calibration
+        factor, bias = calibration.transform(channel, gain)
+        weight = value * factor + bias
+        if -self.zero_band < weight < self.zero_band:
+            offset, _ = calibration.get(channel, gain)
+            calibration.set(channel, gain, offset=offset + (value - offset) * self.zero_tracking_rate)
+        return weight
+
+    def iter_weights(self, poll_interval=0.001):
+        """
+        iterate over the converted values of the running stream, tracking the zero point
+
+        :param poll_interval: how long to sleep when there is no new sample
+        :type poll_interval: float
+        """
+        for value in self.hx711.iter_stream(poll_interval=poll_interval):
+            yield self.track_zero(value)
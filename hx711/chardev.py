@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+"""
+GPIO backend on the Linux GPIO character device (/dev/gpiochipN), uAPI v2.
+
+All pins set up are requested from the kernel together as one line request,
+so the values of all DOUT pins are read with a single ioctl (input_many,
+used by MultiHX711). Data ready is detected with the falling edge events
+of the kernel. RPi.GPIO is not needed, and it works on every board and
+kernel with the character device, e.g. with the gpio-sim module for tests.
+"""
+import fcntl
+import logging
+import os
+import select
+import struct
+
+# see linux/gpio.h
+GPIO_V2_LINES_MAX = 64
+GPIO_V2_LINE_NUM_ATTRS_MAX = 10
+GPIO_V2_LINE_FLAG_INPUT = 1 << 2
+GPIO_V2_LINE_FLAG_OUTPUT = 1 << 3
+GPIO_V2_LINE_FLAG_EDGE_FALLING = 1 << 5
+GPIO_V2_LINE_FLAG_BIAS_PULL_UP = 1 << 8
+GPIO_V2_LINE_FLAG_BIAS_PULL_DOWN = 1 << 9
+GPIO_V2_LINE_FLAG_BIAS_DISABLED = 1 << 10
+GPIO_V2_LINE_ATTR_ID_FLAGS = 1
+GPIO_V2_LINE_ATTR_ID_OUTPUT_VALUES = 2
+GPIO_V2_LINE_EVENT_FALLING_EDGE = 2
+
+# struct gpio_v2_line_request: offsets, consumer, config (flags, num_attrs, padding, attrs),
+# num_lines, event_buffer_size, padding, fd
+LINE_REQUEST = struct.Struct('<64I32sQI5I' + 'IIQQ' * GPIO_V2_LINE_NUM_ATTRS_MAX + 'II5Ii')
+# struct gpio_v2_line_values: bits, mask
+LINE_VALUES = struct.Struct('<QQ')
+# struct gpio_v2_line_event: timestamp_ns, id, offset, seqno, line_seqno, padding
+LINE_EVENT = struct.Struct('<QIIII6I')
+
+
+def _iowr(number, size):
+    return (3 << 30) | (size << 16) | (0xB4 << 8) | number
+
+
+GPIO_V2_GET_LINE_IOCTL = _iowr(0x07, LINE_REQUEST.size)
+GPIO_V2_LINE_GET_VALUES_IOCTL = _iowr(0x0E, LINE_VALUES.size)
+GPIO_V2_LINE_SET_VALUES_IOCTL = _iowr(0x0F, LINE_VALUES.size)
+
+
+class GpioChip(object):
+    """
+    GPIO backend with the RPi.GPIO interface on a GPIO character device.
+
+    Pin numbers are the line offsets of the chip, which are the BCM numbers
+    on /dev/gpiochip0 of a Raspberry Pi. The lines are requested on their
+    first use after setup().
+    """
+    BOARD = 10
+    BCM = 11
+    OUT = 0
+    IN = 1
+    LOW = 0
+    HIGH = 1
+    RISING = 31
+    FALLING = 32
+    BOTH = 33
+    PUD_OFF = 20
+    PUD_DOWN = 21
+    PUD_UP = 22
+
+    def __init__(self, path="/dev/gpiochip0", consumer="hx711", edge_detection=True, ioctl=fcntl.ioctl):
+        """
+        :param path: the GPIO character device
+        :type path: str
+        :param consumer: name of the user of the lines shown by the kernel
+        :type consumer: str
+        :param edge_detection: request falling edge events on the input lines
+        :type edge_detection: bool
+        :param ioctl: function doing the ioctl calls, fcntl.ioctl or a stand-in for tests
+        """
+        self._chip_fd = os.open(path, os.O_RDWR | os.O_CLOEXEC)
+        self._consumer = consumer.encode('utf-8')[:31]
+        self.edge_detection = edge_detection
+        self._ioctl = ioctl
+        self._mode = None
+        # line offset: (direction, flags) in the order of setup
+        self._lines = {}
+        self._output_bits = 0
+        self._request_fd = None
+        self._dirty = False
+
+    def setmode(self, mode):
+        self._mode = mode
+
+    def getmode(self):
+        return self._mode
+
+    def setwarnings(self, flag):
+        pass
+
+    def setup(self, channel, direction, pull_up_down=None, initial=None):
+        """
+        add a line to the request. The lines are requested again on their next use,
+        with the output values they have now, unless the line is held with this setup already.
+        """
+        if channel not in self._lines and len(self._lines) >= GPIO_V2_LINES_MAX:
+            raise ValueError("at most {max} lines can be requested".format(max=GPIO_V2_LINES_MAX))
+        flags = 0
+        if direction == self.IN:
+            flags = {
+                self.PUD_UP: GPIO_V2_LINE_FLAG_BIAS_PULL_UP,
+                self.PUD_DOWN: GPIO_V2_LINE_FLAG_BIAS_PULL_DOWN,
+                self.PUD_OFF: GPIO_V2_LINE_FLAG_BIAS_DISABLED,
+            }.get(pull_up_down, 0)
+        if self._lines.get(channel) == (direction, flags) and initial is None:
+            # releasing and requesting the lines again would only glitch the outputs
+            return
+        self._lines[channel] = (direction, flags)
+        if initial is not None:
+            self._set_initial(channel, initial)
+        self._dirty = True
+
+    def _set_initial(self, channel, value):
+        bit = 1 << list(self._lines).index(channel)
+        if value:
+            self._output_bits |= bit
+        else:
+            self._output_bits &= ~bit
+
+    def _release(self):
+        if self._request_fd is not None:
+            os.close(self._request_fd)
+            self._request_fd = None
+
+    def _pack_request(self, edge_detection):
+        offsets = list(self._lines)
+        attributes = []
+        output_mask = 0
+        for index, (direction, flags) in enumerate(self._lines.values()):
+            if direction == self.OUT:
+                output_mask |= 1 << index
+            elif flags:
+                attributes.append((GPIO_V2_LINE_ATTR_ID_FLAGS, 0, GPIO_V2_LINE_FLAG_INPUT | flags
+                                   | (GPIO_V2_LINE_FLAG_EDGE_FALLING if edge_detection else 0), 1 << index))
+        if output_mask:
+            attributes.append((GPIO_V2_LINE_ATTR_ID_FLAGS, 0, GPIO_V2_LINE_FLAG_OUTPUT, output_mask))
+            attributes.append((GPIO_V2_LINE_ATTR_ID_OUTPUT_VALUES, 0, self._output_bits & output_mask, output_mask))
+        if len(attributes) > GPIO_V2_LINE_NUM_ATTRS_MAX:
+            raise ValueError("too many lines with pull up or pull down resistors")
+        default_flags = GPIO_V2_LINE_FLAG_INPUT | (GPIO_V2_LINE_FLAG_EDGE_FALLING if edge_detection else 0)
+        attribute_fields = []
+        for attribute in attributes + [(0, 0, 0, 0)] * (GPIO_V2_LINE_NUM_ATTRS_MAX - len(attributes)):
+            attribute_fields.extend(attribute)
+        return bytearray(LINE_REQUEST.pack(
+            *(offsets + [0] * (GPIO_V2_LINES_MAX - len(offsets))),
+            self._consumer,
+            default_flags, len(attributes), 0, 0, 0, 0, 0,
+            *attribute_fields,
+            len(offsets), 0, 0, 0, 0, 0, 0, 0
+        ))
+
+    def _request_lines(self):
+        """
+        request all lines set up from the kernel, replacing an earlier request
+        """
+        self._release()
+        request = self._pack_request(self.edge_detection)
+        try:
+            self._ioctl(self._chip_fd, GPIO_V2_GET_LINE_IOCTL, request, True)
+        except OSError as error:
+            if not self.edge_detection:
+                raise
+            # e.g. lines of GPIO expanders without interrupts
+            logging.warning("edge detection is not available, requesting the lines without: {error}".format(
+                error=error
+            ))
+            self.edge_detection = False
+            request = self._pack_request(False)
+            self._ioctl(self._chip_fd, GPIO_V2_GET_LINE_IOCTL, request, True)
+        self._request_fd = LINE_REQUEST.unpack(request)[-1]
+        os.set_blocking(self._request_fd, False)
+
+        # precomputed ioctl arguments for output() and input()
+        self._bits = {channel: 1 << index for index, channel in enumerate(self._lines)}
+        self._high = {channel: LINE_VALUES.pack(bit, bit) for channel, bit in self._bits.items()}
+        self._low = {channel: LINE_VALUES.pack(0, bit) for channel, bit in self._bits.items()}
+        self._values = {}
+        self._dirty = False
+
+    def _get_bits(self, channels):
+        try:
+            buffer, mask = self._values[channels]
+        except KeyError:
+            mask = 0
+            for channel in channels:
+                mask |= self._bits[channel]
+            buffer = bytearray(LINE_VALUES.pack(0, mask))
+            self._values[channels] = buffer, mask
+        self._ioctl(self._request_fd, GPIO_V2_LINE_GET_VALUES_IOCTL, buffer, True)
+        return int.from_bytes(buffer[:8], 'little')
+
+    def output(self, channel, value):
+        if self._dirty:
+            self._set_initial(channel, value)
+            self._request_lines()
+            return
+        # keep the output values for the next request of the lines
+        if value:
+            self._output_bits |= self._bits[channel]
+            self._ioctl(self._request_fd, GPIO_V2_LINE_SET_VALUES_IOCTL, self._high[channel])
+        else:
+            self._output_bits &= ~self._bits[channel]
+            self._ioctl(self._request_fd, GPIO_V2_LINE_SET_VALUES_IOCTL, self._low[channel])
+
+    def input(self, channel):
+        if self._dirty:
+            self._request_lines()
+        if self._get_bits((channel,)) & self._bits[channel]:
+            return 1
+        return 0
+
+    def input_many(self, channels):
+        """
+        read the values of several lines with one ioctl
+
+        :param channels: the lines to read
+        :type channels: tuple
+        :return: the value of every line
+        :rtype: list
+        """
+        if self._dirty:
+            self._request_lines()
+        channels = tuple(channels)
+        bits = self._get_bits(channels)
+        bit_of = self._bits
+        return [1 if bits & bit_of[channel] else 0 for channel in channels]
+
+    def _drain_events(self, channel):
+        """
+        read all queued edge events
+
+        :return: True if one of them was a falling edge of channel
+        :rtype: bool
+        """
+        found = False
+        while True:
+            try:
+                data = os.read(self._request_fd, LINE_EVENT.size * 16)
+            except BlockingIOError:
+                return found
+            if not data:
+                return found
+            for event in LINE_EVENT.iter_unpack(data[:len(data) - len(data) % LINE_EVENT.size]):
+                if event[1] == GPIO_V2_LINE_EVENT_FALLING_EDGE and event[2] == channel:
+                    found = True
+
+    def wait_for_edge(self, channel, edge, bouncetime=None, timeout=None):
+        """
+        wait for a falling edge event of an input line
+
+        Edges which occurred before, e.g. while the data bits were clocked out,
+        are discarded. If the line is low already, this returns right away.
+
+        :param timeout: timeout in milliseconds
+        :return: the channel or None on timeout
+        """
+        if self._dirty:
+            self._request_lines()
+        if not self.edge_detection:
+            raise RuntimeError("edge detection is not available")
+        if edge != self.FALLING:
+            raise RuntimeError("only falling edges are supported")
+        self._drain_events(channel)
+        if not self.input(channel):
+            return channel
+        poller = select.poll()
+        poller.register(self._request_fd, select.POLLIN)
+        if poller.poll(timeout) and self._drain_events(channel):
+            return channel
+        return None
+
+    def cleanup(self, channel=None):
+        """
+        release the lines, all of them or one
+        """
+        self._release()
+        if channel is None:
+            self._lines.clear()
+            self._output_bits = 0
+        elif channel in self._lines:
+            # the bits of the output values follow the order of the lines
+            values = {line: self._output_bits >> index & 1 for index, line in enumerate(self._lines)}
+            del self._lines[channel]
+            self._output_bits = 0
+            for index, line in enumerate(self._lines):
+                self._output_bits |= values[line] << index
+        self._dirty = bool(self._lines)
+
+    def close(self):
+        """
+        release the lines and close the chip
+        """
+        self.cleanup()
+        os.close(self._chip_fd)
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+The hx711 command, installed as a console script.
+
+    hx711 stream --dout 5 --sck 6 --format csv > samples.csv
+    hx711 stream --dout 5 --dout 13 --sck 6 --format binary --output samples.bin
+    hx711 bench --backend gpiomem --dout 5 --sck 6 --frames 1000
+
+"stream" writes every conversion to stdout or a file, without the settle
+sleeps of get_raw_data. Several DOUT pins share the PD_SCK pin and are read
+in one frame (hx711.multi.MultiHX711). Only frames with valid values of all
+sensors are written. The output is written in blocks of --buffer-size bytes.
+
+text and csv lines are the timestamp (time.monotonic_ns()) and the values.
+The binary format starts with the magic b'HXB1' and the number of sensors
+as uint16, followed by one frame per reading of the timestamp as int64 and
+the values as int32, all little endian.
+
+"bench" reads one sensor as fast as possible and reports the samples per
+second achieved, the rejected readings and the CPU usage.
+"""
+import argparse
+import json
+import struct
+import sys
+import time
+
+from hx711 import HX711, GenericHX711Exception, ParameterValidationError
+from hx711.benchmark import summarize
+from hx711.multi import MultiHX711
+from hx711.simulator import SimulatedGPIO, SimulatedHX711
+
+BACKENDS = ('rpi', 'gpiomem', 'chardev', 'simulated')
+FORMATS = ('text', 'csv', 'binary')
+# magic and number of sensors in front of the frames of the binary format
+BINARY_HEADER = struct.Struct('<4sH')
+BINARY_MAGIC = b'HXB1'
+
+
+def create_gpio(backend, dout_pins, pd_sck_pin, chip_path="/dev/gpiochip0", rate=80):
+    """
+    :param backend: "rpi", "gpiomem", "chardev" or "simulated"
+    :type backend: str
+    :param dout_pins: the DOUT pins, one simulated chip each
+    :type dout_pins: list
+    :param pd_sck_pin: the PD_SCK pin of the simulated chips
+    :type pd_sck_pin: int
+    :param chip_path: the GPIO character device of "chardev"
+    :type chip_path: str
+    :param rate: samples per second of the simulated chips
+    :type rate: int
+    :return: the GPIO backend (None for RPi.GPIO) and the simulated chips
+    :rtype: tuple
+    """
+    if backend == 'rpi':
+        return None, []
+    if backend == 'gpiomem':
+        from hx711.gpiomem import GpioMem
+        return GpioMem(), []
+    if backend == 'chardev':
+        from hx711.chardev import GpioChip
+        return GpioChip(chip_path), []
+    if backend == 'simulated':
+        chips = [
+            SimulatedHX711(dout_pin=pin, pd_sck_pin=pd_sck_pin, rate=rate, value=1000 * pin, noise=100, seed=pin)
+            for pin in dout_pins
+        ]
+        return SimulatedGPIO(*chips), chips
+    raise ValueError("backend has to be one of {backends}. I got: {backend}".format(
+        backends=", ".join(BACKENDS), backend=backend
+    ))
+
+
+def _create_reader(args, gpio):
+    """
+    :return: function reading one frame, returning the values of all sensors or False
+    """
+    if len(args.dout) == 1:
+        hx711 = HX711(dout_pin=args.dout[0], pd_sck_pin=args.sck, gain=args.gain, channel=args.channel,
+                      gpio=gpio, wait_mode=args.wait_mode, read_mode=args.read_mode)
+
+        def read():
+            data = hx711._read()
+            if data is False:
+                return False
+            return [data]
+        return read
+
+    multi = MultiHX711(dout_pins=args.dout, pd_sck_pin=args.sck, gain=args.gain, channel=args.channel, gpio=gpio)
+
+    def read():
+        values = multi.read()
+        if values is False or None in values:
+            return False
+        return values
+    return read
+
+
+def _create_writer(output_format, output, dout_pins):
+    """
+    :return: function writing the timestamp and the values of one frame
+    """
+    if output_format == 'binary':
+        output.write(BINARY_HEADER.pack(BINARY_MAGIC, len(dout_pins)))
+        frame = struct.Struct('<q{count}i'.format(count=len(dout_pins)))
+
+        def write(timestamp, values):
+            output.write(frame.pack(timestamp, *values))
+        return write
+
+    separator = ',' if output_format == 'csv' else ' '
+    if output_format == 'csv':
+        header = ["timestamp_ns"] + ["dout_{pin}".format(pin=pin) for pin in dout_pins]
+        output.write((separator.join(header) + '\n').encode('ascii'))
+
+    def write(timestamp, values):
+        output.write((separator.join([str(timestamp)] + [str(value) for value in values]) + '\n').encode('ascii'))
+    return write
+
+
+def stream(args):
+    gpio, _ = create_gpio(args.backend, args.dout, args.sck, chip_path=args.chip, rate=args.rate)
+    read = _create_reader(args, gpio)
+    if args.output == '-':
+        output = open(sys.stdout.fileno(), 'wb', buffering=args.buffer_size, closefd=False)
+    else:
+        output = open(args.output, 'wb', buffering=args.buffer_size)
+    written = 0
+    rejected = 0
+    try:
+        write = _create_writer(args.format, output, args.dout)
+        while args.count is None or written < args.count:
+            values = read()
+            if values is False:
+                rejected += 1
+                continue
+            write(time.monotonic_ns(), values)
+            written += 1
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+    finally:
+        try:
+            output.close()
+        except BrokenPipeError:
+            pass
+    print("{written} frames written, {rejected} readings rejected".format(written=written, rejected=rejected),
+          file=sys.stderr)
+    return 0
+
+
+def bench(args):
+    gpio, chips = create_gpio(args.backend, args.dout[:1], args.sck, chip_path=args.chip, rate=args.rate)
+    hx711 = HX711(dout_pin=args.dout[0], pd_sck_pin=args.sck, gain=args.gain, channel=args.channel,
+                  gpio=gpio, wait_mode=args.wait_mode, read_mode=args.read_mode)
+    metrics = hx711.enable_metrics()
+    power_downs = sum(chip.power_downs for chip in chips)
+    for chip in chips:
+        chip.frame_times.clear()
+
+    valid = 0
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    for _ in range(args.frames):
+        if hx711._read() is not False:
+            valid += 1
+    cpu_time = time.process_time() - cpu_start
+    wall_time = time.perf_counter() - wall_start
+
+    report = {
+        "backend": args.backend,
+        "read_mode": args.read_mode,
+        "wait_mode": args.wait_mode,
+        "frames": args.frames,
+        "valid": valid,
+        "samples_per_second": valid / wall_time,
+        "timing_violations": metrics.timing_violations,
+        "invalid_frames": metrics.invalid_frames,
+        "unsettled_readings": metrics.unsettled_readings,
+        "ready_timeouts": metrics.ready_timeouts,
+        "cpu_usage": cpu_time / wall_time,
+        "clock_out_time": metrics.clock_out.sum / max(1, metrics.clock_out.count),
+    }
+    if chips:
+        report["power_downs"] = sum(chip.power_downs for chip in chips) - power_downs
+        report["frame_time"] = summarize(chips[0].frame_times)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for name, value in report.items():
+            if isinstance(value, float):
+                value = "{:.6g}".format(value)
+            elif isinstance(value, dict):
+                value = ", ".join("{}={:.6g}".format(key, item) for key, item in value.items())
+            print("{name}: {value}".format(name=name, value=value))
+    return 0
+
+
+def create_parser():
+    sensor = argparse.ArgumentParser(add_help=False)
+    sensor.add_argument('--dout', type=int, action='append', required=True,
+                        help="GPIO DOUT is connected to, repeat for several sensors sharing PD_SCK")
+    sensor.add_argument('--sck', type=int, required=True, help="GPIO PD_SCK is connected to")
+    sensor.add_argument('--gain', type=int, default=128, choices=(128, 64, 32))
+    sensor.add_argument('--channel', default='A', choices=('A', 'B'))
+    sensor.add_argument('--backend', default='rpi', choices=BACKENDS,
+                        help="GPIO backend, 'simulated' needs no hardware (default: %(default)s)")
+    sensor.add_argument('--chip', default="/dev/gpiochip0", help="GPIO character device of the chardev backend")
+    sensor.add_argument('--wait-mode', default='poll', choices=HX711._valid_wait_modes)
+    sensor.add_argument('--read-mode', default='fast', choices=HX711._valid_read_modes)
+    sensor.add_argument('--rate', type=int, default=80, choices=(10, 80),
+                        help="samples per second of the simulated backend")
+
+    parser = argparse.ArgumentParser(prog="hx711", description="Stream and benchmark HX711 load cell amplifiers.")
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+    subparsers.required = True
+
+    stream_parser = subparsers.add_parser('stream', parents=[sensor], help="write every conversion to a file")
+    stream_parser.add_argument('--format', default='text', choices=FORMATS)
+    stream_parser.add_argument('--output', default='-', help="file to write to (default: stdout)")
+    stream_parser.add_argument('--count', type=int, help="stop after that many frames (default: never)")
+    stream_parser.add_argument('--buffer-size', type=int, default=65536, help="bytes written at once")
+    stream_parser.set_defaults(function=stream)
+
+    bench_parser = subparsers.add_parser('bench', parents=[sensor], help="read as fast as possible and report")
+    bench_parser.add_argument('--frames', type=int, default=500, help="how many readings")
+    bench_parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    bench_parser.set_defaults(function=bench)
+    return parser
+
+
+def main(argv=None):
+    """
+    entry point of the hx711 command
+
+    :param argv: the arguments, defaults to sys.argv[1:]
+    :type argv: list
+    :return: exit status
+    :rtype: int
+    """
+    args = create_parser().parse_args(argv)
+    try:
+        return args.function(args)
+    except (GenericHX711Exception, ParameterValidationError, ImportError, OSError) as error:
+        print("hx711: error: {error}".format(error=error), file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
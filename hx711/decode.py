@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Decode many raw 24 bit words of the HX711 at once.
+
+HX711._read validates and converts one word at a time. decode() does the
+same for a whole buffer of captured words, e.g. the words of a
+hx711.replay.Recording, in one vectorized pass if NumPy is installed.
+The words are read through views of the buffer, a buffer of uint32 words
+is not copied at all.
+"""
+from array import array
+
+from hx711 import stats
+
+# the saturation values, see HX711._read
+_HIGHEST = 0x7fffff
+_LOWEST = 0x800000
+
+
+def _packed_words(data):
+    """
+    :param data: the words packed in 3 bytes each, most significant byte first
+    :type data: memoryview
+    :rtype: list
+    """
+    if len(data) % 3:
+        raise ValueError("packed words take 3 bytes each, got {count} bytes".format(count=len(data)))
+    return [data[index] << 16 | data[index + 1] << 8 | data[index + 2] for index in range(0, len(data), 3)]
+
+
+def _numpy_words(words):
+    numpy = stats.numpy
+    if isinstance(words, numpy.ndarray) and words.itemsize != 1:
+        return words.astype(numpy.uint32, copy=False)
+    try:
+        view = memoryview(words)
+    except TypeError:
+        return numpy.asarray(words, dtype=numpy.uint32)
+    if view.itemsize == 4:
+        return numpy.frombuffer(view, dtype=numpy.uint32)
+    if view.itemsize != 1:
+        raise ValueError("expected packed bytes or 32 bit words")
+    if view.nbytes % 3:
+        raise ValueError("packed words take 3 bytes each, got {count} bytes".format(count=view.nbytes))
+    raw = numpy.frombuffer(view, dtype=numpy.uint8).reshape(-1, 3)
+    words = raw[:, 0].astype(numpy.uint32)
+    words <<= 8
+    words |= raw[:, 1]
+    words <<= 8
+    words |= raw[:, 2]
+    return words
+
+
+def decode(words):
+    """
+    validate raw words and convert them from 2's complement, like HX711._read
+
+    :param words: the bits as they have come, as 32 bit words (array('I'),
+        a uint32 NumPy array or a list) or packed in 3 bytes each with the
+        most significant byte first (bytes, bytearray)
+    :return: the signed values and for each of them if it is valid. The values of
+        invalid words are the saturation values -8388608 and 8388607.
+        int32 and bool NumPy arrays, or an array('i') and an array('B') of 0 and 1 without NumPy
+    :rtype: tuple
+    """
+    numpy = stats.numpy
+    if numpy is not None:
+        words = _numpy_words(words)
+        # the sign bit becomes the highest bit, the arithmetic shift back extends it
+        values = (words << 8).view(numpy.int32)
+        values >>= 8
+        return values, (words != _HIGHEST) & (words != _LOWEST)
+
+    try:
+        view = memoryview(words)
+    except TypeError:
+        view = None
+    if view is not None and view.itemsize == 1:
+        words = _packed_words(view.cast('B'))
+    elif view is not None and view.itemsize != 4:
+        raise ValueError("expected packed bytes or 32 bit words")
+    values = array('i', [word - 0x1000000 if word & 0x800000 else word for word in words])
+    valid = array('B', [word != _HIGHEST and word != _LOWEST for word in words])
+    return values, valid
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+Duty cycled sampling for battery powered scales.
+
+A DutyCycleScheduler takes one sample every "interval" seconds and keeps the
+HX711 powered down in between. It powers the chip up just early enough to
+discard the conversions which are not settled yet (see
+HX711.conversions_to_discard) and to read a settled one when the sample is
+due. The time from power up to the settled sample is measured, so the lead
+time follows the actual conversion rate of the chip.
+
+    scheduler = DutyCycleScheduler(hx711, interval=5.0)
+    for timestamp, value in scheduler.iter_samples():
+        ...
+    print(scheduler.stats()["awake_time_per_sample"])
+
+The awake time is what costs energy: the HX711 draws about 1.5mA awake and
+less than 1µA powered down.
+"""
+import logging
+import time
+
+
+class DutyCycleScheduler(object):
+    """
+    samples a HX711 at a fixed interval and powers it down in between
+    """
+    # wake up this many conversion periods earlier than measured, for the tolerance of the oscillator
+    wake_margin = 0.25
+    # how often to retry a rejected reading before giving up on a sample
+    max_retries = 3
+
+    def __init__(self, hx711, interval, rate=10):
+        """
+        :param hx711: the HX711 to sample
+        :type hx711: HX711
+        :param interval: seconds between two samples
+        :type interval: float
+        :param rate: samples per second of the HX711 (RATE pin), 10 or 80, until the wake up time is measured
+        :type rate: int
+        """
+        if interval <= 0:
+            raise ValueError("interval has to be positive. I got: " + str(interval))
+        if rate not in (10, 80):
+            raise ValueError("rate has to be 10 or 80. I got: " + str(rate))
+        self.hx711 = hx711
+        self.interval = interval
+        self.period = 1.0 / rate
+        self.samples = 0
+        self.discarded = 0
+        self.failed = 0
+        self.late = 0
+        self.awake_time = 0.0
+        self.wake_latency = None
+        self.max_wake_latency = 0.0
+        self._wake_latency_sum = 0.0
+        self._wakes = 0
+        self._next_due = None
+        # time.perf_counter() since the HX711 is awake, None while powered down.
+        # HX711() leaves it powered up.
+        self._awake_since = time.perf_counter()
+
+    def lead_time(self):
+        """
+        how long before a sample is due the HX711 is powered up
+
+        :rtype: float
+        """
+        if self.wake_latency is None:
+            latency = (self.hx711.conversions_to_discard() + 1) * self.period
+        else:
+            latency = self.wake_latency
+        return latency + self.wake_margin * self.period
+
+    def _read(self):
+        """
+        read the next valid conversion
+
+        :return: the value, or False if all tries failed
+        :rtype: int
+        """
+        hx711 = self.hx711
+        tries = 0
+        while tries <= self.max_retries:
+            data = hx711._read()
+            if data is not False:
+                return data
+            if hx711._last_failure == "unsettled":
+                # HX711 rejects the conversions after a timing violation itself
+                self.discarded += 1
+                continue
+            self.failed += 1
+            tries += 1
+        return False
+
+    def _discard_unsettled(self):
+        """
+        discard the conversions after power up which are not settled.
+
+        HX711 counts them, a timing violation starts the count over, see HX711._restart_settling.
+        After max_retries failed readings the remaining conversions are not discarded.
+        """
+        hx711 = self.hx711
+        hx711._restart_settling()
+        restarts = 0
+        while hx711._unsettled:
+            data = hx711._read()
+            self.discarded += 1
+            if data is False and hx711._last_failure != "unsettled":
+                restarts += 1
+                if restarts > self.max_retries:
+                    hx711._unsettled = 0
+
+    def _wake(self):
+        """
+        power up the HX711 and discard the conversions which are not settled
+
+        :return: time.perf_counter() of the power up
+        :rtype: float
+        """
+        self.hx711.power_up(wait=False)
+        woken = time.perf_counter()
+        self._awake_since = woken
+        self._discard_unsettled()
+        return woken
+
+    def _observe_wake_latency(self, latency):
+        self._wakes += 1
+        self._wake_latency_sum += latency
+        self.max_wake_latency = max(self.max_wake_latency, latency)
+        if self.wake_latency is None:
+            self.wake_latency = latency
+        else:
+            # follow longer latencies at once, shorter ones slowly
+            self.wake_latency = max(latency, 0.8 * self.wake_latency + 0.2 * latency)
+
+    def sample(self):
+        """
+        sleep until the next sample is due and read it
+
+        :return: time.monotonic_ns() of the reading and the value, False if all readings failed
+        :rtype: tuple
+        """
+        now = time.perf_counter()
+        if self._next_due is None:
+            self._next_due = now if self._awake_since is not None else now + self.lead_time()
+        due = self._next_due
+
+        if self._awake_since is None:
+            wake_at = due - self.lead_time()
+            if wake_at > now:
+                time.sleep(wake_at - now)
+            woken = self._wake()
+            value = self._read()
+            ready = time.perf_counter()
+            self._observe_wake_latency(ready - woken)
+        else:
+            # too little time to power down since the sample before, wait for a conversion close to due
+            if due - self.period > now:
+                time.sleep(due - self.period - now)
+            value = self._read()
+            ready = time.perf_counter()
+        timestamp = time.monotonic_ns()
+
+        self.samples += 1
+        if ready > due + self.period:
+            self.late += 1
+        self._next_due = due + self.interval
+        if self._next_due < ready:
+            # skip the samples which are overdue already
+            skipped = int((ready - self._next_due) // self.interval) + 1
+            self._next_due += skipped * self.interval
+            logging.debug("duty cycle: skipped {count} overdue samples".format(count=skipped))
+
+        if self._next_due - self.lead_time() - ready > self.period:
+            self.hx711.power_down(wait=False)
+            self.awake_time += time.perf_counter() - self._awake_since
+            self._awake_since = None
+        return timestamp, value
+
+    def iter_samples(self, count=None):
+        """
+        iterate over (timestamp, value) tuples, see sample()
+
+        :param count: stop after that many samples, None for no limit
+        :type count: int
+        """
+        taken = 0
+        while count is None or taken < count:
+            yield self.sample()
+            taken += 1
+
+    def stats(self):
+        """
+        :return: samples taken, conversions discarded, readings failed, samples late,
+            awake time per sample, duty cycle, mean and max time from power up to the settled sample
+        :rtype: dict
+        """
+        awake_time = self.awake_time
+        if self._awake_since is not None:
+            awake_time += time.perf_counter() - self._awake_since
+        samples = max(1, self.samples)
+        return {
+            "samples": self.samples,
+            "discarded": self.discarded,
+            "failed": self.failed,
+            "late": self.late,
+            "awake_time_per_sample": awake_time / samples,
+            "duty_cycle": awake_time / (samples * self.interval),
+            "mean_wake_latency": self._wake_latency_sum / self._wakes if self._wakes else None,
+            "max_wake_latency": self.max_wake_latency,
+        }
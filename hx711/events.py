@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""
+Events detected incrementally from the samples of a HX711.
+
+Instead of polling get_raw_data() to find out whether something happened,
+an EventDetector is fed every sample and keeps a constant size state: the
+running mean and variance of a window, the side of every threshold and the
+level of the last stable load. Only the events are delivered, to callbacks
+and to the queue "events" a consumer can sleep on:
+
+    detector = EventDetector(window=8, stable_deviation=50, step=2000, thresholds=[100000])
+    detector.on('load_changed', lambda event: print("load changed by", event.details["change"]))
+    detector.start(hx711)
+    while True:
+        event = detector.events.get()
+
+Events:
+
+* "stable": the standard deviation of the window dropped to stable_deviation.
+  value is the mean of the window. Fired again after the readings were
+  unstable, i.e. the deviation exceeded twice stable_deviation, or the load changed.
+* "threshold_crossed": a value crossed a threshold by more than the hysteresis,
+  details "threshold" and "direction" ("rising" or "falling").
+* "load_changed": a value differs from the mean of the last stable load by
+  more than step, details "previous" (that mean) and "change". Fired once
+  until the readings are stable again.
+"""
+import collections
+from collections import deque
+import logging
+import queue
+import threading
+import time
+
+from hx711 import GenericHX711Exception
+
+EVENT_NAMES = ('stable', 'threshold_crossed', 'load_changed')
+
+Event = collections.namedtuple('Event', ['name', 'timestamp', 'value', 'details'])
+Event.__doc__ = """
+an event of EventDetector
+
+name is "stable", "threshold_crossed" or "load_changed", timestamp is
+time.monotonic_ns() of the sample causing it, details a dict depending on the name.
+"""
+
+
+class EventDetector(object):
+    """
+    detects events in a stream of samples with constant work per sample
+    """
+    # the readings are unstable again when the deviation exceeds stable_deviation by this factor
+    _unstable_factor = 2.0
+
+    def __init__(self, window=10, stable_deviation=None, thresholds=(), hysteresis=0.0, step=None,
+                 convert=None, queue_size=0):
+        """
+        :param window: how many samples the mean and the deviation are taken of
+        :type window: int
+        :param stable_deviation: standard deviation up to which the readings are stable, None for no "stable" events
+        :type stable_deviation: float
+        :param thresholds: values to fire "threshold_crossed" at
+        :type thresholds: list
+        :param hysteresis: how far a value has to cross a threshold
+        :type hysteresis: float
+        :param step: change of the load to fire "load_changed" at, None for no "load_changed" events.
+            Requires stable_deviation, changes are measured from the last stable load.
+        :type step: float
+        :param convert: applied to every sample first, e.g. Scale.convert to detect events in weights
+        :type convert: callable
+        :param queue_size: how many events the queue "events" keeps, 0 for no limit
+        :type queue_size: int
+        """
+        if window < 2:
+            raise ValueError("window has to be at least 2. I got: " + str(window))
+        if step is not None and stable_deviation is None:
+            raise ValueError("detecting load changes requires stable_deviation")
+        if hysteresis < 0:
+            raise ValueError("hysteresis must not be negative. I got: " + str(hysteresis))
+        self.window = window
+        self.stable_deviation = stable_deviation
+        self.thresholds = list(thresholds)
+        self.hysteresis = hysteresis
+        self.step = step
+        self.convert = convert
+        self.events = queue.Queue(maxsize=queue_size)
+        self._callbacks = {name: [] for name in EVENT_NAMES}
+        self._values = deque(maxlen=window)
+        self._thread = None
+        self._stop = None
+        self._started_stream = False
+        self.reset()
+
+    def reset(self):
+        """
+        forget all samples and the states of the detectors
+        """
+        self._values.clear()
+        # sums of the values minus an offset, so that the squares of 24 bit values stay exact
+        self._offset = None
+        self._sum = 0.0
+        self._sum_of_squares = 0.0
+        self.stable = False
+        # mean of the last stable window
+        self.stable_level = None
+        # True for each threshold the readings are above, None until the first sample
+        self._above = [None] * len(self.thresholds)
+
+    def on(self, name, callback):
+        """
+        call a function for every event of a name
+
+        :param name: "stable", "threshold_crossed" or "load_changed"
+        :type name: str
+        :param callback: function called with the Event from the thread feeding the samples
+        :type callback: callable
+        """
+        if name not in self._callbacks:
+            raise ValueError("name has to be one of {names}. I got: {name}".format(
+                names=", ".join(EVENT_NAMES), name=name
+            ))
+        self._callbacks[name].append(callback)
+
+    @property
+    def mean(self):
+        """
+        mean of the window, None without samples
+
+        :rtype: float
+        """
+        if not self._values:
+            return None
+        return self._offset + self._sum / len(self._values)
+
+    @property
+    def deviation(self):
+        """
+        standard deviation of the window, None without samples
+
+        :rtype: float
+        """
+        count = len(self._values)
+        if not count:
+            return None
+        variance = (self._sum_of_squares - self._sum * self._sum / count) / count
+        return max(0.0, variance) ** 0.5
+
+    def update(self, value, timestamp=None):
+        """
+        feed one sample
+
+        :param value: the new sample
+        :type value: float
+        :param timestamp: time.monotonic_ns() of the sample, defaults to now
+        :type timestamp: int
+        :return: the events fired, usually none
+        :rtype: list
+        """
+        if timestamp is None:
+            timestamp = time.monotonic_ns()
+        if self.convert is not None:
+            value = self.convert(value)
+
+        values = self._values
+        if self._offset is None:
+            self._offset = value
+        shifted = value - self._offset
+        if len(values) == self.window:
+            oldest = values[0]
+            self._sum -= oldest
+            self._sum_of_squares -= oldest * oldest
+        values.append(shifted)
+        self._sum += shifted
+        self._sum_of_squares += shifted * shifted
+
+        events = []
+        self._detect_thresholds(value, timestamp, events)
+        if self.stable_deviation is not None:
+            self._detect_load(value, timestamp, events)
+        for event in events:
+            self._dispatch(event)
+        return events
+
+    def _detect_thresholds(self, value, timestamp, events):
+        hysteresis = self.hysteresis
+        above = self._above
+        for index, threshold in enumerate(self.thresholds):
+            if above[index] is None:
+                above[index] = value >= threshold
+            elif above[index] and value < threshold - hysteresis:
+                above[index] = False
+                events.append(Event('threshold_crossed', timestamp, value,
+                                    {"threshold": threshold, "direction": "falling"}))
+            elif not above[index] and value >= threshold + hysteresis:
+                above[index] = True
+                events.append(Event('threshold_crossed', timestamp, value,
+                                    {"threshold": threshold, "direction": "rising"}))
+
+    def _detect_load(self, value, timestamp, events):
+        if self.stable and self.step is not None and abs(value - self.stable_level) > self.step:
+            self.stable = False
+            events.append(Event('load_changed', timestamp, value,
+                                {"previous": self.stable_level, "change": value - self.stable_level}))
+            # the new load is stable once a whole window of it is
+            self._values.clear()
+            self._values.append(value - self._offset)
+            self._sum = value - self._offset
+            self._sum_of_squares = self._sum * self._sum
+        if len(self._values) < self.window:
+            return
+        deviation = self.deviation
+        if not self.stable and deviation <= self.stable_deviation:
+            self.stable = True
+            self.stable_level = self.mean
+            events.append(Event('stable', timestamp, self.stable_level, {"deviation": deviation}))
+        elif self.stable and deviation > self.stable_deviation * self._unstable_factor:
+            self.stable = False
+
+    def _dispatch(self, event):
+        try:
+            self.events.put_nowait(event)
+        except queue.Full:
+            logging.warning("event queue is full, dropping {name} event".format(name=event.name))
+        for callback in self._callbacks[event.name]:
+            callback(event)
+
+    def start(self, hx711, buffer_size=1024, poll_interval=0.001):
+        """
+        feed the samples of a HX711 in a thread, starting its stream if it is not running
+
+        :param hx711: the HX711 to watch
+        :type hx711: HX711
+        :param buffer_size: size of the ring buffer of the stream started
+        :type buffer_size: int
+        :param poll_interval: how long to sleep when there is no new sample
+        :type poll_interval: float
+        """
+        if self._thread is not None:
+            raise RuntimeError("the detector has been started already")
+        self._started_stream = hx711._stream_thread is None
+        if self._started_stream:
+            hx711.start_stream(buffer_size=buffer_size)
+        self._hx711 = hx711
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._watch,
+            args=(hx711, poll_interval),
+            name="HX711 events dout={dout}".format(dout=hx711._dout),
+        )
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _watch(self, hx711, poll_interval):
+        update = self.update
+        try:
+            for value in hx711.iter_stream(poll_interval=poll_interval, stop=self._stop):
+                update(value)
+        except GenericHX711Exception as error:
+            logging.warning("no more samples to watch: {error}".format(error=error))
+
+    def stop(self, timeout=None):
+        """
+        stop feeding samples, and the stream if start() started it
+
+        :param timeout: how long to wait for the thread in seconds
+        :type timeout: float
+        :return: True if the thread has stopped
+        :rtype: bool
+        """
+        thread = self._thread
+        if thread is None:
+            return True
+        self._stop.set()
+        if self._started_stream:
+            self._hx711.stop_stream(timeout)
+        thread.join(timeout)
+        if thread.is_alive():
+            return False
+        self._thread = None
+        return True
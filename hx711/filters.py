@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming filters returning a filtered value for every new sample.
+
+Every filter keeps a fixed size state and updates it in constant time per
+sample (the sliding median in logarithmic time plus a short memory move),
+so a filtered value is available at each conversion. Filters can be chained
+with Pipeline:
+
+    pipeline = Pipeline(SlidingMedian(5), LowPass(0.2))
+    for value in pipeline.stream(hx711.iter_stream()):
+        ...
+"""
+from array import array
+from bisect import bisect_left, insort
+from collections import deque
+
+
+class Filter(object):
+    """
+    base class of the filters
+    """
+
+    def update(self, value):
+        """
+        feed one sample
+
+        :param value: the new sample
+        :type value: float
+        :return: the filtered value
+        :rtype: float
+        """
+        raise NotImplementedError
+
+    def reset(self):
+        """
+        forget all samples
+        """
+        raise NotImplementedError
+
+    def apply(self, values):
+        """
+        feed a batch of samples
+
+        :param values: the samples, oldest first
+        :type values: iterable
+        :return: the filtered value for every sample
+        :rtype: array
+        """
+        update = self.update
+        return array('d', [update(value) for value in values])
+
+    def stream(self, values):
+        """
+        filter an iterable of samples, like HX711.iter_stream(), lazily
+
+        :param values: the samples
+        :type values: iterable
+        """
+        update = self.update
+        for value in values:
+            yield update(value)
+
+
+class MovingAverage(Filter):
+    """
+    mean of the last "window" samples, kept as running sum
+    """
+
+    def __init__(self, window):
+        """
+        :param window: how many samples to average
+        :type window: int
+        """
+        if window < 1:
+            raise ValueError("window has to be at least 1. I got: " + str(window))
+        self.window = window
+        self._values = deque(maxlen=window)
+        self._sum = 0
+
+    def update(self, value):
+        values = self._values
+        if len(values) == self.window:
+            self._sum -= values[0]
+        values.append(value)
+        self._sum += value
+        return self._sum / len(values)
+
+    def reset(self):
+        self._values.clear()
+        self._sum = 0
+
+
+class SlidingMedian(Filter):
+    """
+    median of the last "window" samples, robust against single spikes
+    """
+
+    def __init__(self, window):
+        """
+        :param window: how many samples to take the median of
+        :type window: int
+        """
+        if window < 1:
+            raise ValueError("window has to be at least 1. I got: " + str(window))
+        self.window = window
+        self._values = deque(maxlen=window)
+        # the same samples in order
+        self._sorted = []
+
+    def update(self, value):
+        values = self._values
+        ordered = self._sorted
+        if len(values) == self.window:
+            del ordered[bisect_left(ordered, values[0])]
+        values.append(value)
+        insort(ordered, value)
+        count = len(ordered)
+        middle = count // 2
+        if count % 2:
+            return ordered[middle]
+        return (ordered[middle - 1] + ordered[middle]) / 2
+
+    def reset(self):
+        self._values.clear()
+        del self._sorted[:]
+
+
+class LowPass(Filter):
+    """
+    first order IIR low pass: y += alpha * (x - y)
+    """
+
+    def __init__(self, alpha):
+        """
+        :param alpha: weight of a new sample, smaller values smooth stronger
+        :type alpha: float
+        """
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha has to be within (0, 1]. I got: " + str(alpha))
+        self.alpha = alpha
+        self._value = None
+
+    def update(self, value):
+        if self._value is None:
+            self._value = float(value)
+        else:
+            self._value += self.alpha * (value - self._value)
+        return self._value
+
+    def reset(self):
+        self._value = None
+
+
+class Kalman(Filter):
+    """
+    one dimensional Kalman filter for a constant signal with slow drift
+    """
+
+    def __init__(self, process_variance, measurement_variance):
+        """
+        :param process_variance: how much the true value may change between two samples, squared
+        :type process_variance: float
+        :param measurement_variance: variance of the noise of the samples
+        :type measurement_variance: float
+        """
+        if process_variance < 0 or measurement_variance <= 0:
+            raise ValueError("the variances have to be positive")
+        self.process_variance = process_variance
+        self.measurement_variance = measurement_variance
+        self.reset()
+
+    def update(self, value):
+        if self._estimate is None:
+            self._estimate = float(value)
+            self._error = self.measurement_variance
+            return self._estimate
+        error = self._error + self.process_variance
+        gain = error / (error + self.measurement_variance)
+        self._estimate += gain * (value - self._estimate)
+        self._error = (1 - gain) * error
+        return self._estimate
+
+    def reset(self):
+        self._estimate = None
+        self._error = None
+
+
+class Pipeline(Filter):
+    """
+    chain of filters, each one feeding the next one
+    """
+
+    def __init__(self, *stages):
+        """
+        :param stages: the filters in the order they are applied
+        :type stages: Filter
+        """
+        if not stages:
+            raise ValueError("the pipeline needs at least one stage")
+        self.stages = stages
+
+    def update(self, value):
+        for stage in self.stages:
+            value = stage.update(value)
+        return value
+
+    def reset(self):
+        for stage in self.stages:
+            stage.reset()
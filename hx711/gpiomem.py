@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+GPIO backend writing the GPIO registers of the Raspberry Pi directly.
+
+/dev/gpiomem maps the GPIO register block into the process without root
+privileges. Setting, clearing and reading a pin is a single store or load on
+the mapped registers, instead of a call into RPi.GPIO parsing its arguments
+and checking the pin every time. This keeps PD_SCK high for a much shorter
+time.
+
+Only BCM pin numbers are supported. Pull up and pull down resistors and edge
+detection are not, so use HX711 with wait_mode="poll".
+"""
+import logging
+import mmap
+import os
+
+# size of the mapped register block
+BLOCK_SIZE = 4096
+# register offsets in bytes
+GPFSEL0 = 0x00
+GPSET0 = 0x1C
+GPCLR0 = 0x28
+GPLEV0 = 0x34
+# function select values
+_FUNCTION_INPUT = 0b000
+_FUNCTION_OUTPUT = 0b001
+# BCM2711 has 58 GPIOs
+_PIN_COUNT = 58
+
+
+class GpioMem(object):
+    """
+    GPIO backend with the RPi.GPIO interface on memory mapped GPIO registers
+    """
+    BOARD = 10
+    BCM = 11
+    OUT = 0
+    IN = 1
+    LOW = 0
+    HIGH = 1
+    RISING = 31
+    FALLING = 32
+    BOTH = 33
+    PUD_OFF = 20
+    PUD_DOWN = 21
+    PUD_UP = 22
+
+    def __init__(self, path="/dev/gpiomem", offset=0):
+        """
+        :param path: file to map the registers from. Any file of at least 4096 bytes
+            can be used for testing.
+        :type path: str
+        :param offset: offset of the register block in the file, e.g. for /dev/mem
+        :type offset: int
+        """
+        fd = os.open(path, os.O_RDWR | os.O_SYNC)
+        try:
+            self._mmap = mmap.mmap(fd, BLOCK_SIZE, mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE,
+                                   offset=offset)
+        finally:
+            os.close(fd)
+        # 32 bit registers
+        self._registers = memoryview(self._mmap).cast('I')
+        self._mode = None
+        self._outputs = set()
+        # register indices and bit masks of each pin, so output() and input() only look them up
+        self._masks = [1 << (pin % 32) for pin in range(_PIN_COUNT)]
+        self._set = [GPSET0 // 4 + pin // 32 for pin in range(_PIN_COUNT)]
+        self._clear = [GPCLR0 // 4 + pin // 32 for pin in range(_PIN_COUNT)]
+        self._level = [GPLEV0 // 4 + pin // 32 for pin in range(_PIN_COUNT)]
+
+    def setmode(self, mode):
+        if mode != self.BCM:
+            raise ValueError("GpioMem supports BCM pin numbers only")
+        self._mode = mode
+
+    def getmode(self):
+        return self._mode
+
+    def setwarnings(self, flag):
+        pass
+
+    def _check_pin(self, channel):
+        if not 0 <= channel < _PIN_COUNT:
+            raise ValueError("{channel} is not a valid GPIO".format(channel=channel))
+
+    def _select_function(self, channel, function):
+        index = GPFSEL0 // 4 + channel // 10
+        shift = (channel % 10) * 3
+        registers = self._registers
+        registers[index] = (registers[index] & ~(0b111 << shift)) | (function << shift)
+
+    def setup(self, channel, direction, pull_up_down=None, initial=None):
+        self._check_pin(channel)
+        if pull_up_down is not None and pull_up_down != self.PUD_OFF:
+            logging.warning("GpioMem does not set pull up or pull down resistors")
+        if direction == self.OUT:
+            if initial is not None:
+                self.output(channel, initial)
+            self._select_function(channel, _FUNCTION_OUTPUT)
+            self._outputs.add(channel)
+        else:
+            self._select_function(channel, _FUNCTION_INPUT)
+            self._outputs.discard(channel)
+
+    def output(self, channel, value):
+        if value:
+            self._registers[self._set[channel]] = self._masks[channel]
+        else:
+            self._registers[self._clear[channel]] = self._masks[channel]
+
+    def input(self, channel):
+        if self._registers[self._level[channel]] & self._masks[channel]:
+            return 1
+        return 0
+
+    def wait_for_edge(self, channel, edge, bouncetime=None, timeout=None):
+        raise RuntimeError("GpioMem has no edge detection")
+
+    def cleanup(self, channel=None):
+        """
+        switch the pins set up as outputs back to inputs
+        """
+        channels = set(self._outputs) if channel is None else {channel}
+        for pin in channels & self._outputs:
+            self._select_function(pin, _FUNCTION_INPUT)
+            self._outputs.discard(pin)
+
+    def close(self):
+        """
+        unmap the registers
+        """
+        self._registers.release()
+        self._mmap.close()
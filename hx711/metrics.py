@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+Counters and latency histograms of the readings of a HX711.
+
+Enable them with HX711.enable_metrics(). Updating them costs a few integer
+additions per reading, unlike formatting debug log lines. A snapshot is
+available as dict and in the Prometheus text format, written to a file for
+the textfile collector of the node exporter or served over HTTP.
+"""
+from bisect import bisect_left
+import http.server
+import os
+import threading
+
+# upper bounds of the buckets in seconds
+READY_WAIT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5)
+CLOCK_OUT_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01)
+
+
+class Histogram(object):
+    """
+    counts of observed values in fixed buckets
+    """
+
+    def __init__(self, bounds):
+        """
+        :param bounds: ascending upper bounds of the buckets, a last bucket catches the rest
+        :type bounds: tuple
+        """
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self):
+        """
+        :return: count, sum and the count of each bucket by its upper bound
+        :rtype: dict
+        """
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": dict(zip(self.bounds + (float("inf"),), self.counts)),
+        }
+
+
+class Metrics(object):
+    """
+    what happened while reading one HX711
+    """
+    # name, help text
+    _counters = (
+        ("reads", "readings clocked out"),
+        ("ready_timeouts", "waits for data ready which timed out"),
+        ("timing_violations", "readings rejected because a clock pulse may have powered the chip down"),
+        ("invalid_frames", "readings rejected because of the saturation values 0x7fffff or 0x800000"),
+        ("retries", "readings get_raw_data had to repeat"),
+        ("power_down_recoveries", "gain pulses of 60us or more which may have powered the chip down"),
+        ("unsettled_readings", "readings rejected because the output may not have settled after a power down"),
+    )
+    _histograms = (
+        ("ready_wait", "time waiting for data ready"),
+        ("clock_out", "time clocking out a reading"),
+    )
+
+    def __init__(self, labels=None):
+        """
+        :param labels: Prometheus labels of all metrics, e.g. {"sensor": "left"}
+        :type labels: dict
+        """
+        self.labels = dict(labels or {})
+        for name, _ in self._counters:
+            setattr(self, name, 0)
+        self.ready_wait = Histogram(READY_WAIT_BUCKETS)
+        self.clock_out = Histogram(CLOCK_OUT_BUCKETS)
+
+    def snapshot(self):
+        """
+        :return: all counters and histograms by name
+        :rtype: dict
+        """
+        snapshot = {name: getattr(self, name) for name, _ in self._counters}
+        for name, _ in self._histograms:
+            snapshot[name] = getattr(self, name).snapshot()
+        return snapshot
+
+    def _format_labels(self, extra=None):
+        labels = sorted(self.labels.items())
+        if extra is not None:
+            labels.append(extra)
+        if not labels:
+            return ""
+        return "{" + ",".join(
+            '{key}="{value}"'.format(key=key, value=str(value).replace('\\', '\\\\').replace('"', '\\"'))
+            for key, value in labels
+        ) + "}"
+
+    def to_prometheus(self, prefix="hx711"):
+        """
+        :param prefix: prefix of the metric names
+        :type prefix: str
+        :return: the metrics in the Prometheus text exposition format
+        :rtype: str
+        """
+        labels = self._format_labels()
+        lines = []
+        for name, help_text in self._counters:
+            metric = "{prefix}_{name}_total".format(prefix=prefix, name=name)
+            lines.append("# HELP {metric} {help}".format(metric=metric, help=help_text))
+            lines.append("# TYPE {metric} counter".format(metric=metric))
+            lines.append("{metric}{labels} {value}".format(metric=metric, labels=labels, value=getattr(self, name)))
+        for name, help_text in self._histograms:
+            histogram = getattr(self, name)
+            metric = "{prefix}_{name}_seconds".format(prefix=prefix, name=name)
+            lines.append("# HELP {metric} {help}".format(metric=metric, help=help_text))
+            lines.append("# TYPE {metric} histogram".format(metric=metric))
+            cumulative = 0
+            for bound, count in zip(histogram.bounds + ("+Inf",), histogram.counts):
+                cumulative += count
+                lines.append("{metric}_bucket{labels} {value}".format(
+                    metric=metric, labels=self._format_labels(("le", bound)), value=cumulative
+                ))
+            lines.append("{metric}_sum{labels} {value!r}".format(metric=metric, labels=labels, value=histogram.sum))
+            lines.append("{metric}_count{labels} {value}".format(metric=metric, labels=labels, value=histogram.count))
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path, prefix="hx711"):
+        """
+        write the metrics atomically, e.g. for the textfile collector of the node exporter
+
+        :param path: the file, usually ending with ".prom"
+        :type path: str
+        :param prefix: prefix of the metric names
+        :type prefix: str
+        """
+        temporary = path + ".tmp"
+        with open(temporary, "w", encoding='utf-8') as f:
+            f.write(self.to_prometheus(prefix=prefix))
+        os.replace(temporary, path)
+
+    def serve(self, port, host="127.0.0.1", prefix="hx711"):
+        """
+        serve the metrics over HTTP in a thread
+
+        :param port: the TCP port, 0 for any free port
+        :type port: int
+        :param host: the address to listen on
+        :type host: str
+        :param prefix: prefix of the metric names
+        :type prefix: str
+        :return: the server, stop it with shutdown() and server_close()
+        :rtype: http.server.ThreadingHTTPServer
+        """
+        metrics = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = metrics.to_prometheus(prefix=prefix).encode('utf-8')
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = http.server.ThreadingHTTPServer((host, port), Handler)
+        thread = threading.Thread(target=server.serve_forever, name="HX711 metrics")
+        thread.daemon = True
+        thread.start()
+        return server
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+Read several HX711 sharing one PD_SCK line at once.
+"""
+import logging
+import time
+
+from hx711 import (
+    HX711,
+    ParameterValidationError,
+    _FrameTimer,
+    _decode,
+    _import_rpi_gpio
+)
+
+
+class MultiHX711(object):
+    """
+    Several HX711 with their own DOUT pins and a common PD_SCK pin.
+
+    All chips are clocked by the same pulses, so one reading of 25 to 27 pulses
+    returns time aligned values of all chips. All chips share channel and gain.
+    """
+    _channel = "A"
+    _channel_a_gain = 64
+    _gain_pulses = 3
+    min_measures = HX711.min_measures
+    max_measures = HX711.max_measures
+    _poll_interval = HX711._poll_interval
+
+    def __init__(self, dout_pins, pd_sck_pin, gain=128, channel='A', gpio=None):
+        """
+        :param dout_pins: GPIOs the DOUT pins are connected to
+        :type dout_pins: list
+        :param pd_sck_pin: GPIO the common SCK line is connected to
+        :type pd_sck_pin: int
+        :param gain: gain
+        :type gain: int
+        :param channel: selected channel
+        :type channel: str
+        :param gpio: GPIO backend with the RPi.GPIO interface, defaults to RPi.GPIO
+        """
+        dout_pins = list(dout_pins)
+        if not dout_pins or not all(isinstance(pin, int) for pin in dout_pins + [pd_sck_pin]):
+            raise TypeError('dout_pins and pd_sck_pin have to be integer numbers.\nI have got dout_pins: '
+                            + str(dout_pins) + ' and pd_sck_pin: ' + str(pd_sck_pin) + '\n')
+        self._dout_pins = tuple(dout_pins)
+        self._pd_sck = pd_sck_pin
+
+        if gpio is None:
+            gpio = _import_rpi_gpio()
+        self._gpio = gpio
+        # backends able to read several pins at once, like hx711.chardev.GpioChip, provide input_many
+        self._input_many = getattr(gpio, 'input_many', None)
+
+        self._gpio.setmode(self._gpio.BCM)
+        self._gpio.setup(self._pd_sck, self._gpio.OUT)
+        for pin in self._dout_pins:
+            self._gpio.setup(pin, self._gpio.IN)
+        self._frame_timer = _FrameTimer()
+        self.channel = channel
+        self.channel_a_gain = gain
+
+    def __len__(self):
+        return len(self._dout_pins)
+
+    @property
+    def channel(self):
+        return self._channel
+
+    @channel.setter
+    def channel(self, channel):
+        if channel not in HX711._valid_channels:
+            raise ParameterValidationError('channel has to be "A" or "B". I got: ' + str(channel))
+        self._channel = channel
+        self._update_gain_pulses()
+        self._apply_setting()
+
+    @property
+    def channel_a_gain(self):
+        return self._channel_a_gain
+
+    @channel_a_gain.setter
+    def channel_a_gain(self, channel_a_gain):
+        if self.channel == "A":
+            if channel_a_gain not in HX711._valid_gains_for_channel_A:
+                raise ParameterValidationError("{gain_A} is not a valid gain".format(gain_A=channel_a_gain))
+            self._channel_a_gain = channel_a_gain
+            self._update_gain_pulses()
+            self._apply_setting()
+        else:
+            logging.warning(
+                """current channel != "A" so no need to set the gain"""
+                """ current channel is '{channel}'""".format(channel=self.channel)
+            )
+
+    def _update_gain_pulses(self):
+        """
+        see HX711._update_gain_pulses
+        """
+        self._gain_pulses = HX711._pulses_for_setting(self._channel, self._channel_a_gain)
+
+    def _apply_setting(self):
+        """
+        see HX711._apply_setting
+        """
+        self.read()
+        time.sleep(0.5)
+        return True
+
+    def power_down(self):
+        """
+        turn off all HX711
+        :return: always True
+        :rtype bool
+        """
+        self._gpio.output(self._pd_sck, False)
+        self._gpio.output(self._pd_sck, True)
+        time.sleep(0.01)
+        return True
+
+    def power_up(self):
+        """
+        power up all HX711
+        :return: always True
+        :rtype bool
+        """
+        self._gpio.output(self._pd_sck, False)
+        time.sleep(0.01)
+        return True
+
+    def _ready(self):
+        """
+        Data is ready for reading when all DOUT pins are low
+        :rtype bool
+        """
+        if self._input_many is not None:
+            return not any(self._input_many(self._dout_pins))
+        read_input = self._gpio.input
+        for pin in self._dout_pins:
+            if read_input(pin) != 0:
+                return False
+        return True
+
+    def _wait_for_ready(self, max_tries=40):
+        """
+        poll until all chips have data ready
+
+        :param max_tries: how often to poll
+        :type max_tries: int
+        :return True if data is ready, False on timeout
+        :rtype bool
+        """
+        ready_counter = 0
+        while self._ready() is False:
+            time.sleep(self._poll_interval)
+            ready_counter += 1
+            if ready_counter >= max_tries:
+                logging.debug('MultiHX711 not ready after {} trials'.format(max_tries))
+                return False
+        return True
+
+    def _clock_out(self):
+        """
+        clock out one reading of all chips. The data has to be ready.
+
+        :return: the raw words of all chips or False if the timing was violated
+        :rtype: list
+        """
+        output = self._gpio.output
+        read_input = self._gpio.input
+        input_many = self._input_many
+        pd_sck = self._pd_sck
+        dout_pins = self._dout_pins
+        perf_counter = time.perf_counter
+
+        words = [0] * len(dout_pins)
+        start_counter = perf_counter()
+        for _ in range(24):
+            output(pd_sck, True)
+            output(pd_sck, False)
+            if input_many is not None:
+                words = [(word << 1) | bit for word, bit in zip(words, input_many(dout_pins))]
+            else:
+                words = [(word << 1) | read_input(pin) for word, pin in zip(words, dout_pins)]
+        for _ in range(self._gain_pulses):
+            output(pd_sck, True)
+            output(pd_sck, False)
+        time_elapsed = perf_counter() - start_counter
+
+        if not self._frame_timer.check(time_elapsed):
+            return False
+        return words
+
+    def read(self, max_tries=40):
+        """
+        read one time aligned frame from all chips
+
+        :param max_tries: how often to poll for data
+        :type max_tries: int
+        :return: the signed values, None for chips with invalid data,
+            or False if not all chips were ready or the timing was violated
+        :rtype: list
+        """
+        self._gpio.output(self._pd_sck, False)
+        if not self._wait_for_ready(max_tries=max_tries):
+            return False
+        words = self._clock_out()
+        if words is False:
+            return False
+        values = []
+        for word in words:
+            value = _decode(word)
+            values.append(None if value is False else value)
+        return values
+
+    def get_raw_data(self, times=5):
+        """
+        read "times" frames in which all chips delivered valid data
+
+        :param times: how many frames
+        :type times: int
+        :return: list of frames, each a list with one value per chip
+        :rtype: list
+        """
+        if not self.min_measures <= times <= self.max_measures:
+            raise ParameterValidationError(
+                "{times} is not within the min/max range defined in the class".format(
+                    times=times
+                )
+            )
+        frames = []
+        while len(frames) < times:
+            frame = self.read()
+            if frame is not False and None not in frame and -1 not in frame:
+                frames.append(frame)
+        return frames
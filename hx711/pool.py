@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Service many independent HX711 from one thread.
+"""
+import collections
+import logging
+import queue
+import threading
+import time
+
+from hx711 import GenericHX711Exception
+
+PoolSample = collections.namedtuple('PoolSample', ['sensor', 'value', 'timestamp', 'status'])
+PoolSample.__doc__ = """
+a sample of one sensor of a HX711Pool
+
+status is "ok" for valid data, why the reading was rejected otherwise:
+"invalid", "timing_violation" or "unsettled" (see HX711._restart_settling),
+or "timeout" if the sensor had no data within the deadline.
+"""
+
+
+class HX711Pool(object):
+    """
+    Reads whichever HX711 has data ready first, so a slow or dead sensor
+    does not hold up the others. All samples are put on one queue, tagged
+    with the name of the sensor.
+    """
+
+    def __init__(self, sensors, deadline=0.4, queue_size=0, poll_interval=0.0005):
+        """
+        :param sensors: the HX711 instances by name, or a list of them named by their index
+        :type sensors: dict or list
+        :param deadline: report a timeout if a sensor has no data for this many seconds
+        :type deadline: float
+        :param queue_size: maximum number of samples in the queue, 0 for no limit
+        :type queue_size: int
+        :param poll_interval: sleep this long when no sensor has data ready
+        :type poll_interval: float
+        """
+        if not isinstance(sensors, dict):
+            sensors = dict(enumerate(sensors))
+        if not sensors:
+            raise ValueError("the pool needs at least one sensor")
+        self.sensors = sensors
+        self.deadline = deadline
+        self.poll_interval = poll_interval
+        self.samples = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self._names = list(sensors)
+        self._offset = 0
+        self._last_sample = {}
+        self._thread = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def _put(self, sample):
+        try:
+            self.samples.put_nowait(sample)
+        except queue.Full:
+            self.dropped += 1
+
+    def poll_once(self, now=None):
+        """
+        read every sensor that has data ready and report sensors past their deadline
+
+        :param now: current time.perf_counter()
+        :type now: float
+        :return: how many sensors have been read
+        :rtype: int
+        """
+        if now is None:
+            now = time.perf_counter()
+        serviced = 0
+        names = self._names
+        # start at a different sensor each time, so no sensor is preferred
+        self._offset = (self._offset + 1) % len(names)
+        for name in names[self._offset:] + names[:self._offset]:
+            sensor = self.sensors[name]
+            if sensor._ready():
+                # PD_SCK has been low since the last sample, that is when the wait has started
+                value = sensor._finish_read(True, self._last_sample.setdefault(name, now))
+                timestamp = time.perf_counter()
+                self._last_sample[name] = timestamp
+                if value is False:
+                    self._put(PoolSample(name, None, timestamp, sensor._last_failure))
+                elif value == -1:
+                    self._put(PoolSample(name, None, timestamp, "invalid"))
+                else:
+                    self._put(PoolSample(name, value, timestamp, "ok"))
+                serviced += 1
+            elif now - self._last_sample.setdefault(name, now) >= self.deadline:
+                logging.debug("sensor {name} missed its deadline".format(name=name))
+                self._last_sample[name] = now
+                self._put(PoolSample(name, None, now, "timeout"))
+        return serviced
+
+    def _run(self):
+        stop = self._stop
+        while not stop.is_set():
+            if not self.poll_once():
+                time.sleep(self.poll_interval)
+
+    def start(self):
+        """
+        start servicing the sensors in a thread
+
+        :raises GenericHX711Exception
+        """
+        if self._thread is not None:
+            raise GenericHX711Exception("the pool is running already")
+        for sensor in self.sensors.values():
+            sensor._check_not_streaming()
+        self._stop.clear()
+        self._last_sample.clear()
+        self._thread = threading.Thread(target=self._run, name="HX711Pool")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """
+        stop the thread
+
+        :param timeout: how long to wait for the thread in seconds
+        :type timeout: float
+        :return: True if the thread has stopped
+        :rtype bool
+        """
+        thread = self._thread
+        if thread is None:
+            return True
+        self._stop.set()
+        thread.join(timeout)
+        if thread.is_alive():
+            return False
+        self._thread = None
+        return True
@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+"""
+Read a HX711 in a separate process, publishing the samples in shared memory.
+
+The worker process has an interpreter of its own, so threads and garbage
+collection of the application cannot stretch the clock pulses. Other
+processes attach to the ring by its name and read the samples without
+copying them through a pipe.
+"""
+from array import array
+import multiprocessing
+from multiprocessing import resource_tracker, shared_memory
+import sys
+import time
+
+from hx711 import HX711, GenericHX711Exception, stats
+
+# count of appended samples and size of the ring, both uint64
+_HEADER_SIZE = 16
+
+# rings created by this process or its parents, which share their resource tracker
+_created = set()
+
+
+class SharedRing(object):
+    """
+    Ring of timestamped samples in a shared memory block for one writer process.
+
+    The block holds a header, the timestamps (float64, time.monotonic()) and
+    the values (int32) as separate arrays. Like RingBuffer, positions count all
+    samples ever appended.
+    """
+
+    def __init__(self, shm, size=None):
+        """
+        use create() or attach()
+
+        :param shm: the shared memory block
+        :type shm: multiprocessing.shared_memory.SharedMemory
+        :param size: capacity of a new ring, None to read it from the header
+        :type size: int
+        """
+        self._shm = shm
+        buf = shm.buf
+        self._header = buf[:_HEADER_SIZE].cast('Q')
+        if size is not None:
+            self._header[0] = 0
+            self._header[1] = size
+        self.size = size = self._header[1]
+        self._timestamps = buf[_HEADER_SIZE:_HEADER_SIZE + 8 * size].cast('d')
+        self._values = buf[_HEADER_SIZE + 8 * size:_HEADER_SIZE + 12 * size].cast('i')
+
+    @classmethod
+    def create(cls, size=4096):
+        """
+        :param size: how many samples the ring holds
+        :type size: int
+        :rtype: SharedRing
+        """
+        if size < 1:
+            raise ValueError("size has to be at least 1. I got: " + str(size))
+        shm = shared_memory.SharedMemory(create=True, size=_HEADER_SIZE + 12 * size)
+        _created.add(shm._name)
+        return cls(shm, size)
+
+    @classmethod
+    def attach(cls, name):
+        """
+        attach to the ring of another process
+
+        :param name: the name of the ring
+        :type name: str
+        :rtype: SharedRing
+        """
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+            # only the creator may remove the block when it exits
+            if shm._name not in _created:
+                resource_tracker.unregister(shm._name, "shared_memory")
+        return cls(shm)
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    @property
+    def count(self):
+        """
+        how many samples have been appended since the ring was created
+
+        :rtype: int
+        """
+        return self._header[0]
+
+    def __len__(self):
+        return min(self.count, self.size)
+
+    @property
+    def timestamps(self):
+        """
+        the timestamps in slot order, without copying
+
+        :rtype: memoryview
+        """
+        return self._timestamps
+
+    @property
+    def values(self):
+        """
+        the values in slot order, without copying
+
+        :rtype: memoryview
+        """
+        return self._values
+
+    def as_numpy(self):
+        """
+        NumPy views of timestamps and values in slot order, without copying
+
+        :rtype: tuple
+        """
+        numpy = stats.numpy
+        if numpy is None:
+            raise ImportError("as_numpy() requires NumPy")
+        return (numpy.frombuffer(self._timestamps, dtype=numpy.float64),
+                numpy.frombuffer(self._values, dtype=numpy.int32))
+
+    def append(self, timestamp, value):
+        index = self._header[0] % self.size
+        self._timestamps[index] = timestamp
+        self._values[index] = value
+        # publish the sample only after it was written
+        self._header[0] += 1
+
+    def _copy(self, view, typecode, start, stop):
+        begin = start % self.size
+        end = begin + stop - start
+        values = array(typecode)
+        if end <= self.size:
+            values.frombytes(view[begin:end].cast('B'))
+        else:
+            values.frombytes(view[begin:].cast('B'))
+            values.frombytes(view[:end - self.size].cast('B'))
+        return values
+
+    def since(self, position):
+        """
+        copy all samples appended after position, see RingBuffer.since
+
+        :param position: a position returned before, or 0 for everything available
+        :type position: int
+        :return: the timestamps, the values and the position to continue from
+        :rtype: tuple
+        """
+        while True:
+            stop = self.count
+            start = max(position, stop - self.size, 0)
+            timestamps = self._copy(self._timestamps, 'd', start, stop)
+            values = self._copy(self._values, 'i', start, stop)
+            # the writer may have overwritten the oldest samples while copying
+            if self.count - start <= self.size:
+                return timestamps, values, stop
+
+    def close(self):
+        """
+        detach from the shared memory
+        """
+        for view in (self._header, self._timestamps, self._values):
+            view.release()
+        self._shm.close()
+
+    def unlink(self):
+        """
+        remove the shared memory block, call it once in the creating process
+        """
+        self._shm.unlink()
+        _created.discard(self._shm._name)
+
+
+def _acquire(name, stop, running, hx711_factory, args, kwargs):
+    """
+    body of the worker process
+    """
+    ring = SharedRing(shared_memory.SharedMemory(name=name))
+    try:
+        hx711 = hx711_factory(*args, **kwargs)
+        append = ring.append
+        monotonic = time.monotonic
+        while not stop.is_set():
+            data = hx711._read()
+            if data is not False and data != -1:
+                append(monotonic(), data)
+    finally:
+        running.clear()
+        ring.close()
+
+
+class AcquisitionProcess(object):
+    """
+    A worker process owning a HX711 and writing every valid sample into a SharedRing.
+    """
+
+    def __init__(self, *args, size=4096, hx711_factory=HX711, **kwargs):
+        """
+        :param args: passed on to hx711_factory in the worker, e.g. dout_pin and pd_sck_pin
+        :param size: how many samples the ring holds
+        :type size: int
+        :param hx711_factory: picklable callable creating the HX711 in the worker
+        :param kwargs: passed on to hx711_factory
+        """
+        self.size = size
+        self._hx711_factory = hx711_factory
+        self._args = args
+        self._kwargs = kwargs
+        self.ring = None
+        self._process = None
+        self._stop = None
+        self._running = None
+
+    @property
+    def running(self):
+        """
+        False once the worker has ended, also if creating the HX711 has failed
+        """
+        return self._running is not None and self._running.is_set()
+
+    def start(self):
+        """
+        create the ring and start the worker process
+
+        :return: the ring
+        :rtype: SharedRing
+        :raises GenericHX711Exception
+        """
+        if self.running:
+            raise GenericHX711Exception("the acquisition process is running already")
+        # join a worker which has ended by itself
+        self.stop()
+        if self.ring is None:
+            self.ring = SharedRing.create(self.size)
+        self._stop = multiprocessing.Event()
+        self._running = multiprocessing.Event()
+        self._running.set()
+        self._process = multiprocessing.Process(
+            target=_acquire,
+            args=(self.ring.name, self._stop, self._running, self._hx711_factory, self._args, self._kwargs),
+            name="HX711 acquisition",
+        )
+        self._process.daemon = True
+        self._process.start()
+        return self.ring
+
+    def stop(self, timeout=None):
+        """
+        stop the worker process. The samples stay in "ring" until close().
+
+        :param timeout: how long to wait for the process in seconds
+        :type timeout: float
+        :return: True if the process has stopped
+        :rtype bool
+        """
+        process = self._process
+        if process is None:
+            return True
+        self._stop.set()
+        process.join(timeout)
+        if process.is_alive():
+            return False
+        self._process = None
+        self._running.clear()
+        return True
+
+    def close(self):
+        """
+        stop the worker and remove the ring
+        """
+        if not self.stop(timeout=1):
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+            self._running.clear()
+        if self.ring is not None:
+            self.ring.close()
+            self.ring.unlink()
+            self.ring = None
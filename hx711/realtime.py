@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Reduce scheduler and garbage collector jitter while reading a HX711.
+
+A clock pulse longer than 60µs powers the HX711 down and spoils the reading.
+RealtimeMode pins the reading thread to one CPU, requests the SCHED_FIFO
+scheduling policy, locks the memory of the process and disables the garbage
+collector while a reading is clocked out. Each setting needs privileges
+(root or CAP_SYS_NICE / CAP_IPC_LOCK); settings which cannot be applied are
+logged as warning and reported, the others still apply.
+"""
+import ctypes
+import ctypes.util
+import logging
+import os
+
+# flags of mlockall(2)
+MCL_CURRENT = 1
+MCL_FUTURE = 2
+
+
+def _libc():
+    name = ctypes.util.find_library("c")
+    if name is None:
+        return None
+    return ctypes.CDLL(name, use_errno=True)
+
+
+class RealtimeMode(object):
+    """
+    realtime settings for the thread reading a HX711
+    """
+
+    def __init__(self, cpu=None, priority=50, lock_memory=True, suspend_gc=True):
+        """
+        :param cpu: pin the thread to this CPU, None to keep the affinity
+        :type cpu: int
+        :param priority: SCHED_FIFO priority between 1 and 99, None to keep the scheduling policy
+        :type priority: int
+        :param lock_memory: lock all current and future memory of the process in RAM (mlockall).
+            This stays in effect for the whole process.
+        :type lock_memory: bool
+        :param suspend_gc: disable the garbage collector while a reading is clocked out
+        :type suspend_gc: bool
+        """
+        if priority is not None and not 1 <= priority <= 99:
+            raise ValueError("priority has to be within [1, 99]. I got: " + str(priority))
+        self.cpu = cpu
+        self.priority = priority
+        self.lock_memory = lock_memory
+        self.suspend_gc = suspend_gc
+
+    def _pin(self):
+        try:
+            # pid 0 is the calling thread
+            os.sched_setaffinity(0, {self.cpu})
+        except (AttributeError, OSError) as error:
+            logging.warning("could not pin the thread to CPU {cpu}: {error}".format(cpu=self.cpu, error=error))
+            return False
+        return True
+
+    def _schedule(self):
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(self.priority))
+        except (AttributeError, OSError) as error:
+            logging.warning("could not set SCHED_FIFO priority {priority}: {error}".format(
+                priority=self.priority, error=error
+            ))
+            return False
+        return True
+
+    def _lock_memory(self):
+        try:
+            libc = _libc()
+            result = -1 if libc is None else libc.mlockall(MCL_CURRENT | MCL_FUTURE)
+        except (AttributeError, OSError) as error:
+            result, reason = -1, error
+        else:
+            reason = os.strerror(ctypes.get_errno()) if libc is not None else "libc not found"
+        if result != 0:
+            logging.warning("could not lock the memory: {reason}".format(reason=reason))
+            return False
+        return True
+
+    def apply(self, hx711=None):
+        """
+        apply the settings to the calling thread
+
+        :param hx711: the HX711 the thread reads, to suspend the garbage collector during its readings
+        :type hx711: HX711
+        :return: for each setting requested whether it could be applied
+        :rtype: dict
+        """
+        report = {}
+        if self.cpu is not None:
+            report["cpu"] = self._pin()
+        if self.priority is not None:
+            report["sched_fifo"] = self._schedule()
+        if self.lock_memory:
+            report["mlockall"] = self._lock_memory()
+        if hx711 is not None and self.suspend_gc:
+            hx711.suspend_gc = True
+            report["suspend_gc"] = True
+        logging.debug("realtime settings: {report}".format(report=report))
+        return report
@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""
+Record the raw frames read from a HX711 and replay them later without hardware.
+
+A FrameRecorder attached to HX711.recorder writes every reading to a binary
+file: the 24 bits as they have come, before validation and conversion, with
+the time waited for data and the time it took to clock them out. ReplayGPIO
+feeds a Recording back through HX711 as fast as possible or at the recorded
+pace, so field problems can be reproduced and the processing of the values
+can be benchmarked on any machine.
+"""
+from array import array
+import struct
+import time
+
+from hx711 import stats
+from hx711.decode import decode
+from hx711.samples import FAILURE_FLAGS, FLAG_INVALID, FLAG_UNSETTLED
+
+# timestamp (time.monotonic_ns() after the reading), ready wait in µs, clock out time in ns,
+# the 24 bit word, gain pulses and status flags (see hx711.samples)
+FRAME = struct.Struct('<qIIIBB')
+# magic and frame size in front of the frames
+_HEADER = struct.Struct('<4sH')
+_MAGIC = b'HXF1'
+_UINT32_MAX = 0xffffffff
+
+
+class FrameRecorder(object):
+    """
+    writes the frames read by a HX711 to a file, see HX711.record_frames
+    """
+
+    def __init__(self, file):
+        """
+        :param file: path of the file to create, or a binary file object to write to
+        :type file: str or file
+        """
+        self._owns_file = not hasattr(file, 'write')
+        self._file = open(file, 'wb') if self._owns_file else file
+        self._file.write(_HEADER.pack(_MAGIC, FRAME.size))
+        self.frames = 0
+
+    def record(self, word, ready_wait, clock_out, pulses, failure=None):
+        """
+        :param word: the bits as they have come
+        :type word: int
+        :param ready_wait: seconds waited for data
+        :type ready_wait: float
+        :param clock_out: seconds it took to clock out the frame
+        :type clock_out: float
+        :param pulses: number of gain pulses after the data bits
+        :type pulses: int
+        :param failure: why the reading was rejected, None for a valid one
+        :type failure: str
+        """
+        self._file.write(FRAME.pack(
+            time.monotonic_ns(),
+            min(int(ready_wait * 1e6), _UINT32_MAX),
+            min(int(clock_out * 1e9), _UINT32_MAX),
+            word,
+            pulses,
+            FAILURE_FLAGS[failure] if failure else 0
+        ))
+        self.frames += 1
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        """
+        flush the frames, and close the file if the recorder opened it
+        """
+        self._file.flush()
+        if self._owns_file:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class Recording(object):
+    """
+    the frames of a recording, one array per field
+    """
+    # field name and array type code
+    _fields = (
+        ("timestamps", 'q'),
+        ("ready_waits", 'I'),
+        ("clock_outs", 'I'),
+        ("words", 'I'),
+        ("pulses", 'B'),
+        ("flags", 'B'),
+    )
+
+    def __init__(self):
+        for name, typecode in self._fields:
+            setattr(self, name, array(typecode))
+
+    def __len__(self):
+        return len(self.words)
+
+    @classmethod
+    def load(cls, file):
+        """
+        :param file: path or binary file object of a recording
+        :type file: str or file
+        :rtype: Recording
+        """
+        if hasattr(file, 'read'):
+            data = file.read()
+        else:
+            with open(file, 'rb') as f:
+                data = f.read()
+        magic, frame_size = _HEADER.unpack_from(data)
+        if magic != _MAGIC or frame_size != FRAME.size:
+            raise ValueError("not a frame recording")
+        # a recording cut off while writing ends with a partial frame
+        end = len(data) - (len(data) - _HEADER.size) % FRAME.size
+        recording = cls()
+        columns = [getattr(recording, name) for name, _ in cls._fields]
+        appends = [column.append for column in columns]
+        for frame in FRAME.iter_unpack(memoryview(data)[_HEADER.size:end]):
+            for append, field in zip(appends, frame):
+                append(field)
+        return recording
+
+    def values(self):
+        """
+        convert the words of the valid frames like HX711._read does
+
+        :return: the signed values, a NumPy array if NumPy is installed
+        :rtype: numpy.ndarray or array
+        """
+        values, _ = decode(self.words)
+        numpy = stats.numpy
+        if numpy is not None:
+            return values[numpy.frombuffer(self.flags, dtype=numpy.uint8) == 0]
+        return array('i', [value for value, flags in zip(values, self.flags) if not flags])
+
+
+class ReplayGPIO(object):
+    """
+    GPIO backend with the RPi.GPIO interface playing back a Recording.
+
+    Only frames with all 24 bits are played back, i.e. valid and saturated
+    ones. Frames without data ready or with a timing violation are skipped.
+    When all frames have been played, DOUT stays high.
+
+    HX711() reads two frames to apply the channel and the gain; call rewind()
+    afterwards to replay from the first frame.
+    """
+    BOARD = 10
+    BCM = 11
+    OUT = 0
+    IN = 1
+    LOW = 0
+    HIGH = 1
+    RISING = 31
+    FALLING = 32
+    BOTH = 33
+    PUD_OFF = 20
+    PUD_DOWN = 21
+    PUD_UP = 22
+
+    def __init__(self, recording, dout_pin=5, pd_sck_pin=6, speed=None):
+        """
+        :param recording: the frames to play
+        :type recording: Recording
+        :param dout_pin: DOUT pin of the HX711 reading the frames
+        :type dout_pin: int
+        :param pd_sck_pin: PD_SCK pin of the HX711 reading the frames
+        :type pd_sck_pin: int
+        :param speed: None to play as fast as possible, 1.0 for the recorded pace, 2.0 for twice as fast, ...
+        :type speed: float
+        """
+        self.dout_pin = dout_pin
+        self.pd_sck_pin = pd_sck_pin
+        self.speed = speed
+        self._mode = None
+        self._sck = False
+        self._pulses = 0
+        self._index = 0
+        self._start = None
+        playable = [
+            index for index, flags in enumerate(recording.flags) if flags in (0, FLAG_INVALID, FLAG_UNSETTLED)
+        ]
+        self._words = array('I', [recording.words[index] for index in playable])
+        # when the data of each frame was ready, relative to the first one
+        ready_times = [recording.timestamps[index] - recording.clock_outs[index] for index in playable]
+        self._ready_times = array('d', [(ready - ready_times[0]) / 1e9 for ready in ready_times])
+
+    @property
+    def position(self):
+        """
+        how many frames have been played
+
+        :rtype: int
+        """
+        return self._index
+
+    @property
+    def finished(self):
+        return self._index >= len(self._words)
+
+    def rewind(self):
+        """
+        play from the first frame again, with the recorded pace starting now
+        """
+        self._index = 0
+        self._pulses = 0
+        self._start = None
+
+    def setmode(self, mode):
+        self._mode = mode
+
+    def getmode(self):
+        return self._mode
+
+    def setwarnings(self, flag):
+        pass
+
+    def setup(self, channel, direction, pull_up_down=None, initial=None):
+        pass
+
+    def _data_ready(self):
+        if self._index >= len(self._words):
+            return False
+        if self.speed is None:
+            return True
+        now = time.perf_counter()
+        if self._start is None:
+            self._start = now
+        return now - self._start >= self._ready_times[self._index] / self.speed
+
+    def output(self, channel, value):
+        if channel != self.pd_sck_pin:
+            return
+        value = bool(value)
+        if value and not self._sck and (self._pulses or self._data_ready()):
+            self._pulses += 1
+        self._sck = value
+
+    def input(self, channel):
+        if channel != self.dout_pin:
+            return 0
+        pulses = self._pulses
+        if 0 < pulses <= 24:
+            return (self._words[self._index] >> (24 - pulses)) & 1
+        if pulses > 24:
+            # the gain pulses are done, the next frame follows
+            self._index += 1
+            self._pulses = 0
+        return 0 if self._data_ready() else 1
+
+    def wait_for_edge(self, channel, edge, bouncetime=None, timeout=None):
+        raise RuntimeError("ReplayGPIO has no edge detection")
+
+    def cleanup(self, channel=None):
+        pass
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Fixed size ring buffer on top of a preallocated array.
+"""
+from array import array
+
+
+class RingBuffer(object):
+    """
+    Ring buffer for one writer and any number of readers.
+
+    Values are stored in a preallocated array, so appending does not allocate
+    memory. Readers never block the writer. Positions count all values ever
+    appended, so readers can keep track of what they have seen already.
+    """
+
+    def __init__(self, size, typecode='i'):
+        """
+        :param size: how many values the buffer holds
+        :type size: int
+        :param typecode: array type code of the values
+        :type typecode: str
+        """
+        if size < 1:
+            raise ValueError("size has to be at least 1. I got: " + str(size))
+        self.size = size
+        self.typecode = typecode
+        self._data = array(typecode, [0]) * size
+        self._count = 0
+
+    def __len__(self):
+        return min(self._count, self.size)
+
+    @property
+    def count(self):
+        """
+        how many values have been appended since the buffer was created
+
+        :rtype: int
+        """
+        return self._count
+
+    def append(self, value):
+        """
+        store a value, overwriting the oldest one when the buffer is full
+        """
+        self._data[self._count % self.size] = value
+        # publish the value only after it was written
+        self._count += 1
+
+    def clear(self):
+        self._count = 0
+
+    def _copy(self, start, stop):
+        """
+        copy the values between the positions start and stop
+
+        :rtype: array
+        """
+        begin = start % self.size
+        end = begin + stop - start
+        if end <= self.size:
+            return self._data[begin:end]
+        return self._data[begin:] + self._data[:end - self.size]
+
+    def since(self, position):
+        """
+        get all values appended after position.
+        Values which have already been overwritten are skipped.
+
+        :param position: a position returned before, or 0 for everything available
+        :type position: int
+        :return: the values and the position to continue from
+        :rtype: tuple
+        """
+        while True:
+            stop = self._count
+            start = max(position, stop - self.size, 0)
+            values = self._copy(start, stop)
+            # the writer may have overwritten the oldest values while copying
+            if self._count - start <= self.size:
+                return values, stop
+
+    def latest(self, n=1):
+        """
+        get the latest n values, oldest first
+
+        :param n: how many values, at most the number of values available
+        :type n: int
+        :rtype: array
+        """
+        values, _ = self.since(self._count - n)
+        return values
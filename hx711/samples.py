@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+Compact storage of timestamped samples.
+
+A SampleBuffer keeps every field in an array of its own (struct of arrays),
+so a sample takes 15 bytes instead of a tuple of Python objects, appending
+does not create objects and the columns can be used as NumPy arrays or
+written out as bytes directly.
+"""
+from array import array
+import struct
+import sys
+
+# status flags of a sample, 0 for a valid value
+FLAG_NOT_READY = 1
+FLAG_INVALID = 2
+FLAG_TIMING_VIOLATION = 4
+FLAG_UNSETTLED = 8
+
+FAILURE_FLAGS = {
+    "not_ready": FLAG_NOT_READY,
+    "invalid": FLAG_INVALID,
+    "timing_violation": FLAG_TIMING_VIOLATION,
+    "unsettled": FLAG_UNSETTLED,
+}
+
+# column name and array type code, which NumPy understands as well
+_COLUMNS = (
+    ("timestamps", 'q'),
+    ("values", 'i'),
+    ("channels", 'B'),
+    ("gains", 'B'),
+    ("flags", 'B'),
+)
+# magic and sample count in front of the columns of to_bytes()
+_HEADER = struct.Struct('<4sQ')
+_MAGIC = b'HXS1'
+
+
+class Sample(object):
+    """
+    view of one sample of a SampleBuffer, created on access only
+    """
+    __slots__ = ('_buffer', '_index')
+
+    def __init__(self, buffer, index):
+        self._buffer = buffer
+        self._index = index
+
+    @property
+    def timestamp(self):
+        """
+        time.monotonic_ns() when the sample was read
+
+        :rtype: int
+        """
+        return self._buffer.timestamps[self._index]
+
+    @property
+    def value(self):
+        return self._buffer.values[self._index]
+
+    @property
+    def channel(self):
+        return chr(self._buffer.channels[self._index])
+
+    @property
+    def gain(self):
+        return self._buffer.gains[self._index]
+
+    @property
+    def flags(self):
+        return self._buffer.flags[self._index]
+
+    @property
+    def valid(self):
+        return self._buffer.flags[self._index] == 0
+
+    def __eq__(self, other):
+        return isinstance(other, Sample) and self._astuple() == other._astuple()
+
+    def _astuple(self):
+        return self.timestamp, self.value, self.channel, self.gain, self.flags
+
+    def __repr__(self):
+        return "Sample(timestamp={}, value={}, channel={!r}, gain={}, flags={})".format(*self._astuple())
+
+
+class SampleBuffer(object):
+    """
+    growing struct of arrays of timestamp, raw value, channel, gain and status flags
+    """
+
+    def __init__(self):
+        for name, typecode in _COLUMNS:
+            setattr(self, name, array(typecode))
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def nbytes(self):
+        """
+        memory used by the samples
+
+        :rtype: int
+        """
+        return sum(len(column) * column.itemsize for column in self._columns())
+
+    def _columns(self):
+        return [getattr(self, name) for name, _ in _COLUMNS]
+
+    def append(self, timestamp, value, channel='A', gain=128, flags=0):
+        """
+        :param timestamp: time.monotonic_ns() when the sample was read
+        :type timestamp: int
+        :param value: the raw value, 0 for a reading that failed
+        :type value: int
+        :param channel: "A" or "B"
+        :type channel: str
+        :param gain: 128, 64 or 32
+        :type gain: int
+        :param flags: 0 for a valid value or FLAG_NOT_READY, FLAG_INVALID, FLAG_TIMING_VIOLATION or FLAG_UNSETTLED
+        :type flags: int
+        """
+        self.timestamps.append(timestamp)
+        self.values.append(value)
+        self.channels.append(ord(channel))
+        self.gains.append(gain)
+        self.flags.append(flags)
+
+    def extend(self, other):
+        """
+        append all samples of another SampleBuffer
+
+        :type other: SampleBuffer
+        """
+        for column, other_column in zip(self._columns(), other._columns()):
+            column.extend(other_column)
+
+    def clear(self):
+        for column in self._columns():
+            del column[:]
+
+    def __getitem__(self, index):
+        """
+        a Sample view for an index, a new SampleBuffer for a slice
+        """
+        if isinstance(index, slice):
+            part = SampleBuffer()
+            for name, _ in _COLUMNS:
+                setattr(part, name, getattr(self, name)[index])
+            return part
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("sample index out of range")
+        return Sample(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield Sample(self, index)
+
+    def valid_values(self):
+        """
+        :return: the values of the samples without flags
+        :rtype: array
+        """
+        return array('i', [value for value, flags in zip(self.values, self.flags) if not flags])
+
+    def as_numpy(self):
+        """
+        NumPy views of the columns by name, without copying
+
+        :rtype: dict
+        """
+        from hx711 import stats
+        numpy = stats.numpy
+        if numpy is None:
+            raise ImportError("as_numpy() requires NumPy")
+        return {name: numpy.frombuffer(getattr(self, name), dtype=typecode) for name, typecode in _COLUMNS}
+
+    def to_bytes(self):
+        """
+        :return: a header and the columns one after another, little endian
+        :rtype: bytes
+        """
+        parts = [_HEADER.pack(_MAGIC, len(self))]
+        for column in self._columns():
+            if sys.byteorder == 'big' and column.itemsize > 1:
+                column = array(column.typecode, column)
+                column.byteswap()
+            parts.append(column.tobytes())
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        :param data: what to_bytes() returned
+        :type data: bytes
+        :rtype: SampleBuffer
+        """
+        magic, count = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("not a sample buffer")
+        samples = cls()
+        offset = _HEADER.size
+        for column in samples._columns():
+            size = count * column.itemsize
+            if offset + size > len(data):
+                raise ValueError("the data ends within the samples")
+            column.frombytes(data[offset:offset + size])
+            if sys.byteorder == 'big' and column.itemsize > 1:
+                column.byteswap()
+            offset += size
+        return samples
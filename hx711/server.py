@@ -0,0 +1,408 @@
+# -*- coding: utf-8 -*-
+"""
+asyncio server publishing the samples of HX711 sensors to many clients.
+
+The sensors are read continuously, every sample is sent once, in batches,
+no matter how many clients there are. A batch is sent as length prefixed
+frame over TCP and as datagram over UDP:
+
+    batch:  magic b'HXN1', sequence number (uint32), number of samples (uint16)
+    sample: time.monotonic_ns() of the reading (int64), index of the sensor (uint16), raw value (int32)
+
+all little endian. The length prefix of TCP is a uint32. The sequence
+numbers let clients count the batches they missed.
+
+Every TCP client has a queue of batches of its own. If a client does not
+keep up, its oldest batches are dropped, so neither the sensors nor the
+other clients wait for it. UDP subscribers send b'HXSUB' to the UDP port,
+repeated within subscription_timeout, and b'HXUNSUB' to stop.
+
+    server = SampleServer([AsyncHX711(hx711)])
+    await server.start(host='0.0.0.0', tcp_port=7711, udp_port=7711)
+
+    client = await SampleClient.connect('scale.local', 7711)
+    async for batch in client:
+        for timestamp, sensor, value in batch.samples:
+            ...
+"""
+import asyncio
+import collections
+import logging
+import struct
+import time
+
+from hx711 import HX711, GenericHX711Exception
+from hx711.aio import AsyncHX711
+
+BATCH_HEADER = struct.Struct('<4sIH')
+SAMPLE = struct.Struct('<qHi')
+LENGTH = struct.Struct('<I')
+MAGIC = b'HXN1'
+SUBSCRIBE = b'HXSUB'
+UNSUBSCRIBE = b'HXUNSUB'
+# batches fit into one datagram without IP fragmentation on Ethernet
+MAX_DATAGRAM_SIZE = 1472
+MAX_BATCH_SIZE = (MAX_DATAGRAM_SIZE - BATCH_HEADER.size) // SAMPLE.size
+
+Batch = collections.namedtuple('Batch', ['sequence', 'samples'])
+Batch.__doc__ = """
+samples sent together, a list of (timestamp, sensor, value) tuples
+"""
+
+
+def encode_batch(sequence, samples):
+    """
+    :param sequence: number of the batch
+    :type sequence: int
+    :param samples: (timestamp, sensor, value) tuples
+    :type samples: list
+    :rtype: bytes
+    """
+    pack = SAMPLE.pack
+    return BATCH_HEADER.pack(MAGIC, sequence, len(samples)) + b''.join([pack(*sample) for sample in samples])
+
+
+def decode_batch(data):
+    """
+    :param data: what encode_batch returned
+    :type data: bytes
+    :rtype: Batch
+    """
+    if len(data) < BATCH_HEADER.size:
+        raise ValueError("a batch takes at least {size} bytes".format(size=BATCH_HEADER.size))
+    magic, sequence, count = BATCH_HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a batch of samples")
+    if len(data) != BATCH_HEADER.size + count * SAMPLE.size:
+        raise ValueError("the size of the batch does not match its {count} samples".format(count=count))
+    return Batch(sequence, list(SAMPLE.iter_unpack(memoryview(data)[BATCH_HEADER.size:])))
+
+
+class _TcpClient(object):
+    """
+    queue of the frames for one TCP client, dropping the oldest when full
+    """
+
+    def __init__(self, writer, queue_size):
+        self.writer = writer
+        self.peer = writer.get_extra_info('peername')
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+    def send(self, frame):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(frame)
+
+    async def run(self):
+        while True:
+            frame = await self.queue.get()
+            self.writer.write(frame)
+            # waits while the socket buffer is full, meanwhile send() drops frames
+            await self.writer.drain()
+
+
+class _SubscriptionProtocol(asyncio.DatagramProtocol):
+    """
+    keeps the addresses of the UDP subscribers of a SampleServer
+    """
+
+    def __init__(self, server):
+        self.server = server
+
+    def datagram_received(self, data, address):
+        subscribers = self.server._subscribers
+        if data == SUBSCRIBE:
+            subscribers[address] = time.monotonic() + self.server.subscription_timeout
+        elif data == UNSUBSCRIBE:
+            subscribers.pop(address, None)
+        else:
+            logging.debug("ignoring datagram from {address}".format(address=address))
+
+
+class SampleServer(object):
+    """
+    reads sensors continuously and publishes their samples over TCP and UDP
+    """
+    # seconds until a sensor which has failed is read again, doubled after each failure up to max_restart_delay
+    restart_delay = 0.5
+    max_restart_delay = 30.0
+
+    def __init__(self, sensors, batch_size=32, batch_interval=0.1, client_queue_size=64,
+                 subscription_timeout=10.0, udp_buffer_limit=65536):
+        """
+        :param sensors: the sensors, AsyncHX711 or HX711 instances. Samples carry their index.
+        :type sensors: list
+        :param batch_size: send a batch when it has this many samples
+        :type batch_size: int
+        :param batch_interval: send the samples at least this often in seconds
+        :type batch_interval: float
+        :param client_queue_size: how many batches a TCP client may lag behind before they are dropped
+        :type client_queue_size: int
+        :param subscription_timeout: UDP subscriptions end after this many seconds without renewal
+        :type subscription_timeout: float
+        :param udp_buffer_limit: drop batches for UDP while this many bytes are waiting to be sent
+        :type udp_buffer_limit: int
+        """
+        if not 1 <= batch_size <= MAX_BATCH_SIZE:
+            raise ValueError("batch_size has to be between 1 and {max}. I got: {size}".format(
+                max=MAX_BATCH_SIZE, size=batch_size
+            ))
+        self.sensors = [AsyncHX711(sensor) if isinstance(sensor, HX711) else sensor for sensor in sensors]
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.client_queue_size = client_queue_size
+        self.subscription_timeout = subscription_timeout
+        self.udp_buffer_limit = udp_buffer_limit
+        self.tcp_port = None
+        self.udp_port = None
+        self.batches = 0
+        self.udp_dropped = 0
+        self._pending = []
+        self._sequence = 0
+        self._clients = set()
+        self._client_tasks = set()
+        # address: time.monotonic() the subscription ends
+        self._subscribers = {}
+        self._tcp_server = None
+        self._udp_transport = None
+        self._tasks = []
+        # "running" or "restarting", the restarts and the last error of each sensor
+        self._sensor_states = [{"state": "running", "restarts": 0, "error": None} for _ in self.sensors]
+
+    async def start(self, host='127.0.0.1', tcp_port=0, udp_port=0):
+        """
+        start reading the sensors and listening
+
+        :param host: address to listen on
+        :type host: str
+        :param tcp_port: TCP port, 0 for any free one, None for no TCP
+        :type tcp_port: int
+        :param udp_port: UDP port, 0 for any free one, None for no UDP
+        :type udp_port: int
+        """
+        loop = asyncio.get_running_loop()
+        if tcp_port is not None:
+            self._tcp_server = await asyncio.start_server(self._serve_client, host, tcp_port)
+            self.tcp_port = self._tcp_server.sockets[0].getsockname()[1]
+        if udp_port is not None:
+            self._udp_transport, _ = await loop.create_datagram_endpoint(
+                lambda: _SubscriptionProtocol(self), local_addr=(host, udp_port)
+            )
+            self.udp_port = self._udp_transport.get_extra_info('sockname')[1]
+        self._tasks = [loop.create_task(self._acquire(index, sensor)) for index, sensor in enumerate(self.sensors)]
+        self._tasks.append(loop.create_task(self._flush_periodically()))
+
+    async def close(self):
+        """
+        stop reading the sensors and disconnect all clients
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._tcp_server is not None:
+            self._tcp_server.close()
+            for task in self._client_tasks:
+                task.cancel()
+            await asyncio.gather(*self._client_tasks, return_exceptions=True)
+            await self._tcp_server.wait_closed()
+            self._tcp_server = None
+        if self._udp_transport is not None:
+            self._udp_transport.close()
+            self._udp_transport = None
+
+    def stats(self):
+        """
+        :return: the number of batches published, the state of each sensor, the TCP clients
+            with their queued and dropped batches, and the UDP subscribers and dropped batches
+        :rtype: dict
+        """
+        return {
+            "batches": self.batches,
+            "sensors": [dict(state) for state in self._sensor_states],
+            "clients": [
+                {"peer": client.peer, "queued": client.queue.qsize(), "dropped": client.dropped}
+                for client in self._clients
+            ],
+            "subscribers": list(self._subscribers),
+            "udp_dropped": self.udp_dropped,
+        }
+
+    async def _acquire(self, index, sensor):
+        state = self._sensor_states[index]
+        delay = self.restart_delay
+        while True:
+            state["state"] = "running"
+            try:
+                async for value in sensor.stream():
+                    delay = self.restart_delay
+                    self._pending.append((time.monotonic_ns(), index, value))
+                    if len(self._pending) >= self.batch_size:
+                        self._publish()
+            except GenericHX711Exception as error:
+                logging.warning('sensor {index} failed, reading it again in {delay}s: {error}'.format(
+                    index=index, delay=delay, error=error
+                ))
+                state.update(state="restarting", restarts=state["restarts"] + 1, error=str(error))
+                await asyncio.sleep(delay)
+                delay = min(2 * delay, self.max_restart_delay)
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.batch_interval)
+            if self._pending:
+                self._publish()
+
+    def _publish(self):
+        samples = self._pending
+        self._pending = []
+        batch = encode_batch(self._sequence, samples)
+        self._sequence = (self._sequence + 1) & 0xffffffff
+        self.batches += 1
+
+        if self._clients:
+            frame = LENGTH.pack(len(batch)) + batch
+            for client in self._clients:
+                client.send(frame)
+
+        if self._subscribers:
+            now = time.monotonic()
+            for address in [address for address, end in self._subscribers.items() if end < now]:
+                del self._subscribers[address]
+            transport = self._udp_transport
+            if transport.get_write_buffer_size() > self.udp_buffer_limit:
+                self.udp_dropped += 1
+                return
+            for address in self._subscribers:
+                transport.sendto(batch, address)
+
+    async def _serve_client(self, reader, writer):
+        client = _TcpClient(writer, self.client_queue_size)
+        self._clients.add(client)
+        task = asyncio.current_task()
+        self._client_tasks.add(task)
+        logging.debug("client {peer} connected".format(peer=client.peer))
+        sender = asyncio.ensure_future(client.run())
+        # clients send nothing, the read ends when they disconnect
+        receiver = asyncio.ensure_future(reader.read())
+        try:
+            await asyncio.wait([sender, receiver], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            self._clients.discard(client)
+            self._client_tasks.discard(task)
+            sender.cancel()
+            receiver.cancel()
+            await asyncio.gather(sender, receiver, return_exceptions=True)
+            writer.close()
+            logging.debug("client {peer} disconnected".format(peer=client.peer))
+
+
+class _DatagramReceiver(asyncio.DatagramProtocol):
+    """
+    puts the batches received by a UDP SampleClient into its queue
+    """
+
+    def __init__(self, queue):
+        self.queue = queue
+
+    def datagram_received(self, data, address):
+        try:
+            batch = decode_batch(data)
+        except ValueError as error:
+            logging.debug("ignoring datagram from {address}: {error}".format(address=address, error=error))
+            return
+        if self.queue.full():
+            # the sequence numbers tell the client
+            return
+        self.queue.put_nowait(batch)
+
+
+class SampleClient(object):
+    """
+    receives the batches of a SampleServer, create it with connect() or subscribe()
+    """
+
+    def __init__(self):
+        self.lost = 0
+        self._next_sequence = None
+        self._reader = None
+        self._writer = None
+        self._transport = None
+        self._queue = None
+        self._renewal = None
+
+    @classmethod
+    async def connect(cls, host, port):
+        """
+        receive the batches over TCP
+
+        :rtype: SampleClient
+        """
+        client = cls()
+        client._reader, client._writer = await asyncio.open_connection(host, port)
+        return client
+
+    @classmethod
+    async def subscribe(cls, host, port, queue_size=256, renewal_interval=5.0):
+        """
+        receive the batches as UDP datagrams
+
+        :param queue_size: how many batches to keep until they are received
+        :type queue_size: int
+        :param renewal_interval: seconds between two subscriptions, below the subscription_timeout of the server
+        :type renewal_interval: float
+        :rtype: SampleClient
+        """
+        client = cls()
+        client._queue = asyncio.Queue(maxsize=queue_size)
+        loop = asyncio.get_running_loop()
+        client._transport, _ = await loop.create_datagram_endpoint(
+            lambda: _DatagramReceiver(client._queue), remote_addr=(host, port)
+        )
+        client._transport.sendto(SUBSCRIBE)
+        client._renewal = loop.create_task(client._renew(renewal_interval))
+        return client
+
+    async def _renew(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            self._transport.sendto(SUBSCRIBE)
+
+    async def receive(self):
+        """
+        wait for the next batch
+
+        :return: the batch, None when the server closed the connection
+        :rtype: Batch
+        """
+        if self._queue is not None:
+            batch = await self._queue.get()
+        else:
+            try:
+                length, = LENGTH.unpack(await self._reader.readexactly(LENGTH.size))
+                batch = decode_batch(await self._reader.readexactly(length))
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return None
+        if self._next_sequence is not None:
+            self.lost += (batch.sequence - self._next_sequence) & 0xffffffff
+        self._next_sequence = (batch.sequence + 1) & 0xffffffff
+        return batch
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        batch = await self.receive()
+        if batch is None:
+            raise StopAsyncIteration
+        return batch
+
+    async def close(self):
+        if self._transport is not None:
+            self._renewal.cancel()
+            self._transport.sendto(UNSUBSCRIBE)
+            self._transport.close()
+        if self._writer is not None:
+            self._writer.close()
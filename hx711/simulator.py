@@ -0,0 +1,380 @@
+# -*- coding: utf-8 -*-
+"""
+Software model of the HX711 and a GPIO backend driving it.
+
+The model follows the timing of the datasheet closely enough to benchmark
+the bit-banging code without a Raspberry Pi:
+
+* conversions complete on a fixed grid of 10 or 80 samples per second
+* DOUT goes low when a conversion is ready and shifts out 24 bits MSB first
+* the 25th to 27th PD_SCK pulse select channel and gain of the next conversion
+* PD_SCK high for 60µs or more powers the chip down, PD_SCK low resets it
+"""
+import collections
+import random
+import time
+
+from hx711 import HX711
+
+
+class SimulatedHX711(object):
+    """
+    A single simulated HX711 chip
+    """
+    # after power up the output needs 4 conversion periods to settle
+    # (400ms @ 10SPS, 50ms @ 80SPS)
+    settling_conversions = 4
+    # the number of pulses within a conversation selects channel and gain of the next conversion
+    _pulses_to_setting = {
+        25: ('A', 128),
+        26: ('B', 32),
+        27: ('A', 64),
+    }
+    _valid_rates = [10, 80]
+
+    def __init__(self, dout_pin, pd_sck_pin, rate=80, value=0, noise=0, seed=None,
+                 power_down_time=0.00006, history=100000, clock=time.perf_counter):
+        """
+        :param dout_pin: GPIO DOUT is connected to
+        :type dout_pin: int
+        :param pd_sck_pin: GPIO PD_SCK is connected to
+        :type pd_sck_pin: int
+        :param rate: output data rate in samples per second (RATE pin), 10 or 80
+        :type rate: int
+        :param value: signed counts to convert, or callable(channel, gain, timestamp) returning them
+        :type value: int or callable
+        :param noise: standard deviation of gaussian noise added to each conversion
+        :type noise: float
+        :param seed: seed for the noise generator
+        :param power_down_time: the chip powers down if PD_SCK stays high for this time in seconds
+        :type power_down_time: float
+        :param history: how many pulse timings to keep for statistics
+        :type history: int
+        :param clock: monotonic clock returning seconds
+        """
+        if rate not in self._valid_rates:
+            raise ValueError("rate has to be 10 or 80. I got: " + str(rate))
+        self.dout_pin = dout_pin
+        self.pd_sck_pin = pd_sck_pin
+        self.rate = rate
+        self.period = 1.0 / rate
+        self.value = value
+        self.noise = noise
+        self._random = random.Random(seed)
+        self.power_down_time = power_down_time
+        self._clock = clock
+
+        # statistics
+        self.conversions = 0
+        self.frames = 0
+        self.overruns = 0
+        self.power_downs = 0
+        self.sck_high_times = collections.deque(maxlen=history)
+        self.bit_periods = collections.deque(maxlen=history)
+        self.ready_latencies = collections.deque(maxlen=history)
+        self.frame_times = collections.deque(maxlen=history)
+
+        self._sck = False
+        self._sck_changed_at = clock()
+        self._last_rising_edge = None
+        self._power_up(self._sck_changed_at)
+
+    @property
+    def powered(self):
+        return self._powered
+
+    @property
+    def setting(self):
+        """
+        channel and gain used for the next conversion
+
+        :rtype: tuple
+        """
+        return self._setting
+
+    def _power_up(self, now):
+        self._powered = True
+        self._setting = ('A', 128)
+        self._settle_left = self.settling_conversions
+        self._next_conversion = now + self.period
+        self._word = None
+        self._pulses = 0
+
+    def _convert(self, at):
+        """
+        run one conversion finishing at "at" and latch the result as 24 bit word
+        """
+        channel, gain = self._setting
+        if callable(self.value):
+            value = self.value(channel, gain, at)
+        else:
+            value = self.value
+        if self.noise:
+            value += self._random.gauss(0, self.noise)
+        if self._settle_left > 1:
+            # the digital filter has not settled yet
+            value *= 1.0 - float(self._settle_left - 1) / self.settling_conversions
+        if self._settle_left > 0:
+            self._settle_left -= 1
+        value = int(round(value))
+        value = max(-0x800000, min(0x7fffff, value))
+        self._word = value & 0xffffff
+        self._ready_since = at
+        self.conversions += 1
+
+    def _update(self, now):
+        """
+        advance the conversion grid up to "now"
+        """
+        if self._sck and now - self._sck_changed_at >= self.power_down_time:
+            if self._powered:
+                self._powered = False
+                self.power_downs += 1
+            return
+        if not self._powered:
+            return
+        while now >= self._next_conversion:
+            at = self._next_conversion
+            self._next_conversion += self.period
+            if 0 < self._pulses < 24:
+                self.overruns += 1
+                if at - self._sck_changed_at < self.period:
+                    # the conversation is still going on, the new result is lost
+                    self.conversions += 1
+                    continue
+                # the conversation has been abandoned
+            self._pulses = 0
+            self._convert(at)
+
+    def time_to_ready(self, now=None):
+        """
+        seconds until DOUT goes low, 0 if it is low already
+
+        :rtype: float
+        """
+        if now is None:
+            now = self._clock()
+        self._update(now)
+        if not self._powered or self._sck:
+            return None
+        if self._word is not None and self._pulses == 0:
+            return 0.0
+        return self._next_conversion - now
+
+    def dout(self, now=None):
+        """
+        level of the DOUT pin
+
+        :rtype: int
+        """
+        if now is None:
+            now = self._clock()
+        self._update(now)
+        if not self._powered:
+            return 1
+        if self._pulses == 0:
+            return 0 if self._word is not None else 1
+        if self._pulses <= 24:
+            return (self._word >> (24 - self._pulses)) & 1
+        return 1
+
+    def sck(self, level, now=None):
+        """
+        drive the PD_SCK pin
+
+        :param level: new level
+        :type level: bool
+        """
+        if now is None:
+            now = self._clock()
+        level = bool(level)
+        if level == self._sck:
+            return
+        self._update(now)
+        if level:
+            if self._powered and self._word is not None:
+                self._pulses += 1
+                if self._pulses == 1:
+                    self._last_rising_edge = None
+                    self._frame_start = now
+                    self.ready_latencies.append(now - self._ready_since)
+                if self._last_rising_edge is not None:
+                    self.bit_periods.append(now - self._last_rising_edge)
+                self._last_rising_edge = now
+                if self._pulses == 25:
+                    self.frames += 1
+                if self._pulses in self._pulses_to_setting:
+                    self._setting = self._pulses_to_setting[self._pulses]
+        else:
+            high_time = now - self._sck_changed_at
+            self.sck_high_times.append(high_time)
+            if not self._powered:
+                # PD_SCK returns to low: the chip resets and starts over
+                self._power_up(now)
+            elif self._pulses == 25:
+                self.frame_times.append(now - self._frame_start)
+            elif self._pulses in self._pulses_to_setting:
+                self.frame_times[-1] = now - self._frame_start
+        self._sck = level
+        self._sck_changed_at = now
+
+
+class SimulatedGPIO(object):
+    """
+    GPIO backend with the RPi.GPIO interface driving simulated HX711 chips
+
+    Several chips may share one PD_SCK pin.
+    """
+    BOARD = 10
+    BCM = 11
+    OUT = 0
+    IN = 1
+    LOW = 0
+    HIGH = 1
+    RISING = 31
+    FALLING = 32
+    BOTH = 33
+    PUD_OFF = 20
+    PUD_DOWN = 21
+    PUD_UP = 22
+
+    def __init__(self, *chips, edge_detection=True, clock=time.perf_counter):
+        """
+        :param chips: simulated chips to attach
+        :type chips: SimulatedHX711
+        :param edge_detection: False simulates a platform without edge detection
+        :type edge_detection: bool
+        :param clock: monotonic clock returning seconds, shared with the chips
+        """
+        self.edge_detection = edge_detection
+        self._clock = clock
+        self._mode = None
+        self._levels = {}
+        self._sck_chips = {}
+        self._dout_chips = {}
+        # pulse, duration, frames to skip and frames to stall, see stall()
+        self._stall = None
+        for chip in chips:
+            self.attach(chip)
+
+    def attach(self, chip):
+        """
+        connect a simulated chip to its pins
+
+        :type chip: SimulatedHX711
+        """
+        self._sck_chips.setdefault(chip.pd_sck_pin, []).append(chip)
+        self._dout_chips[chip.dout_pin] = chip
+
+    def stall(self, pulse, duration, skip=0, frames=1):
+        """
+        keep PD_SCK high for a while after a rising edge, like a preempted driver would.
+        A stall longer than the power_down_time of the chip powers it down.
+
+        :param pulse: index of the pulse in the frame, 0 for the first data pulse, 24 for the first gain pulse
+        :type pulse: int
+        :param duration: how long to stall in seconds
+        :type duration: float
+        :param skip: frames to pass before the first stall
+        :type skip: int
+        :param frames: how many frames to stall, None for every frame
+        :type frames: int
+        """
+        self._stall = [pulse, duration, skip, frames]
+
+    def setmode(self, mode):
+        self._mode = mode
+
+    def getmode(self):
+        return self._mode
+
+    def setwarnings(self, flag):
+        pass
+
+    def setup(self, channel, direction, pull_up_down=None, initial=None):
+        if direction == self.OUT and initial is not None:
+            self.output(channel, initial)
+        elif direction == self.IN and pull_up_down is not None:
+            # level of a pin without a chip attached
+            self._levels[channel] = int(pull_up_down == self.PUD_UP)
+
+    def output(self, channel, value):
+        now = self._clock()
+        self._levels[channel] = int(bool(value))
+        chips = self._sck_chips.get(channel, ())
+        stalled = value and self._stall is not None and chips and chips[0]._pulses == self._stall[0]
+        for chip in chips:
+            chip.sck(value, now)
+        if stalled:
+            pulse, duration, skip, frames = self._stall
+            if skip:
+                self._stall[2] = skip - 1
+                return
+            if frames is not None:
+                self._stall = [pulse, duration, 0, frames - 1] if frames > 1 else None
+            time.sleep(duration)
+
+    def input(self, channel):
+        chip = self._dout_chips.get(channel)
+        if chip is None:
+            return self._levels.get(channel, 0)
+        return chip.dout(self._clock())
+
+    def wait_for_edge(self, channel, edge, bouncetime=None, timeout=None):
+        """
+        block until the simulated chip pulls DOUT low
+
+        :param timeout: timeout in milliseconds
+        :return: the channel or None on timeout
+        """
+        if not self.edge_detection:
+            raise RuntimeError("Edge detection is not available")
+        chip = self._dout_chips.get(channel)
+        if chip is None or edge != self.FALLING:
+            raise RuntimeError("Only falling edges on DOUT pins are simulated")
+        delay = chip.time_to_ready(self._clock())
+        if not delay:
+            # DOUT is low already or will not go low without a clock pulse
+            delay = None
+        if timeout is not None and (delay is None or delay > timeout / 1000.0):
+            time.sleep(timeout / 1000.0)
+            return None
+        if delay is None:
+            raise RuntimeError("DOUT will never go low")
+        time.sleep(delay)
+        return channel
+
+    def cleanup(self, channel=None):
+        self._levels.clear()
+
+
+def create_simulated_hx711(dout_pin=5, pd_sck_pin=6, gain=128, channel='A', wait_mode='poll',
+                           read_mode='normal', **kwargs):
+    """
+    create a HX711 instance connected to a simulated chip
+
+    :param wait_mode: how the HX711 instance waits for data
+    :type wait_mode: str
+    :param read_mode: how the HX711 instance reads data
+    :type read_mode: str
+    :param kwargs: passed on to SimulatedHX711
+    :return: the HX711 instance and the simulated chip
+    :rtype: tuple
+    """
+    chip = SimulatedHX711(dout_pin=dout_pin, pd_sck_pin=pd_sck_pin, **kwargs)
+    hx711 = HX711(
+        dout_pin=dout_pin,
+        pd_sck_pin=pd_sck_pin,
+        gain=gain,
+        channel=channel,
+        gpio=SimulatedGPIO(chip),
+        wait_mode=wait_mode,
+        read_mode=read_mode
+    )
+    # the timing checks of the driver tolerate what the simulated chip tolerates:
+    # PD_SCK high for less than power_down_time and no frame stalled for a conversion period
+    hx711._frame_timer.limit = min(chip.power_down_time, chip.period)
+    if not chip.power_downs:
+        # a pulse the constructor found too long for a real chip has not powered the simulated one down
+        hx711._unsettled = 0
+    return hx711, chip
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Aggregate raw HX711 values.
+
+NumPy is optional. If it is installed, samples are kept in int32 arrays and
+reduced vectorized, otherwise the same functions fall back to pure Python.
+All functions accept lists, arrays like the ones returned by HX711.latest
+and NumPy arrays.
+"""
+from array import array
+import statistics
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# scales the median absolute deviation to the standard deviation of normal distributed values
+MAD_TO_SIGMA = 1.4826
+
+_valid_outlier_methods = ['mad', 'sigma']
+
+
+def to_array(values):
+    """
+    convert raw values to an int32 NumPy array, or to an array('i') without NumPy
+
+    :param values: the raw values
+    :type values: iterable
+    :rtype: numpy.ndarray or array
+    """
+    if numpy is None:
+        if isinstance(values, array) and values.typecode == 'i':
+            return values
+        return array('i', values)
+    if isinstance(values, array) and values.typecode == 'i' and values.itemsize == 4:
+        # shares the memory of the array instead of copying element by element
+        return numpy.frombuffer(values, dtype=numpy.int32)
+    return numpy.asarray(values, dtype=numpy.int32)
+
+
+def _values(values):
+    if numpy is not None:
+        values = to_array(values) if isinstance(values, array) else numpy.asarray(values)
+        if not values.size:
+            raise ValueError("no values to aggregate")
+    elif not len(values):
+        raise ValueError("no values to aggregate")
+    return values
+
+
+def mean(values):
+    """
+    :param values: the raw values
+    :rtype: float
+    """
+    values = _values(values)
+    if numpy is None:
+        return sum(values) / len(values)
+    # the sum of many 24 bit values does not fit into int32
+    return float(values.mean(dtype=numpy.float64))
+
+
+def median(values):
+    """
+    :param values: the raw values
+    :rtype: float
+    """
+    values = _values(values)
+    if numpy is None:
+        return float(statistics.median(values))
+    return float(numpy.median(values))
+
+
+def trimmed_mean(values, proportion=0.1):
+    """
+    mean of the values without the lowest and highest ones
+
+    :param values: the raw values
+    :param proportion: fraction of the values to cut off at each end
+    :type proportion: float
+    :rtype: float
+    """
+    if not 0 <= proportion < 0.5:
+        raise ValueError("proportion has to be within [0, 0.5). I got: " + str(proportion))
+    values = _values(values)
+    count = len(values)
+    cut = int(proportion * count)
+    if numpy is None:
+        kept = sorted(values)[cut:count - cut]
+        return sum(kept) / len(kept)
+    if not cut:
+        return float(values.mean(dtype=numpy.float64))
+    kept = numpy.partition(values, (cut, count - cut - 1))[cut:count - cut]
+    return float(kept.mean(dtype=numpy.float64))
+
+
+def reject_outliers(values, threshold=3.5, method='mad'):
+    """
+    drop values too far off the center of the values
+
+    With method "mad" values deviating from the median by more than threshold
+    times the scaled median absolute deviation are dropped. With "sigma" values
+    deviating from the mean by more than threshold standard deviations are dropped.
+
+    :param values: the raw values
+    :param threshold: allowed deviation in (estimated) standard deviations
+    :type threshold: float
+    :param method: "mad" or "sigma"
+    :type method: str
+    :return: the remaining values, in their order
+    :rtype: numpy.ndarray or list
+    """
+    if method not in _valid_outlier_methods:
+        raise ValueError('method has to be "mad" or "sigma". I got: ' + str(method))
+    values = _values(values)
+    if numpy is None:
+        if method == 'mad':
+            center = statistics.median(values)
+            spread = MAD_TO_SIGMA * statistics.median([abs(value - center) for value in values])
+        else:
+            center = sum(values) / len(values)
+            spread = statistics.pstdev(values, center)
+        limit = threshold * spread
+        return [value for value in values if abs(value - center) <= limit]
+
+    values = numpy.asarray(values)
+    if method == 'mad':
+        center = numpy.median(values)
+        deviation = numpy.abs(values - center)
+        spread = MAD_TO_SIGMA * numpy.median(deviation)
+    else:
+        center = values.mean(dtype=numpy.float64)
+        deviation = numpy.abs(values - center)
+        spread = values.std(dtype=numpy.float64)
+    return values[deviation <= threshold * spread]
+
+
+def robust_mean(values, threshold=3.5, method='mad'):
+    """
+    mean of the values after rejecting outliers, see reject_outliers
+
+    :param values: the raw values
+    :rtype: float
+    """
+    return mean(reject_outliers(values, threshold=threshold, method=method))
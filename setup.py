@@ -47,8 +47,9 @@ setup(
         'Intended Audience :: Developers',
         'License :: OSI Approved :: MIT License',
         'Natural Language :: English',
-        'Programming Language :: Python :: 3.5',
+        'Programming Language :: Python :: 3.8',
     ],
+    python_requires='>=3.8',
     project_urls={
         'Bug Reports': 'https://github.com/mpibpc-mroose/hx711/issues',
     },
@@ -59,6 +60,11 @@ setup(
     include_package_data=True,
     license="MIT license",
     keywords='hx711',
+    entry_points={
+        'console_scripts': [
+            'hx711 = hx711.cli:main',
+        ],
+    },
     cmdclass={
         'develop': PostDevelopCommand,
         'install': PostInstallCommand,
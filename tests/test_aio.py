@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import asyncio
+from unittest import TestCase
+
+from hx711 import HX711, GenericHX711Exception, ParameterValidationError
+from hx711.aio import AsyncHX711
+from hx711.simulator import SimulatedGPIO, create_simulated_hx711
+
+
+class TestAsyncHX711(TestCase):
+    """Tests for the asyncio front end."""
+
+    def setUp(self):
+        hx711, self.chip = create_simulated_hx711(value=-1234, power_down_time=1)
+        self.sensor = AsyncHX711(hx711)
+        self.sensor.settle_time = 0.05
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def run_async(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def test_01_read(self):
+        self.assertEqual(-1234, self.run_async(self.sensor.read()))
+        self.assertEqual([-1234] * 3, self.run_async(self.sensor.get_raw_data(times=3)))
+
+    def test_02_stream(self):
+        async def collect():
+            return [value async for value in self.sensor.stream(count=3)]
+
+        self.assertEqual([-1234] * 3, self.run_async(collect()))
+
+    def test_03_reads_do_not_block_the_loop(self):
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(None)
+                await asyncio.sleep(0.001)
+
+        async def read_with_ticker():
+            task = asyncio.ensure_future(ticker())
+            data = await self.sensor.get_raw_data(times=3)
+            task.cancel()
+            return data
+
+        self.assertEqual([-1234] * 3, self.run_async(read_with_ticker()))
+        # three conversions take more than 25ms, the ticker must have run meanwhile
+        self.assertGreater(len(ticks), 5)
+
+    def test_04_set_channel(self):
+        self.run_async(self.sensor.set_channel('B'))
+        self.assertEqual('B', self.sensor.channel)
+        self.assertEqual(('B', 32), self.chip.setting)
+        self.run_async(self.sensor.set_channel('A'))
+        self.run_async(self.sensor.set_channel_a_gain(64))
+        self.assertEqual(('A', 64), self.chip.setting)
+        with self.assertRaises(ParameterValidationError):
+            self.run_async(self.sensor.set_channel('C'))
+
+    def test_05_stream_gives_up(self):
+        self.chip.value = 0x7fffff
+
+        async def collect():
+            return [value async for value in self.sensor.stream(count=3, max_failures=3)]
+
+        with self.assertRaises(GenericHX711Exception):
+            self.run_async(collect())
+
+    def test_06_metrics(self):
+        metrics = self.sensor.hx711.enable_metrics()
+        self.run_async(self.sensor.get_raw_data(times=3))
+        self.assertEqual(3, metrics.reads)
+        self.assertEqual(3, metrics.ready_wait.count)
+
+    def test_07_no_setting_changes_while_streaming(self):
+        hx711 = self.sensor.hx711
+        hx711.start_stream(buffer_size=16)
+        try:
+            with self.assertRaises(GenericHX711Exception):
+                self.run_async(self.sensor.set_channel('B'))
+            with self.assertRaises(GenericHX711Exception):
+                self.run_async(self.sensor.set_channel_a_gain(64))
+            self.assertEqual(('A', 128, 1), (hx711.channel, hx711.channel_a_gain, hx711._gain_pulses))
+        finally:
+            self.assertTrue(hx711.stop_stream(timeout=1))
+
+    def test_08_gives_up(self):
+        self.chip.value = 0x7fffff
+        with self.assertRaises(GenericHX711Exception):
+            self.run_async(self.sensor.get_raw_data(times=3, max_failures=3))
+
+        gpio = SimulatedGPIO()
+        # nothing pulls DOUT low
+        gpio.setup(5, SimulatedGPIO.IN, pull_up_down=SimulatedGPIO.PUD_UP)
+        sensor = AsyncHX711(HX711(dout_pin=5, pd_sck_pin=6, gpio=gpio))
+        with self.assertRaises(GenericHX711Exception):
+            self.run_async(sensor.set_channel('B'))
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+
+from hx711.benchmark import (
+    benchmark_get_raw_data,
+    compare_read_modes,
+    compare_realtime,
+    summarize
+)
+from hx711.realtime import RealtimeMode
+from hx711.simulator import create_simulated_hx711
+
+
+class TestBenchmark(TestCase):
+    """Tests for the benchmark suite."""
+
+    def test_01_summarize(self):
+        summary = summarize([3, 1, 2, 4])
+        self.assertEqual(4, summary["count"])
+        self.assertEqual(1, summary["min"])
+        self.assertEqual(4, summary["max"])
+        self.assertEqual(2.5, summary["mean"])
+        self.assertEqual({"count": 0}, summarize([]))
+
+    def test_02_get_raw_data_throughput(self):
+        hx711, chip = create_simulated_hx711(rate=80, value=1000)
+        report = benchmark_get_raw_data(hx711, times=10, rounds=2, chip=chip)
+        self.assertEqual(20, report["samples"])
+        # a conversion takes 12.5ms, so not more than 80 samples per second are possible
+        self.assertLess(report["samples_per_second"], 100)
+        self.assertGreater(report["samples_per_second"], 20)
+        self.assertGreaterEqual(report["sck_high_time"]["count"], 20 * 25)
+        self.assertLess(report["sck_high_time"]["median"], 0.00006)
+
+    def test_03_compare_read_modes(self):
+        # a tolerant chip, so no reading is rejected and clocked again
+        reports = compare_read_modes(times=5, rounds=1, rate=80, value=1000, power_down_time=1)
+        self.assertEqual({"normal", "fast"}, set(reports))
+        for read_mode, report in reports.items():
+            with self.subTest(read_mode):
+                self.assertEqual(5, report["samples"])
+                self.assertEqual(5, report["frame_time"]["count"])
+
+    def test_04_compare_realtime(self):
+        realtime = RealtimeMode(cpu=0, priority=None, lock_memory=False)
+        reports = compare_realtime(realtime, frames=10, rate=80, value=1000)
+        self.assertIsNone(reports["default"]["realtime"])
+        self.assertEqual({"cpu": True, "suspend_gc": True}, reports["realtime"]["realtime"])
+        for report in reports.values():
+            self.assertEqual(10, report["frames"])
+            self.assertLessEqual(report["rejected"], 10)
+            self.assertEqual(report["rejected"] / 10, report["rejection_rate"])
+            self.assertIn("violations", report)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+from unittest import TestCase
+
+from hx711 import ParameterValidationError
+from hx711.calibration import Calibration, Scale
+from hx711.simulator import create_simulated_hx711
+
+
+class TestCalibration(TestCase):
+    """Tests for the persisted calibration."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "calibration.json")
+
+    def test_01_transform(self):
+        calibration = Calibration()
+        self.assertEqual((1.0, 0.0), calibration.transform('A', 128))
+        calibration.set('A', 128, offset=1000, scale=20)
+        self.assertEqual((0.05, -50.0), calibration.transform('A', 128))
+        # channel B has a fixed gain
+        calibration.set('B', 128, offset=10)
+        self.assertEqual((10, 1), calibration.get('B', 32))
+        with self.assertRaises(ParameterValidationError):
+            calibration.set('A', 64, scale=0)
+
+    def test_02_persistence(self):
+        calibration = Calibration(self.path)
+        calibration.set('A', 64, offset=-300, scale=2.5)
+        calibration.save()
+        self.assertEqual((-300, 2.5), Calibration(self.path).get('A', 64))
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+
+class TestScale(TestCase):
+    """Tests for weighing with a simulated HX711."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "calibration.json")
+        self.hx711, self.chip = create_simulated_hx711(value=1000, power_down_time=1)
+
+    def test_01_tare_and_calibrate(self):
+        scale = Scale(self.hx711, self.path)
+        self.assertEqual(1000, scale.tare(times=5))
+        self.chip.value = 3000
+        self.assertEqual(20, scale.calibrate(100, times=5))
+        self.assertAlmostEqual(100, scale.get_weight(times=5))
+        self.assertEqual([0.0, 50.0], list(scale.convert([1000, 2000])))
+        self.assertEqual(25.0, scale.convert(1500))
+        # a restart needs no new tare
+        restarted = Scale(self.hx711, self.path)
+        self.assertAlmostEqual(100, restarted.get_weight(times=5))
+        with self.assertRaises(ParameterValidationError):
+            scale.calibrate(0)
+
+    def test_02_zero_tracking(self):
+        calibration = Calibration()
+        calibration.set('A', 128, offset=1000, scale=10)
+        scale = Scale(self.hx711, calibration, zero_band=1, zero_tracking_rate=0.5)
+        # drift within the band moves the zero point
+        self.assertEqual(0.5, scale.track_zero(1005))
+        self.assertEqual((1002.5, 10), calibration.get('A', 128))
+        self.assertEqual(0.25, scale.track_zero(1005))
+        # a load does not
+        self.assertEqual(50, scale.track_zero(1503.75))
+        self.assertEqual((1003.75, 10), calibration.get('A', 128))
@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import errno
+import os
+import tempfile
+import threading
+from unittest import TestCase
+
+from hx711 import HX711
+from hx711.chardev import (
+    GPIO_V2_GET_LINE_IOCTL,
+    GPIO_V2_LINE_ATTR_ID_FLAGS,
+    GPIO_V2_LINE_ATTR_ID_OUTPUT_VALUES,
+    GPIO_V2_LINE_EVENT_FALLING_EDGE,
+    GPIO_V2_LINE_FLAG_BIAS_PULL_UP,
+    GPIO_V2_LINE_FLAG_EDGE_FALLING,
+    GPIO_V2_LINE_FLAG_INPUT,
+    GPIO_V2_LINE_FLAG_OUTPUT,
+    GPIO_V2_LINE_GET_VALUES_IOCTL,
+    GPIO_V2_LINE_SET_VALUES_IOCTL,
+    LINE_EVENT,
+    LINE_REQUEST,
+    LINE_VALUES,
+    GpioChip
+)
+from hx711.multi import MultiHX711
+from hx711.simulator import SimulatedGPIO, SimulatedHX711
+
+
+class FakeGpioChip(object):
+    """
+    stand-in for the kernel answering the ioctl calls of GpioChip, with simulated HX711 on the lines
+    """
+
+    def __init__(self, *chips, edge_detection=True):
+        self.gpio = SimulatedGPIO(*chips)
+        self.edge_detection = edge_detection
+        self.requests = []
+        self.offsets = []
+        self.event_fd = None
+        self.get_values_calls = 0
+
+    def ioctl(self, fd, request, buffer, mutate=False):
+        if request == GPIO_V2_GET_LINE_IOCTL:
+            fields = LINE_REQUEST.unpack(buffer)
+            if not self.edge_detection and fields[65] & GPIO_V2_LINE_FLAG_EDGE_FALLING:
+                raise OSError(errno.ENXIO, "no interrupt")
+            self.requests.append(fields)
+            self.offsets = list(fields[:fields[112]])
+            request_fd, self.event_fd = os.pipe()
+            buffer[LINE_REQUEST.size - 4:] = request_fd.to_bytes(4, 'little')
+        elif request == GPIO_V2_LINE_SET_VALUES_IOCTL:
+            bits, mask = LINE_VALUES.unpack(buffer)
+            for index, offset in enumerate(self.offsets):
+                if mask >> index & 1:
+                    self.gpio.output(offset, bits >> index & 1)
+        elif request == GPIO_V2_LINE_GET_VALUES_IOCTL:
+            self.get_values_calls += 1
+            _, mask = LINE_VALUES.unpack(buffer)
+            bits = 0
+            for index, offset in enumerate(self.offsets):
+                if mask >> index & 1:
+                    bits |= self.gpio.input(offset) << index
+            LINE_VALUES.pack_into(buffer, 0, bits, mask)
+        return 0
+
+    def falling_edge(self, offset):
+        os.write(self.event_fd, LINE_EVENT.pack(0, GPIO_V2_LINE_EVENT_FALLING_EDGE, offset, 1, 1, *[0] * 6))
+
+
+class TestGpioChip(TestCase):
+    """Tests for the GPIO character device backend."""
+
+    def create(self, *chips, edge_detection=True):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "gpiochip0")
+        open(path, "w").close()
+        fake = FakeGpioChip(*chips, edge_detection=edge_detection)
+        gpio = GpioChip(path, ioctl=fake.ioctl)
+        self.addCleanup(gpio.close)
+        return fake, gpio
+
+    def test_01_line_request(self):
+        fake, gpio = self.create()
+        gpio.setup(6, GpioChip.OUT, initial=GpioChip.HIGH)
+        gpio.setup(5, GpioChip.IN, pull_up_down=GpioChip.PUD_UP)
+        self.assertEqual([], fake.requests)
+        gpio.input(5)
+        self.assertEqual(1, len(fake.requests))
+        fields = fake.requests[0]
+        self.assertEqual([6, 5], fake.offsets)
+        self.assertEqual(b"hx711", fields[64].rstrip(b"\0"))
+        self.assertEqual(GPIO_V2_LINE_FLAG_INPUT | GPIO_V2_LINE_FLAG_EDGE_FALLING, fields[65])
+        self.assertEqual(3, fields[66])
+        attributes = [fields[72 + 4 * i:76 + 4 * i] for i in range(3)]
+        self.assertEqual((
+            GPIO_V2_LINE_ATTR_ID_FLAGS, 0,
+            GPIO_V2_LINE_FLAG_INPUT | GPIO_V2_LINE_FLAG_BIAS_PULL_UP | GPIO_V2_LINE_FLAG_EDGE_FALLING, 0b10
+        ), attributes[0])
+        self.assertEqual((GPIO_V2_LINE_ATTR_ID_FLAGS, 0, GPIO_V2_LINE_FLAG_OUTPUT, 0b01), attributes[1])
+        # output value high on line 6
+        self.assertEqual(0b01, attributes[2][2])
+
+    def test_02_hx711(self):
+        chip = SimulatedHX711(dout_pin=5, pd_sck_pin=6, value=1234, power_down_time=1)
+        _, gpio = self.create(chip)
+        hx711 = HX711(dout_pin=5, pd_sck_pin=6, gpio=gpio)
+        self.assertEqual([1234] * 3, hx711.get_raw_data(times=3))
+
+    def test_03_multi_hx711(self):
+        chips = [SimulatedHX711(dout_pin=pin, pd_sck_pin=6, value=pin * 100, power_down_time=1) for pin in (5, 13)]
+        fake, gpio = self.create(*chips)
+        multi = MultiHX711(dout_pins=[5, 13], pd_sck_pin=6, gpio=gpio)
+        frame = False
+        while frame is False:
+            fake.get_values_calls = 0
+            frame = multi.read()
+        self.assertEqual([500, 1300], frame)
+        # one ioctl per bit for both chips, not one per chip
+        self.assertLess(fake.get_values_calls, 24 + 10)
+
+    def test_04_wait_for_edge(self):
+        fake, gpio = self.create()
+        gpio.setup(5, GpioChip.IN)
+        fake.gpio.setup(5, SimulatedGPIO.IN, pull_up_down=SimulatedGPIO.PUD_UP)
+        self.assertIsNone(gpio.wait_for_edge(5, GpioChip.FALLING, timeout=10))
+        # stale edges are discarded
+        fake.falling_edge(5)
+        self.assertIsNone(gpio.wait_for_edge(5, GpioChip.FALLING, timeout=10))
+        timer = threading.Timer(0.02, fake.falling_edge, args=(5,))
+        timer.start()
+        self.assertEqual(5, gpio.wait_for_edge(5, GpioChip.FALLING, timeout=5000))
+        timer.join()
+
+    def test_05_no_edge_detection(self):
+        fake, gpio = self.create(edge_detection=False)
+        gpio.setup(5, GpioChip.IN)
+        with self.assertLogs(level='WARNING'):
+            self.assertEqual(0, gpio.input(5))
+        self.assertFalse(gpio.edge_detection)
+        self.assertEqual(1, len(fake.requests))
+        self.assertEqual(GPIO_V2_LINE_FLAG_INPUT, fake.requests[0][65])
+        with self.assertRaises(RuntimeError):
+            gpio.wait_for_edge(5, GpioChip.FALLING, timeout=10)
+
+    def test_06_setup_keeps_outputs(self):
+        fake, gpio = self.create()
+        gpio.setup(6, GpioChip.OUT)
+        gpio.output(6, GpioChip.LOW)
+        gpio.output(6, GpioChip.HIGH)
+        # the same setup again does not release the lines
+        gpio.setup(6, GpioChip.OUT)
+        gpio.output(6, GpioChip.HIGH)
+        self.assertEqual(1, len(fake.requests))
+        # a new line requests all lines again with the current output values
+        gpio.setup(5, GpioChip.IN)
+        gpio.input(5)
+        self.assertEqual(2, len(fake.requests))
+        fields = fake.requests[1]
+        self.assertEqual([6, 5], fake.offsets)
+        attributes = [fields[72 + 4 * i:76 + 4 * i] for i in range(fields[66])]
+        self.assertIn((GPIO_V2_LINE_ATTR_ID_OUTPUT_VALUES, 0, 0b01, 0b01), attributes)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import contextlib
+import io
+import json
+import os
+import struct
+import tempfile
+from unittest import TestCase
+
+from hx711.cli import BINARY_HEADER, BINARY_MAGIC, main
+
+
+class TestCommandLine(TestCase):
+    """Tests for the hx711 command with the simulated backend."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "samples")
+
+    def run_command(self, *argv):
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            status = main(list(argv))
+        return status, stdout.getvalue(), stderr.getvalue()
+
+    def test_01_stream_csv(self):
+        status, _, stderr = self.run_command(
+            'stream', '--backend', 'simulated', '--dout', '5', '--dout', '13', '--sck', '6',
+            '--format', 'csv', '--count', '3', '--output', self.path
+        )
+        self.assertEqual(0, status)
+        self.assertIn("3 frames written", stderr)
+        with open(self.path) as f:
+            lines = f.read().splitlines()
+        self.assertEqual("timestamp_ns,dout_5,dout_13", lines[0])
+        self.assertEqual(4, len(lines))
+        timestamps = [int(line.split(',')[0]) for line in lines[1:]]
+        self.assertEqual(sorted(timestamps), timestamps)
+        # the simulated chips convert 1000 times their pin with some noise
+        for line in lines[1:]:
+            _, first, second = line.split(',')
+            self.assertLess(abs(int(first) - 5000), 1000)
+            self.assertLess(abs(int(second) - 13000), 1000)
+
+    def test_02_stream_binary(self):
+        status, _, _ = self.run_command(
+            'stream', '--backend', 'simulated', '--dout', '5', '--sck', '6',
+            '--format', 'binary', '--count', '4', '--output', self.path
+        )
+        self.assertEqual(0, status)
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        self.assertEqual((BINARY_MAGIC, 1), BINARY_HEADER.unpack_from(data))
+        frames = list(struct.iter_unpack('<qi', data[BINARY_HEADER.size:]))
+        self.assertEqual(4, len(frames))
+        self.assertTrue(all(abs(value - 5000) < 1000 for _, value in frames))
+
+    def test_03_bench(self):
+        status, stdout, _ = self.run_command(
+            'bench', '--backend', 'simulated', '--dout', '5', '--sck', '6', '--frames', '20', '--json'
+        )
+        self.assertEqual(0, status)
+        report = json.loads(stdout)
+        self.assertEqual(20, report["frames"])
+        self.assertEqual(report["frames"], report["valid"] + report["timing_violations"] + report["invalid_frames"]
+                         + report["unsettled_readings"] + report["ready_timeouts"])
+        self.assertGreater(report["samples_per_second"], 0)
+        self.assertIn("power_downs", report)
+
+    def test_04_errors(self):
+        with contextlib.redirect_stderr(io.StringIO()):
+            with self.assertRaises(SystemExit):
+                main(['stream', '--sck', '6'])
+        status, _, stderr = self.run_command(
+            'bench', '--backend', 'chardev', '--chip', self.path, '--dout', '5', '--sck', '6'
+        )
+        self.assertEqual(1, status)
+        self.assertIn("hx711: error:", stderr)
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from array import array
+from unittest import TestCase, skipIf
+from unittest.mock import patch
+
+from hx711 import _decode, stats
+from hx711.decode import decode
+
+# zero, the lowest and highest valid values, the saturation values and some in between
+WORDS = [0, 1, 0x7ffffe, 0x7fffff, 0x800000, 0x800001, 0xffffff, 0x123456, 0xabcdef]
+
+
+class DecodeTests(object):
+    """Tests run with and without NumPy."""
+
+    def assertMatchesRead(self, words, result):
+        values, valid = result
+        self.assertEqual(len(words), len(values))
+        for word, value, ok in zip(words, values, valid):
+            expected = _decode(word)
+            self.assertEqual(expected is not False, bool(ok), hex(word))
+            if ok:
+                self.assertEqual(expected, value, hex(word))
+
+    def test_01_words(self):
+        self.assertMatchesRead(WORDS, decode(WORDS))
+        self.assertMatchesRead(WORDS, decode(array('I', WORDS)))
+        values, valid = decode(WORDS)
+        self.assertEqual([0, 1, 8388606, 8388607, -8388608, -8388607, -1, 1193046, -5517841], list(values))
+        self.assertEqual([1, 1, 1, 0, 0, 1, 1, 1, 1], [int(ok) for ok in valid])
+
+    def test_02_packed(self):
+        packed = b''.join(word.to_bytes(3, 'big') for word in WORDS)
+        self.assertMatchesRead(WORDS, decode(packed))
+        self.assertMatchesRead(WORDS, decode(bytearray(packed)))
+        with self.assertRaises(ValueError):
+            decode(packed[:-1])
+
+    def test_03_empty(self):
+        values, valid = decode(array('I'))
+        self.assertEqual(0, len(values))
+        self.assertEqual(0, len(valid))
+
+
+class TestDecodePurePython(DecodeTests, TestCase):
+    """Tests for the fallback without NumPy."""
+
+    def setUp(self):
+        patcher = patch.object(stats, 'numpy', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+@skipIf(stats.numpy is None, "NumPy is not installed")
+class TestDecodeNumPy(DecodeTests, TestCase):
+    """Tests for the vectorized decoding."""
+
+    def test_04_types(self):
+        values, valid = decode(array('I', WORDS))
+        self.assertEqual(stats.numpy.int32, values.dtype)
+        self.assertEqual(stats.numpy.bool_, valid.dtype)
+
+    def test_05_no_copy(self):
+        words = stats.numpy.array(WORDS, dtype=stats.numpy.uint32)
+        buffer = array('I', WORDS)
+        self.assertMatchesRead(WORDS, decode(words))
+        # the words are read through views of the buffer
+        with patch.object(stats.numpy, 'asarray', side_effect=AssertionError("copied")):
+            self.assertMatchesRead(WORDS, decode(buffer))
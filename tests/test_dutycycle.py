@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+
+from hx711.dutycycle import DutyCycleScheduler
+from hx711.simulator import create_simulated_hx711
+
+
+class TestDutyCycleScheduler(TestCase):
+    """Tests for sampling with power downs in between."""
+
+    def create(self, channel='A'):
+        hx711, chip = create_simulated_hx711(
+            channel=channel, rate=80, value=lambda channel, gain, at: 1000 if channel == 'A' else -500,
+            power_down_time=0.005
+        )
+        return hx711, chip
+
+    def test_01_conversions_to_discard(self):
+        hx711, _ = self.create()
+        self.assertEqual(3, hx711.conversions_to_discard())
+        hx711.channel_a_gain = 64
+        self.assertEqual(4, hx711.conversions_to_discard())
+        hx711.channel = 'B'
+        self.assertEqual(4, hx711.conversions_to_discard())
+
+    def test_02_settled_samples(self):
+        for channel, value in (('A', 1000), ('B', -500)):
+            with self.subTest(channel=channel):
+                hx711, chip = self.create(channel=channel)
+                scheduler = DutyCycleScheduler(hx711, interval=0.2, rate=80)
+                samples = list(scheduler.iter_samples(count=4))
+                # the conversions while the output settles after power up are scaled down by the simulation
+                self.assertEqual([value] * 4, [sample for _, sample in samples])
+                self.assertEqual(3, chip.power_downs)
+                stats = scheduler.stats()
+                self.assertEqual(3 * hx711.conversions_to_discard(), stats["discarded"])
+                intervals = [(b - a) / 1e9 for (a, _), (b, _) in zip(samples, samples[1:])]
+                self.assertTrue(all(0.15 < interval < 0.3 for interval in intervals), intervals)
+                self.assertLess(stats["awake_time_per_sample"], 0.15)
+                self.assertLess(stats["duty_cycle"], 0.75)
+                # discarded conversions plus the settled one
+                self.assertGreater(stats["mean_wake_latency"], hx711.conversions_to_discard() * 0.0125)
+
+    def test_03_short_interval(self):
+        hx711, chip = self.create()
+        scheduler = DutyCycleScheduler(hx711, interval=0.02, rate=80)
+        self.assertEqual([1000] * 5, [value for _, value in scheduler.iter_samples(count=5)])
+        # no time to power down
+        self.assertEqual(0, chip.power_downs)
+        self.assertEqual(0, scheduler.stats()["discarded"])
+
+    def test_04_timing_violation_while_settling(self):
+        hx711, chip = self.create()
+        scheduler = DutyCycleScheduler(hx711, interval=0.2, rate=80)
+        # PD_SCK stays high until the HX711 powers down
+        hx711._gpio.stall(pulse=0, duration=0.006, skip=1)
+        scheduler._wake()
+        self.assertEqual(1, chip.power_downs)
+        # the count of conversions to discard starts over after the violation
+        self.assertEqual(2 + hx711.conversions_to_discard(), scheduler.discarded)
+        self.assertEqual(1000, scheduler._read())
+
+    def test_05_validation(self):
+        hx711, _ = self.create()
+        with self.assertRaises(ValueError):
+            DutyCycleScheduler(hx711, interval=0)
+        with self.assertRaises(ValueError):
+            DutyCycleScheduler(hx711, interval=1, rate=20)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import statistics
+from unittest import TestCase
+
+from hx711.events import EventDetector
+from hx711.simulator import create_simulated_hx711
+
+
+class TestEventDetector(TestCase):
+    """Tests for the incremental event detection."""
+
+    def feed(self, detector, values):
+        events = []
+        for timestamp, value in enumerate(values):
+            events.extend(detector.update(value, timestamp=timestamp))
+        return events
+
+    def test_01_running_statistics(self):
+        detector = EventDetector(window=4)
+        values = [8388000, 8388100, 8387900, 8388050, 8388020, 8387990]
+        self.feed(detector, values)
+        self.assertAlmostEqual(statistics.mean(values[-4:]), detector.mean)
+        self.assertAlmostEqual(statistics.pstdev(values[-4:]), detector.deviation)
+
+    def test_02_stable_and_load_changed(self):
+        detector = EventDetector(window=4, stable_deviation=10, step=100)
+        received = []
+        detector.on('load_changed', received.append)
+        noise = [0, 5, -5, 3]
+        events = self.feed(detector, [1000 + n for n in noise * 2] + [3000 + n for n in noise * 2])
+        self.assertEqual(['stable', 'load_changed', 'stable'], [event.name for event in events])
+        self.assertEqual(3, events[0].timestamp)
+        self.assertAlmostEqual(1000.75, events[0].value)
+        self.assertEqual(8, events[1].timestamp)
+        self.assertAlmostEqual(1999.25, events[1].details["change"])
+        # a whole window of the new load
+        self.assertEqual(11, events[2].timestamp)
+        self.assertAlmostEqual(3000.75, events[2].value)
+        self.assertEqual([events[1]], received)
+        self.assertEqual(events, [detector.events.get_nowait() for _ in range(3)])
+        self.assertTrue(detector.events.empty())
+
+    def test_03_unstable(self):
+        detector = EventDetector(window=3, stable_deviation=10)
+        # 15 is noise, 60 makes the readings unstable
+        events = self.feed(detector, [0, 0, 0, 15, 0, 0, 60, 0, 0, 0, 0])
+        self.assertEqual([2, 9], [event.timestamp for event in events])
+        self.assertFalse(detector.update(0))
+
+    def test_04_thresholds(self):
+        detector = EventDetector(thresholds=[100, 200], hysteresis=10)
+        events = self.feed(detector, [150, 105, 95, 89, 95, 105, 109, 110, 250, 185])
+        self.assertEqual([
+            (3, 100, "falling"), (7, 100, "rising"), (8, 200, "rising"), (9, 200, "falling")
+        ], [(event.timestamp, event.details["threshold"], event.details["direction"]) for event in events])
+
+    def test_05_validation(self):
+        with self.assertRaises(ValueError):
+            EventDetector(window=1)
+        with self.assertRaises(ValueError):
+            EventDetector(step=100)
+        with self.assertRaises(ValueError):
+            EventDetector().on('changed', print)
+
+    def test_06_hx711(self):
+        hx711, chip = create_simulated_hx711(value=1000, power_down_time=1)
+        detector = EventDetector(window=3, stable_deviation=1, step=500)
+        detector.start(hx711)
+        self.addCleanup(detector.stop)
+        event = detector.events.get(timeout=5)
+        self.assertEqual(('stable', 1000), (event.name, event.value))
+        chip.value = 5000
+        names = [detector.events.get(timeout=5).name for _ in range(2)]
+        self.assertEqual(['load_changed', 'stable'], names)
+        self.assertTrue(detector.stop(timeout=5))
+        self.assertIsNone(hx711._stream_thread)
+
+    def test_07_stop_without_samples(self):
+        # every reading is rejected, the stream runs without samples
+        hx711, chip = create_simulated_hx711(value=0x7fffff, power_down_time=1)
+        hx711.start_stream(buffer_size=16)
+        self.addCleanup(hx711.stop_stream, 1)
+        detector = EventDetector()
+        detector.start(hx711)
+        self.assertTrue(detector.stop())
+        # the stream was running before, so it keeps running
+        self.assertTrue(hx711.streaming)
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from array import array
+from unittest import TestCase
+
+from hx711.filters import Kalman, LowPass, MovingAverage, Pipeline, SlidingMedian
+
+
+class TestFilters(TestCase):
+    """Tests for the streaming filters."""
+
+    def test_01_moving_average(self):
+        moving_average = MovingAverage(3)
+        self.assertEqual(array('d', [1, 1.5, 2, 3, 4]), moving_average.apply([1, 2, 3, 4, 5]))
+        moving_average.reset()
+        self.assertEqual(10, moving_average.update(10))
+        with self.assertRaises(ValueError):
+            MovingAverage(0)
+
+    def test_02_sliding_median(self):
+        sliding_median = SlidingMedian(3)
+        self.assertEqual(
+            array('d', [5, 5, 5, 5, 6, 6]),
+            sliding_median.apply([5, 5, 1000, 5, 6, 7])
+        )
+        self.assertEqual([5, 7.5, 10], list(SlidingMedian(4).stream([5, 10, 15])))
+
+    def test_03_sliding_median_matches_sorting(self):
+        values = [(value * 7919) % 101 for value in range(300)]
+        sliding_median = SlidingMedian(9)
+        for index, value in enumerate(values):
+            window = sorted(values[max(0, index - 8):index + 1])
+            if len(window) % 2:
+                expected = window[len(window) // 2]
+            else:
+                expected = (window[len(window) // 2 - 1] + window[len(window) // 2]) / 2
+            self.assertEqual(expected, sliding_median.update(value))
+
+    def test_04_low_pass(self):
+        low_pass = LowPass(0.5)
+        self.assertEqual(array('d', [0, 5, 7.5]), low_pass.apply([0, 10, 10]))
+        with self.assertRaises(ValueError):
+            LowPass(0)
+
+    def test_05_kalman(self):
+        kalman = Kalman(process_variance=0, measurement_variance=1)
+        # without process noise the estimate is the mean of all samples
+        self.assertEqual(array('d', [2, 3, 4]), kalman.apply([2, 4, 6]))
+
+    def test_06_pipeline(self):
+        pipeline = Pipeline(SlidingMedian(3), MovingAverage(2))
+        self.assertEqual(array('d', [1, 1, 1, 1.5]), pipeline.apply([1, 1, 50, 2]))
+        pipeline.reset()
+        self.assertEqual(7, pipeline.update(7))
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+import struct
+import tempfile
+from unittest import TestCase
+
+from hx711 import HX711
+from hx711.gpiomem import BLOCK_SIZE, GPCLR0, GPFSEL0, GPLEV0, GPSET0, GpioMem
+
+
+class TestGpioMem(TestCase):
+    """Tests for the register backend against a fake register file."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "gpiomem")
+        with open(self.path, "wb") as f:
+            f.write(bytes(BLOCK_SIZE))
+        self.gpio = GpioMem(self.path)
+        self.addCleanup(self.gpio.close)
+
+    def register(self, offset):
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return struct.unpack("I", f.read(4))[0]
+
+    def set_register(self, offset, value):
+        with open(self.path, "r+b") as f:
+            f.seek(offset)
+            f.write(struct.pack("I", value))
+
+    def test_01_setup(self):
+        self.set_register(GPFSEL0 + 4 * 2, 0xffffffff)
+        self.gpio.setmode(GpioMem.BCM)
+        self.gpio.setup(6, GpioMem.OUT)
+        self.gpio.setup(27, GpioMem.IN)
+        self.assertEqual(0b001 << 18, self.register(GPFSEL0))
+        # GPIO 27 is in GPFSEL2, bits 21 to 23
+        self.assertEqual(0xffffffff & ~(0b111 << 21), self.register(GPFSEL0 + 4 * 2))
+        self.gpio.cleanup()
+        self.assertEqual(0, self.register(GPFSEL0))
+        with self.assertRaises(ValueError):
+            self.gpio.setmode(GpioMem.BOARD)
+
+    def test_02_output_and_input(self):
+        self.gpio.output(6, True)
+        self.assertEqual(1 << 6, self.register(GPSET0))
+        self.gpio.output(40, False)
+        self.assertEqual(1 << 8, self.register(GPCLR0 + 4))
+        self.set_register(GPLEV0, 1 << 5)
+        self.assertEqual(1, self.gpio.input(5))
+        self.assertEqual(0, self.gpio.input(4))
+
+    def test_03_hx711(self):
+        self.set_register(GPLEV0, 0)
+        hx711 = HX711(dout_pin=5, pd_sck_pin=6, gpio=self.gpio)
+        # DOUT stays low, so every bit reads 0
+        self.assertEqual(0, hx711._read())
+        self.assertEqual(0b001 << 18, self.register(GPFSEL0))
+        self.assertEqual(1 << 6, self.register(GPSET0))
+        self.assertEqual(1 << 6, self.register(GPCLR0))
+        with self.assertRaises(RuntimeError):
+            self.gpio.wait_for_edge(5, GpioMem.FALLING)
@@ -1,6 +1,8 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 import random
+import subprocess
+import sys
 from unittest import TestCase
 from unittest.mock import (
     MagicMock,
@@ -184,3 +186,45 @@ class TestHx711(TestCase):
                     hx711._validate_measure_count(count)
                 except Exception as exception:
                     self.fail("{exception} was raised".format(exception=exception))
+
+    def test_08_wait_mode_validation(self):
+        hx711 = HX711(
+            dout_pin=5,
+            pd_sck_pin=6
+        )
+        self.assertEqual("poll", hx711.wait_mode)
+        with self.assertRaises(ParameterValidationError):
+            hx711.wait_mode = "interrupt"
+        hx711.wait_mode = "edge"
+        self.assertEqual("edge", hx711.wait_mode)
+
+    def test_09_read_mode_validation(self):
+        hx711 = HX711(
+            dout_pin=5,
+            pd_sck_pin=6
+        )
+        self.assertEqual("normal", hx711.read_mode)
+        with self.assertRaises(ParameterValidationError):
+            hx711.read_mode = "turbo"
+        hx711.read_mode = "fast"
+        self.assertEqual("fast", hx711.read_mode)
+
+    def test_10_gain_pulses_follow_the_setting(self):
+        hx711 = HX711(
+            dout_pin=5,
+            pd_sck_pin=6,
+            channel="A",
+            gain=128
+        )
+        self.assertEqual(1, hx711._gain_pulses)
+        hx711.channel_a_gain = 64
+        self.assertEqual(3, hx711._gain_pulses)
+        hx711.channel = "B"
+        self.assertEqual(2, hx711._gain_pulses)
+
+    def test_11_import_is_light(self):
+        modules = subprocess.check_output([
+            sys.executable, "-c",
+            "import sys, hx711; print(' '.join(m for m in ('numpy', 'http.server') if m in sys.modules))"
+        ], universal_newlines=True)
+        self.assertEqual("", modules.strip())
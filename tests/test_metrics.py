@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import urllib.request
+from unittest import TestCase
+
+from hx711.metrics import Histogram, Metrics
+from hx711.simulator import create_simulated_hx711
+
+
+class TestMetrics(TestCase):
+    """Tests for counters, histograms and their export."""
+
+    def test_01_histogram(self):
+        histogram = Histogram((1, 2))
+        for value in (0.5, 1, 1.5, 3):
+            histogram.observe(value)
+        self.assertEqual(
+            {"count": 4, "sum": 6.0, "buckets": {1: 2, 2: 1, float("inf"): 1}},
+            histogram.snapshot()
+        )
+
+    def test_02_prometheus(self):
+        metrics = Metrics(labels={"sensor": 'left "1"'})
+        metrics.reads = 3
+        metrics.clock_out.observe(0.00007)
+        text = metrics.to_prometheus()
+        self.assertIn('hx711_reads_total{sensor="left \\"1\\""} 3\n', text)
+        self.assertIn('# TYPE hx711_clock_out_seconds histogram\n', text)
+        self.assertIn('hx711_clock_out_seconds_bucket{sensor="left \\"1\\"",le="5e-05"} 0\n', text)
+        self.assertIn('hx711_clock_out_seconds_bucket{sensor="left \\"1\\"",le="0.0001"} 1\n', text)
+        self.assertIn('hx711_clock_out_seconds_bucket{sensor="left \\"1\\"",le="+Inf"} 1\n', text)
+        self.assertIn('hx711_clock_out_seconds_count{sensor="left \\"1\\""} 1\n', text)
+
+    def test_03_textfile_and_http(self):
+        metrics = Metrics()
+        metrics.retries = 2
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "hx711.prom")
+            metrics.write_textfile(path)
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(metrics.to_prometheus(), f.read())
+
+        server = metrics.serve(0)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = "http://127.0.0.1:{port}/metrics".format(port=server.server_address[1])
+        with urllib.request.urlopen(url, timeout=5) as response:
+            self.assertIn("hx711_retries_total 2\n", response.read().decode('utf-8'))
+
+
+class TestHX711Metrics(TestCase):
+    """Tests for the metrics of readings of a simulated HX711."""
+
+    def test_01_readings(self):
+        hx711, chip = create_simulated_hx711(value=1000, power_down_time=1)
+        metrics = hx711.enable_metrics()
+        self.assertEqual({"dout": 5}, metrics.labels)
+        hx711.get_raw_data(times=3)
+        snapshot = metrics.snapshot()
+        self.assertGreaterEqual(snapshot["reads"], 3)
+        self.assertEqual(snapshot["reads"], snapshot["clock_out"]["count"])
+        self.assertEqual(snapshot["reads"], snapshot["ready_wait"]["count"])
+        self.assertEqual(0, snapshot["ready_timeouts"])
+
+    def test_02_invalid_frames(self):
+        for read_mode in ('normal', 'fast'):
+            with self.subTest(read_mode):
+                hx711, chip = create_simulated_hx711(value=0x7fffff, power_down_time=1, read_mode=read_mode)
+                metrics = hx711.enable_metrics()
+                self.assertIs(False, hx711._read())
+                self.assertEqual(1, metrics.invalid_frames + metrics.timing_violations)
+                hx711.disable_metrics()
+                self.assertIsNone(hx711.metrics)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+
+from hx711 import ParameterValidationError
+from hx711.multi import MultiHX711
+from hx711.simulator import (
+    SimulatedGPIO,
+    SimulatedHX711
+)
+
+
+class TestMultiHX711(TestCase):
+    """Tests for reading several HX711 on one clock line."""
+
+    def setUp(self):
+        self.values = [100, -200, 300, -400]
+        self.chips = [
+            SimulatedHX711(dout_pin=10 + index, pd_sck_pin=6, value=value, power_down_time=1)
+            for index, value in enumerate(self.values)
+        ]
+        self.multi = MultiHX711(
+            dout_pins=[chip.dout_pin for chip in self.chips],
+            pd_sck_pin=6,
+            gpio=SimulatedGPIO(*self.chips)
+        )
+        # tolerate what the simulated chips tolerate, see create_simulated_hx711
+        self.multi._frame_timer.limit = self.chips[0].period
+
+    def test_01_read_frames(self):
+        self.assertEqual(4, len(self.multi))
+        self.assertEqual([self.values] * 3, self.multi.get_raw_data(times=3))
+
+    def test_02_one_clock_for_all_chips(self):
+        frames = [chip.frames for chip in self.chips]
+        self.multi.get_raw_data(times=2)
+        for chip, before in zip(self.chips, frames):
+            self.assertEqual(before + 2, chip.frames)
+
+    def test_03_setting_applies_to_all_chips(self):
+        self.multi.channel = 'B'
+        self.assertEqual([('B', 32)] * 4, [chip.setting for chip in self.chips])
+        with self.assertRaises(ParameterValidationError):
+            self.multi.channel = 'C'
+
+    def test_04_invalid_data_of_one_chip(self):
+        self.chips[1].value = 0x7fffff
+        frame = False
+        while frame is False:  # scheduling jitter may spoil the timing of a frame
+            frame = self.multi.read()
+        self.assertEqual([100, None, 300, -400], frame)
+
+    def test_05_pins_have_to_be_integers(self):
+        with self.assertRaises(TypeError):
+            MultiHX711(dout_pins=[5, "foo"], pd_sck_pin=6, gpio=SimulatedGPIO())
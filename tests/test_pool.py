@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import time
+from unittest import TestCase
+
+from hx711 import HX711
+from hx711.pool import HX711Pool
+from hx711.simulator import (
+    SimulatedGPIO,
+    SimulatedHX711
+)
+
+
+class TestHX711Pool(TestCase):
+    """Tests for servicing many HX711 from one thread."""
+
+    def setUp(self):
+        self.chips = {
+            "fast": SimulatedHX711(dout_pin=5, pd_sck_pin=6, rate=80, value=100, power_down_time=1),
+            "slow": SimulatedHX711(dout_pin=7, pd_sck_pin=8, rate=10, value=200, power_down_time=1),
+        }
+        gpio = SimulatedGPIO(*self.chips.values())
+        # nothing is connected to pin 9, the pull up keeps DOUT high
+        gpio.setup(9, gpio.IN, pull_up_down=gpio.PUD_UP)
+        self.sensors = {
+            name: HX711(dout_pin=chip.dout_pin, pd_sck_pin=chip.pd_sck_pin, gpio=gpio)
+            for name, chip in self.chips.items()
+        }
+        self.sensors["dead"] = HX711(dout_pin=9, pd_sck_pin=10, gpio=gpio)
+
+    def test_01_samples_are_tagged(self):
+        pool = HX711Pool(self.sensors, deadline=0.2)
+        pool.start()
+        try:
+            time.sleep(0.5)
+        finally:
+            self.assertTrue(pool.stop(timeout=1))
+        samples = []
+        while not pool.samples.empty():
+            samples.append(pool.samples.get())
+        by_sensor = {}
+        for sample in samples:
+            by_sensor.setdefault((sample.sensor, sample.status), []).append(sample.value)
+
+        self.assertEqual({None}, set(by_sensor[("dead", "timeout")]))
+        self.assertIn(len(by_sensor[("dead", "timeout")]), [2, 3])
+        # the dead sensor must not slow down the others
+        self.assertGreater(len(by_sensor[("fast", "ok")]), 25)
+        self.assertEqual({100}, set(by_sensor[("fast", "ok")]))
+        self.assertIn(len(by_sensor[("slow", "ok")]), range(3, 7))
+        self.assertEqual({200}, set(by_sensor[("slow", "ok")]))
+
+    def test_02_bounded_queue_drops_samples(self):
+        pool = HX711Pool(self.sensors, queue_size=1, deadline=10)
+        time.sleep(0.1)
+        self.assertEqual(2, pool.poll_once())
+        self.assertEqual(1, pool.samples.qsize())
+        self.assertEqual(1, pool.dropped)
+
+    def test_03_sensor_names_default_to_indices(self):
+        pool = HX711Pool([self.sensors["fast"]])
+        self.assertEqual([0], list(pool.sensors))
+        with self.assertRaises(ValueError):
+            HX711Pool([])
+
+    def test_04_recovery_does_not_block_the_others(self):
+        metrics = {name: self.sensors[name].enable_metrics() for name in self.chips}
+        pool = HX711Pool(self.sensors, deadline=10)
+        # the first gain pulse takes 1ms, the HX711 may have powered down
+        self.sensors["fast"]._gpio.stall(pulse=24, duration=0.001)
+        start = time.perf_counter()
+        while time.perf_counter() - start < 0.3:
+            if not pool.poll_once():
+                time.sleep(0.0005)
+        by_sensor = {}
+        while not pool.samples.empty():
+            sample = pool.samples.get()
+            by_sensor.setdefault(sample.sensor, []).append(sample.status)
+
+        for name in self.chips:
+            self.assertEqual(len(by_sensor[name]), metrics[name].reads)
+        self.assertGreaterEqual(sum(metrics[name].power_down_recoveries for name in self.chips), 1)
+        self.assertGreaterEqual(by_sensor["fast"].count("unsettled") + by_sensor["slow"].count("unsettled"), 3)
+        # even if the slow sensor recovers, the fast one goes on
+        self.assertGreater(by_sensor["fast"].count("ok"), 10)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import time
+from array import array
+from unittest import TestCase
+
+from hx711 import GenericHX711Exception
+from hx711.process import AcquisitionProcess, SharedRing
+from hx711.simulator import create_simulated_hx711
+
+
+def simulated_hx711(value):
+    hx711, _ = create_simulated_hx711(value=value, power_down_time=1)
+    return hx711
+
+
+def failing_hx711():
+    raise GenericHX711Exception("no HX711 connected")
+
+
+class TestSharedRing(TestCase):
+    """Tests for the ring in shared memory."""
+
+    def setUp(self):
+        self.ring = SharedRing.create(4)
+        self.addCleanup(self.ring.unlink)
+        self.addCleanup(self.ring.close)
+
+    def test_01_since(self):
+        for value in range(6):
+            self.ring.append(value / 10, value)
+        self.assertEqual(4, len(self.ring))
+        timestamps, values, position = self.ring.since(0)
+        self.assertEqual(array('d', [0.2, 0.3, 0.4, 0.5]), timestamps)
+        self.assertEqual(array('i', [2, 3, 4, 5]), values)
+        self.assertEqual(6, position)
+        self.ring.append(0.6, 6)
+        self.assertEqual((array('d', [0.6]), array('i', [6]), 7), self.ring.since(position))
+
+    def test_02_attach(self):
+        other = SharedRing.attach(self.ring.name)
+        self.addCleanup(other.close)
+        self.ring.append(1.5, -7)
+        self.assertEqual(4, other.size)
+        self.assertEqual(1, other.count)
+        # both share the memory
+        self.assertEqual(-7, other.values[0])
+        self.assertEqual(1.5, other.timestamps[0])
+
+
+class TestAcquisitionProcess(TestCase):
+    """Tests for reading a simulated HX711 in a worker process."""
+
+    def test_01_acquire(self):
+        acquisition = AcquisitionProcess(4321, size=64, hx711_factory=simulated_hx711)
+        self.addCleanup(acquisition.close)
+        ring = acquisition.start()
+        self.assertTrue(acquisition.running)
+        with self.assertRaises(GenericHX711Exception):
+            acquisition.start()
+
+        client = SharedRing.attach(ring.name)
+        self.addCleanup(client.close)
+        deadline = time.monotonic() + 10
+        while client.count < 5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(acquisition.stop(timeout=5))
+        self.assertFalse(acquisition.running)
+
+        timestamps, values, position = client.since(0)
+        self.assertGreaterEqual(position, 5)
+        self.assertEqual([4321] * len(values), list(values))
+        self.assertEqual(sorted(timestamps), list(timestamps))
+        self.assertLessEqual(timestamps[-1], time.monotonic())
+
+    def test_02_factory_fails(self):
+        acquisition = AcquisitionProcess(size=64, hx711_factory=failing_hx711)
+        self.addCleanup(acquisition.close)
+        acquisition.start()
+        deadline = time.monotonic() + 10
+        while acquisition.running and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertFalse(acquisition.running)
+        # the ended worker does not block a new start
+        acquisition.start()
+        self.assertTrue(acquisition.stop(timeout=5))
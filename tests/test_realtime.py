@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import gc
+import time
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from hx711 import realtime
+from hx711.realtime import RealtimeMode
+from hx711.simulator import create_simulated_hx711
+
+
+class TestRealtimeMode(TestCase):
+    """Tests for the realtime settings."""
+
+    def test_01_invalid_priority(self):
+        with self.assertRaises(ValueError):
+            RealtimeMode(priority=100)
+
+    def test_02_apply(self):
+        libc = MagicMock()
+        libc.mlockall.return_value = 0
+        with patch.object(realtime.os, 'sched_setaffinity') as sched_setaffinity, \
+                patch.object(realtime.os, 'sched_setscheduler') as sched_setscheduler, \
+                patch.object(realtime, '_libc', return_value=libc):
+            report = RealtimeMode(cpu=2, priority=10).apply()
+        self.assertEqual({"cpu": True, "sched_fifo": True, "mlockall": True}, report)
+        sched_setaffinity.assert_called_once_with(0, {2})
+        self.assertEqual(realtime.os.SCHED_FIFO, sched_setscheduler.call_args[0][1])
+        libc.mlockall.assert_called_once_with(realtime.MCL_CURRENT | realtime.MCL_FUTURE)
+
+    def test_03_report_missing_privileges(self):
+        libc = MagicMock()
+        libc.mlockall.return_value = -1
+        with patch.object(realtime.os, 'sched_setscheduler', side_effect=PermissionError(1, "not permitted")), \
+                patch.object(realtime, '_libc', return_value=libc), \
+                self.assertLogs(level='WARNING') as logs:
+            report = RealtimeMode(priority=10).apply()
+        self.assertEqual({"sched_fifo": False, "mlockall": False}, report)
+        self.assertEqual(2, len(logs.output))
+
+    def test_04_stream(self):
+        hx711, chip = create_simulated_hx711(value=1000, power_down_time=1)
+        mode = RealtimeMode(cpu=0, priority=None, lock_memory=False)
+        hx711.start_stream(buffer_size=16, realtime=mode)
+        deadline = time.perf_counter() + 5
+        while hx711.stream_buffer.count < 3 and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(hx711.stop_stream(timeout=1))
+        self.assertEqual({"cpu": True, "suspend_gc": True}, hx711.realtime_report)
+        # restored when the stream has stopped
+        self.assertFalse(hx711.suspend_gc)
+        self.assertEqual([1000] * 3, list(hx711.latest(3)))
+        self.assertTrue(gc.isenabled())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import io
+import os
+import tempfile
+import time
+from unittest import TestCase
+
+from hx711 import HX711
+from hx711.replay import FRAME, FrameRecorder, Recording, ReplayGPIO
+from hx711.samples import FLAG_INVALID, FLAG_NOT_READY
+from hx711.simulator import create_simulated_hx711
+
+
+class TestReplay(TestCase):
+    """Tests for recording raw frames and replaying them."""
+
+    def record(self, values):
+        hx711, chip = create_simulated_hx711(value=values[0], power_down_time=1)
+        file = io.BytesIO()
+        hx711.record_frames(file)
+        for value in values:
+            chip.value = value
+            # the first reading may still have been converted before
+            data = hx711._read()
+            while data is False or data != value:
+                data = hx711._read()
+        hx711.stop_recording()
+        file.seek(0)
+        return Recording.load(file)
+
+    def test_01_record(self):
+        recording = self.record([100, -100, 0])
+        self.assertGreaterEqual(len(recording), 3)
+        self.assertEqual([100, -100, 0], list(recording.values())[-3:])
+        self.assertEqual(0xffff9c, recording.words[-2])
+        self.assertEqual(1, recording.pulses[-1])
+        self.assertEqual(sorted(recording.timestamps), list(recording.timestamps))
+        self.assertGreater(recording.clock_outs[-1], 0)
+
+    def test_02_file(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "frames.bin")
+        with FrameRecorder(path) as recorder:
+            recorder.record(1234, 0.05, 0.0001, 1)
+            recorder.record(0, 0.25, 0, 1, "not_ready")
+            recorder.record(0x7fffff, 0.05, 0.0001, 3, "invalid")
+        with open(path, 'ab') as f:
+            f.write(b'\0' * (FRAME.size - 1))
+        recording = Recording.load(path)
+        self.assertEqual(3, len(recording))
+        self.assertEqual([0, FLAG_NOT_READY, FLAG_INVALID], list(recording.flags))
+        self.assertEqual([50000, 250000, 50000], list(recording.ready_waits))
+        self.assertEqual([1234], list(recording.values()))
+        with self.assertRaises(ValueError):
+            Recording.load(io.BytesIO(b'XXXX' + b'\0' * 30))
+
+    def test_03_replay(self):
+        values = [5, -7, 8388607 - 1, -8388608 + 1, 0]
+        recording = self.record(values)
+        # a frame without data is not replayed
+        recording.words.insert(0, 0)
+        recording.flags.insert(0, FLAG_NOT_READY)
+        for name in ("timestamps", "ready_waits", "clock_outs", "pulses"):
+            column = getattr(recording, name)
+            column.insert(0, column[0])
+        gpio = ReplayGPIO(recording)
+        hx711 = HX711(dout_pin=5, pd_sck_pin=6, gpio=gpio)
+        # nothing powers down when a replay is delayed
+        hx711._frame_timer.limit = float('inf')
+        hx711._unsettled = 0
+        gpio.rewind()
+        replayed = []
+        while not gpio.finished:
+            data = hx711._read(max_tries=1)
+            if data is not False:
+                replayed.append(data)
+        self.assertEqual(values, replayed[-len(values):])
+        self.assertEqual(list(recording.values()), replayed)
+        self.assertEqual(len(replayed), gpio.position)
+        self.assertIs(False, hx711._read(max_tries=1))
+        with self.assertRaises(RuntimeError):
+            gpio.wait_for_edge(5, ReplayGPIO.FALLING)
+
+    def test_04_replay_invalid(self):
+        recording = Recording()
+        for word, flags in ((1, 0), (1, 0), (0x7fffff, FLAG_INVALID), (2, 0)):
+            for name, value in (("timestamps", 0), ("ready_waits", 0), ("clock_outs", 0), ("words", word),
+                                ("pulses", 1), ("flags", flags)):
+                getattr(recording, name).append(value)
+        gpio = ReplayGPIO(recording)
+        hx711 = HX711(dout_pin=5, pd_sck_pin=6, gpio=gpio)
+        # nothing powers down when a replay is delayed
+        hx711._frame_timer.limit = float('inf')
+        hx711._unsettled = 0
+        gpio.rewind()
+        self.assertEqual(1, hx711._read())
+        self.assertEqual(1, hx711._read())
+        self.assertIs(False, hx711._read())
+        self.assertEqual("invalid", hx711._last_failure)
+        self.assertEqual(2, hx711._read())
+
+    def test_05_recorded_pace(self):
+        recording = Recording()
+        for index in range(3):
+            for name, value in (("timestamps", index * 20000000), ("ready_waits", 0), ("clock_outs", 0),
+                                ("words", index), ("pulses", 1), ("flags", 0)):
+                getattr(recording, name).append(value)
+        gpio = ReplayGPIO(recording, speed=2.0)
+        hx711 = HX711(dout_pin=5, pd_sck_pin=6, gpio=gpio)
+        # nothing powers down when a replay is delayed
+        hx711._frame_timer.limit = float('inf')
+        hx711._unsettled = 0
+        gpio.rewind()
+        start = time.perf_counter()
+        self.assertEqual([0, 1, 2], [hx711._read(), hx711._read(), hx711._read()])
+        # the frames are 20ms apart, played twice as fast
+        self.assertGreaterEqual(time.perf_counter() - start, 0.015)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import time
+from array import array
+from unittest import TestCase
+
+from hx711 import GenericHX711Exception
+from hx711.ringbuffer import RingBuffer
+from hx711.simulator import create_simulated_hx711
+
+
+class TestRingBuffer(TestCase):
+    """Tests for the ring buffer."""
+
+    def test_01_latest(self):
+        buffer = RingBuffer(4)
+        for value in range(3):
+            buffer.append(value)
+        self.assertEqual(3, len(buffer))
+        self.assertEqual(array('i', [1, 2]), buffer.latest(2))
+        self.assertEqual(array('i', [0, 1, 2]), buffer.latest(10))
+
+    def test_02_wrap_around(self):
+        buffer = RingBuffer(4)
+        for value in range(10):
+            buffer.append(value)
+        self.assertEqual(4, len(buffer))
+        self.assertEqual(10, buffer.count)
+        self.assertEqual(array('i', [6, 7, 8, 9]), buffer.latest(4))
+
+    def test_03_since(self):
+        buffer = RingBuffer(4)
+        values, position = buffer.since(0)
+        self.assertEqual(array('i'), values)
+        for value in range(3):
+            buffer.append(value)
+        values, position = buffer.since(position)
+        self.assertEqual(array('i', [0, 1, 2]), values)
+        for value in range(3, 9):
+            buffer.append(value)
+        # 3 and 4 have been overwritten already
+        values, position = buffer.since(position)
+        self.assertEqual(array('i', [5, 6, 7, 8]), values)
+        self.assertEqual(9, position)
+
+    def test_04_size_validation(self):
+        with self.assertRaises(ValueError):
+            RingBuffer(0)
+
+
+class TestStream(TestCase):
+    """Tests for the continuous acquisition of the HX711 class."""
+
+    def test_01_start_and_stop_stream(self):
+        hx711, chip = create_simulated_hx711(value=-1234, wait_mode='edge', power_down_time=1)
+        buffer = hx711.start_stream(buffer_size=16)
+        try:
+            self.assertTrue(hx711.streaming)
+            with self.assertRaises(GenericHX711Exception):
+                hx711.get_raw_data(times=3)
+            with self.assertRaises(GenericHX711Exception):
+                hx711.start_stream()
+            samples = []
+            for sample in hx711.iter_stream():
+                samples.append(sample)
+                if len(samples) == 3:
+                    break
+            self.assertEqual([-1234] * 3, samples)
+            self.assertEqual(array('i', [-1234]), hx711.latest())
+        finally:
+            self.assertTrue(hx711.stop_stream(timeout=1))
+        self.assertFalse(hx711.streaming)
+        count = buffer.count
+        time.sleep(0.05)
+        self.assertEqual(count, buffer.count)
+        self.assertEqual([-1234, -1234], hx711.get_raw_data(times=2))
+
+    def test_02_no_setting_changes_while_streaming(self):
+        hx711, chip = create_simulated_hx711(value=-1234, wait_mode='edge', power_down_time=1)
+        hx711.start_stream(buffer_size=16)
+        try:
+            with self.assertRaises(GenericHX711Exception):
+                hx711.channel = 'B'
+            with self.assertRaises(GenericHX711Exception):
+                hx711.channel_a_gain = 64
+            self.assertEqual('A', hx711.channel)
+            self.assertEqual(128, hx711.channel_a_gain)
+            self.assertEqual(1, hx711._gain_pulses)
+        finally:
+            self.assertTrue(hx711.stop_stream(timeout=1))
+        self.assertEqual(('A', 128), chip.setting)
+
+    def test_03_power_down_while_streaming(self):
+        hx711, chip = create_simulated_hx711(
+            value=lambda channel, gain, timestamp: 1000 if channel == 'A' else -500,
+            channel='B', rate=80, wait_mode='edge', power_down_time=0.002
+        )
+        hx711.start_stream(buffer_size=64)
+        try:
+            # the HX711 powers down during a gain pulse
+            hx711._gpio.stall(pulse=24, duration=0.003)
+            samples = []
+            for sample in hx711.iter_stream():
+                samples.append(sample)
+                if len(samples) == 10:
+                    break
+            self.assertTrue(hx711.streaming)
+        finally:
+            self.assertTrue(hx711.stop_stream(timeout=1))
+        self.assertEqual(1, chip.power_downs)
+        self.assertEqual([-500] * 10, samples)
+        self.assertIsNone(hx711.stream_error)
+
+    def test_04_error_ends_the_stream(self):
+        hx711, chip = create_simulated_hx711(value=-1234, wait_mode='edge', power_down_time=1)
+
+        def broken_clock_out():
+            raise GenericHX711Exception("broken")
+
+        hx711._clock_out = broken_clock_out
+        hx711.start_stream(buffer_size=16)
+        with self.assertRaises(GenericHX711Exception):
+            for _ in hx711.iter_stream():
+                pass
+        self.assertFalse(hx711.streaming)
+        self.assertEqual("broken", str(hx711.stream_error))
+        self.assertTrue(hx711.stop_stream(timeout=1))
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from array import array
+from unittest import TestCase, skipIf
+
+from hx711 import stats
+from hx711.samples import FLAG_INVALID, FLAG_NOT_READY, SampleBuffer
+from hx711.simulator import create_simulated_hx711
+
+
+class TestSampleBuffer(TestCase):
+    """Tests for the struct of arrays sample storage."""
+
+    def setUp(self):
+        self.samples = SampleBuffer()
+        self.samples.append(1000, -5, 'A', 128)
+        self.samples.append(2000, 0, 'B', 32, FLAG_NOT_READY)
+        self.samples.append(3000, 7, 'A', 64)
+
+    def test_01_records(self):
+        self.assertEqual(3, len(self.samples))
+        self.assertEqual(45, self.samples.nbytes)
+        sample = self.samples[1]
+        self.assertEqual((2000, 0, 'B', 32, FLAG_NOT_READY), (
+            sample.timestamp, sample.value, sample.channel, sample.gain, sample.flags
+        ))
+        self.assertFalse(sample.valid)
+        self.assertTrue(self.samples[-1].valid)
+        self.assertEqual(7, self.samples[-1].value)
+        with self.assertRaises(AttributeError):
+            sample.note = "records have no __dict__"
+        with self.assertRaises(IndexError):
+            self.samples[3]
+        self.assertEqual([-5, 0, 7], [sample.value for sample in self.samples])
+        self.assertEqual(array('i', [-5, 7]), self.samples.valid_values())
+
+    def test_02_slice_and_extend(self):
+        part = self.samples[1:]
+        self.assertEqual(array('q', [2000, 3000]), part.timestamps)
+        self.assertEqual(self.samples[2], part[1])
+        part.extend(self.samples)
+        self.assertEqual(5, len(part))
+        part.clear()
+        self.assertEqual(0, len(part))
+        self.assertEqual(3, len(self.samples))
+
+    def test_03_bytes(self):
+        data = self.samples.to_bytes()
+        self.assertEqual(12 + 45, len(data))
+        copy = SampleBuffer.from_bytes(data)
+        self.assertEqual(list(self.samples), list(copy))
+        with self.assertRaises(ValueError):
+            SampleBuffer.from_bytes(data[:-1])
+        with self.assertRaises(ValueError):
+            SampleBuffer.from_bytes(b'XXXX' + data[4:])
+
+    @skipIf(stats.numpy is None, "NumPy is not installed")
+    def test_04_numpy(self):
+        columns = self.samples.as_numpy()
+        self.assertEqual([1000, 2000, 3000], columns["timestamps"].tolist())
+        self.assertEqual(stats.numpy.int32, columns["values"].dtype)
+
+
+class TestReadSamples(TestCase):
+    """Tests for HX711.read_samples."""
+
+    def test_01_read_samples(self):
+        hx711, chip = create_simulated_hx711(value=1000, power_down_time=1)
+        samples = hx711.read_samples(times=3)
+        self.assertEqual(3, len(samples))
+        self.assertEqual(sorted(samples.timestamps), list(samples.timestamps))
+        self.assertEqual([('A', 128)] * 3, [(sample.channel, sample.gain) for sample in samples])
+        self.assertEqual([1000] * len(samples.valid_values()), list(samples.valid_values()))
+
+        chip.value = 0x7fffff
+        hx711.read_samples(times=3, samples=samples)
+        self.assertEqual(6, len(samples))
+        # the first reading may still have been converted before
+        self.assertEqual(FLAG_INVALID, samples[-1].flags)
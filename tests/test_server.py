@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import asyncio
+from unittest import TestCase
+
+from hx711.aio import AsyncHX711
+from hx711.server import (
+    MAX_BATCH_SIZE,
+    MAX_DATAGRAM_SIZE,
+    SampleClient,
+    SampleServer,
+    _TcpClient,
+    decode_batch,
+    encode_batch
+)
+from hx711.simulator import create_simulated_hx711
+
+
+class TestBatches(TestCase):
+    """Tests for the encoding of batches."""
+
+    def test_01_round_trip(self):
+        samples = [(123456789, 0, -8388608), (123456790, 1, 8388607)]
+        data = encode_batch(7, samples)
+        self.assertEqual(10 + 2 * 14, len(data))
+        self.assertEqual((7, samples), decode_batch(data))
+        with self.assertRaises(ValueError):
+            decode_batch(data[:-1])
+        with self.assertRaises(ValueError):
+            decode_batch(b'XXXX' + data[4:])
+        self.assertLessEqual(len(encode_batch(0, [(0, 0, 0)] * MAX_BATCH_SIZE)), MAX_DATAGRAM_SIZE)
+
+    def test_02_slow_client(self):
+        class Writer(object):
+            def get_extra_info(self, name):
+                return ('127.0.0.1', 1)
+
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        asyncio.set_event_loop(loop)
+        self.addCleanup(asyncio.set_event_loop, None)
+        client = _TcpClient(Writer(), queue_size=2)
+        for frame in (b'1', b'2', b'3'):
+            client.send(frame)
+        self.assertEqual(1, client.dropped)
+        self.assertEqual([b'2', b'3'], [client.queue.get_nowait() for _ in range(2)])
+
+
+class TestSampleServer(TestCase):
+    """Tests for publishing simulated samples on localhost."""
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        sensors = []
+        self.chips = []
+        for pin, value in ((5, 1000), (13, -2000)):
+            hx711, chip = create_simulated_hx711(dout_pin=pin, pd_sck_pin=6, value=value, power_down_time=1)
+            sensors.append(AsyncHX711(hx711))
+            self.chips.append(chip)
+        self.server = SampleServer(sensors, batch_size=4, batch_interval=0.05)
+        self.server.restart_delay = 0.05
+        self.loop.run_until_complete(self.server.start())
+        self.addCleanup(self.loop.run_until_complete, self.server.close())
+
+    def receive(self, client, samples=12):
+        async def collect():
+            received = []
+            while len(received) < samples:
+                batch = await asyncio.wait_for(client.receive(), 5)
+                received.extend(batch.samples)
+            return received
+        return self.loop.run_until_complete(collect())
+
+    def check_samples(self, samples):
+        self.assertEqual({0: {1000}, 1: {-2000}}, {
+            sensor: {value for _, index, value in samples if index == sensor} for sensor in (0, 1)
+        })
+
+    def test_01_tcp(self):
+        client = self.loop.run_until_complete(SampleClient.connect('127.0.0.1', self.server.tcp_port))
+        self.check_samples(self.receive(client))
+        self.assertEqual(0, client.lost)
+        self.assertEqual(1, len(self.server.stats()["clients"]))
+        self.loop.run_until_complete(client.close())
+
+    def test_02_udp(self):
+        client = self.loop.run_until_complete(SampleClient.subscribe('127.0.0.1', self.server.udp_port))
+        self.check_samples(self.receive(client))
+        self.assertEqual(1, len(self.server.stats()["subscribers"]))
+        self.loop.run_until_complete(client.close())
+
+        async def wait_for_unsubscription():
+            while self.server.stats()["subscribers"]:
+                await asyncio.sleep(0.01)
+        self.loop.run_until_complete(asyncio.wait_for(wait_for_unsubscription(), 5))
+
+    def test_03_disconnect(self):
+        client = self.loop.run_until_complete(SampleClient.connect('127.0.0.1', self.server.tcp_port))
+        self.receive(client, samples=1)
+        self.loop.run_until_complete(client.close())
+
+        async def wait_for_disconnection():
+            while self.server.stats()["clients"]:
+                await asyncio.sleep(0.01)
+        self.loop.run_until_complete(asyncio.wait_for(wait_for_disconnection(), 5))
+
+    def test_04_sensor_restarts(self):
+        async def wait_for_state(state):
+            while self.server.stats()["sensors"][1]["state"] != state:
+                await asyncio.sleep(0.01)
+
+        # every reading is rejected, the sensor gives up
+        self.chips[1].value = 0x7fffff
+        self.loop.run_until_complete(asyncio.wait_for(wait_for_state("restarting"), 5))
+        self.assertEqual("running", self.server.stats()["sensors"][0]["state"])
+        self.chips[1].value = -2000
+        self.loop.run_until_complete(asyncio.wait_for(wait_for_state("running"), 5))
+        sensor = self.server.stats()["sensors"][1]
+        self.assertGreaterEqual(sensor["restarts"], 1)
+        self.assertIn("no valid value", sensor["error"])
+        client = self.loop.run_until_complete(SampleClient.connect('127.0.0.1', self.server.tcp_port))
+        self.check_samples(self.receive(client))
+        self.loop.run_until_complete(client.close())
@@ -0,0 +1,273 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import time
+from unittest import TestCase
+
+from hx711 import HX711, GenericHX711Exception, _ConversionClock
+from hx711.simulator import (
+    SimulatedGPIO,
+    SimulatedHX711,
+    create_simulated_hx711
+)
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSimulatedHX711(TestCase):
+    """Tests for the simulated chip."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.chip = SimulatedHX711(
+            dout_pin=5,
+            pd_sck_pin=6,
+            rate=80,
+            value=-1234,
+            clock=self.clock
+        )
+        self.chip.settling_conversions = 0
+        self.chip._settle_left = 0
+
+    def clock_out(self, pulses):
+        word = 0
+        for index in range(pulses):
+            self.clock.now += 0.000001
+            self.chip.sck(True)
+            self.clock.now += 0.000001
+            self.chip.sck(False)
+            if index < 24:
+                word = (word << 1) | self.chip.dout()
+        return word
+
+    def test_01_dout_goes_low_with_the_conversion_rate(self):
+        self.assertEqual(1, self.chip.dout())
+        self.clock.now = 0.0124
+        self.assertEqual(1, self.chip.dout())
+        self.clock.now = 0.0125
+        self.assertEqual(0, self.chip.dout())
+
+    def test_02_shift_out_twos_complement(self):
+        self.clock.now = 0.013
+        self.assertEqual(-1234 & 0xffffff, self.clock_out(25))
+        self.assertEqual(1, self.chip.dout())
+        self.assertEqual(1, self.chip.frames)
+
+    def test_03_pulse_count_selects_channel_and_gain(self):
+        mapping = {
+            25: ('A', 128),
+            26: ('B', 32),
+            27: ('A', 64)
+        }
+        for pulses, setting in mapping.items():
+            with self.subTest(pulses):
+                self.clock.now += self.chip.period
+                self.clock_out(pulses)
+                self.assertEqual(setting, self.chip.setting)
+
+    def test_04_sck_high_for_60us_powers_down(self):
+        self.clock.now = 0.013
+        self.clock_out(26)
+        self.chip.sck(True)
+        self.clock.now += 0.0001
+        self.assertEqual(1, self.chip.dout())
+        self.assertFalse(self.chip.powered)
+        self.chip.sck(False)
+        self.assertTrue(self.chip.powered)
+        self.assertEqual(1, self.chip.power_downs)
+        self.assertEqual(('A', 128), self.chip.setting)
+
+    def test_05_rate_validation(self):
+        with self.assertRaises(ValueError):
+            SimulatedHX711(dout_pin=5, pd_sck_pin=6, rate=20)
+
+    def test_06_shared_clock_line(self):
+        other = SimulatedHX711(dout_pin=7, pd_sck_pin=6, value=42, clock=self.clock)
+        gpio = SimulatedGPIO(self.chip, other, clock=self.clock)
+        self.clock.now = 0.013
+        gpio.output(6, True)
+        self.assertEqual(1, self.chip._pulses)
+        self.assertEqual(1, other._pulses)
+
+
+class TestSimulatedHX711WithDriver(TestCase):
+    """Tests for the HX711 class driving a simulated chip."""
+
+    def test_01_get_raw_data(self):
+        # do not let scheduling jitter of the test machine power down the chip
+        hx711, chip = create_simulated_hx711(value=-1234, channel='A', gain=64, power_down_time=1)
+        self.assertEqual([-1234] * 3, hx711.get_raw_data(times=3))
+        self.assertEqual(('A', 64), chip.setting)
+        hx711.channel = 'B'
+        self.assertEqual(('B', 32), chip.setting)
+
+    def test_02_edge_wait_mode(self):
+        hx711, chip = create_simulated_hx711(value=-1234, wait_mode='edge', power_down_time=1)
+        chip.ready_latencies.clear()
+        self.assertEqual([-1234] * 5, hx711.get_raw_data(times=5))
+        latencies = sorted(chip.ready_latencies)
+        # polling every 10ms would be several milliseconds late on average
+        self.assertLess(latencies[len(latencies) // 2], 0.002)
+
+    def test_03_edge_wait_mode_falls_back_to_polling(self):
+        hx711, chip = create_simulated_hx711(value=-1234, wait_mode='edge', power_down_time=1)
+        hx711._gpio.edge_detection = False
+        self.assertEqual([-1234] * 2, hx711.get_raw_data(times=2))
+        self.assertFalse(hx711._edge_detection)
+
+    def test_04_fast_read_mode(self):
+        hx711, chip = create_simulated_hx711(value=-1234, read_mode='fast', power_down_time=1)
+        for channel, gain, setting in [('A', 64, ('A', 64)), ('A', 128, ('A', 128)), ('B', 128, ('B', 32))]:
+            with self.subTest(setting=setting):
+                hx711.channel = channel
+                if channel == 'A':
+                    hx711.channel_a_gain = gain
+                self.assertEqual([-1234] * 2, hx711.get_raw_data(times=2))
+                self.assertEqual(setting, chip.setting)
+
+    def test_05_interleaved_channels(self):
+        values = {('A', 128): 1000, ('A', 64): 500, ('B', 32): -300}
+        hx711, chip = create_simulated_hx711(
+            value=lambda channel, gain, timestamp: values[(channel, gain)],
+            wait_mode='edge',
+            power_down_time=1
+        )
+        start = time.perf_counter()
+        samples = list(hx711.iter_interleaved(settings=(('A', 128), ('B', 32), ('A', 64)), count=6))
+        elapsed = time.perf_counter() - start
+        expected = [('A', 128), ('B', 32), ('A', 64)] * 2
+        self.assertEqual([setting + (values[setting],) for setting in expected], samples)
+        # 6 samples, one discarded reading and one to restore the setting at 80 SPS
+        self.assertLess(elapsed, 0.2)
+        self.assertEqual(('A', 128), chip.setting)
+        self.assertEqual(1, hx711._gain_pulses)
+
+    def test_06_predict_wait_mode(self):
+        for rate in (80, 10):
+            with self.subTest(rate):
+                hx711, chip = create_simulated_hx711(rate=rate, value=-1234, wait_mode='predict', power_down_time=1)
+                hx711.get_raw_data(times=5)
+                chip.ready_latencies.clear()
+                self.assertEqual([-1234] * 10, hx711.get_raw_data(times=10))
+                self.assertAlmostEqual(rate, hx711.sample_rate, delta=rate * 0.02)
+                self.assertLess(abs(hx711.rate_drift), 0.02)
+                latencies = sorted(chip.ready_latencies)
+                self.assertLess(latencies[len(latencies) // 2], 0.002)
+
+    def test_07_conversion_clock(self):
+        clock = _ConversionClock()
+        self.assertIsNone(clock.next_ready(0))
+        clock.observe(0.5)
+        # too long for a single period
+        clock.observe(1.0)
+        self.assertIsNone(clock.period)
+        # a conversion was skipped
+        clock.observe(1.025)
+        self.assertAlmostEqual(0.025, clock.period)
+        clock.observe(1.0375)
+        self.assertAlmostEqual(0.0125, clock.period)
+        # two periods, the first periods are averaged evenly
+        clock.observe(1.0626)
+        self.assertAlmostEqual(0.012525, clock.period)
+        self.assertAlmostEqual(1.075125, clock.next_ready(1.07))
+        self.assertAlmostEqual(1.0626, clock.next_ready(1.0627, margin=0.001) - clock.period)
+        self.assertAlmostEqual(-0.002, clock.drift, places=5)
+        clock.reset()
+        self.assertIsNone(clock.next_ready(2))
+
+    def test_08_interleaved_channels_after_power_down(self):
+        values = {('A', 128): 1000, ('A', 64): 500, ('B', 32): -300}
+        hx711, chip = create_simulated_hx711(
+            value=lambda channel, gain, timestamp: values[(channel, gain)],
+            wait_mode='edge',
+            power_down_time=0.002
+        )
+        samples = []
+        for sample in hx711.iter_interleaved(settings=(('A', 64), ('B', 32)), count=6):
+            samples.append(sample)
+            if len(samples) == 2:
+                # PD_SCK stays high until the HX711 powers down
+                hx711._gpio.stall(pulse=0, duration=0.003)
+        self.assertEqual(1, chip.power_downs)
+        self.assertEqual([setting + (values[setting],) for setting in [sample[:2] for sample in samples]], samples)
+        self.assertEqual(('A', 128), chip.setting)
+
+    def test_09_unsettled_readings_after_power_down(self):
+        for read_mode in ('normal', 'fast'):
+            with self.subTest(read_mode=read_mode):
+                hx711, chip = create_simulated_hx711(
+                    value=lambda channel, gain, timestamp: 1000 if channel == 'A' else -500,
+                    channel='B', rate=80, read_mode=read_mode, power_down_time=0.002
+                )
+                self.assertEqual([-500] * 2, hx711.get_raw_data(times=2))
+                metrics = hx711.enable_metrics()
+                # PD_SCK stays high until the HX711 powers down
+                hx711._gpio.stall(pulse=0, duration=0.003)
+                # the HX711 restarts with channel A, the conversions until channel B has settled are rejected
+                self.assertEqual([-500] * 5, hx711.get_raw_data(times=5))
+                self.assertEqual(1, chip.power_downs)
+                self.assertEqual(1, metrics.timing_violations)
+                self.assertEqual(hx711.conversions_to_discard(), metrics.unsettled_readings)
+
+
+class TestDeadlineReads(TestCase):
+    """Tests for reads bounded by a deadline."""
+
+    def dead_hx711(self):
+        gpio = SimulatedGPIO()
+        # nothing pulls DOUT low
+        gpio.setup(5, SimulatedGPIO.IN, pull_up_down=SimulatedGPIO.PUD_UP)
+        return HX711(dout_pin=5, pd_sck_pin=6, gpio=gpio)
+
+    def test_01_complete(self):
+        hx711, chip = create_simulated_hx711(value=0, power_down_time=1)
+        result = hx711.read_with_deadline(times=3, timeout=1)
+        self.assertEqual(([0] * 3, "ok"), result[:2])
+        # 0 is a valid value
+        self.assertEqual([0] * 2, hx711.get_raw_data(times=2))
+
+    def test_02_not_ready(self):
+        hx711 = self.dead_hx711()
+        start = time.perf_counter()
+        result = hx711.read_with_deadline(times=3, timeout=5)
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertEqual(([], "not_ready", {"not_ready": 1}), result)
+
+        start = time.perf_counter()
+        result = hx711.read_with_deadline(times=3, timeout=0.05)
+        self.assertLess(time.perf_counter() - start, 0.2)
+        self.assertEqual(([], "timeout"), result[:2])
+        with self.assertRaises(GenericHX711Exception):
+            hx711.get_raw_data(times=3, timeout=0.05)
+
+    def test_03_invalid(self):
+        hx711, chip = create_simulated_hx711(value=0x7fffff, power_down_time=1)
+        result = hx711.read_with_deadline(times=3, timeout=0.1)
+        self.assertEqual(([], "invalid"), result[:2])
+        self.assertGreaterEqual(result.failures["invalid"], 1)
+
+    def test_04_recovery_within_the_deadline(self):
+        hx711, chip = create_simulated_hx711(rate=80, value=1000, power_down_time=0.002)
+        # the HX711 powers down during every gain pulse
+        hx711._gpio.stall(pulse=24, duration=0.003, frames=None)
+        start = time.perf_counter()
+        result = hx711.read_with_deadline(times=3, timeout=0.2)
+        self.assertLess(time.perf_counter() - start, 0.4)
+        self.assertGreater(chip.power_downs, 0)
+        self.assertNotEqual("ok", result.status)
+        self.assertGreater(result.failures["unsettled"], 0)
+
+    def test_05_best_effort(self):
+        hx711, chip = create_simulated_hx711(rate=80, value=1000, power_down_time=1)
+        start = time.perf_counter()
+        result = hx711.read_best_effort(timeout=0.1)
+        self.assertLess(time.perf_counter() - start, 0.2)
+        self.assertEqual("ok", result.status)
+        # one conversion every 12.5ms
+        self.assertLessEqual(len(result.values), 9)
+        self.assertEqual([1000] * len(result.values), result.values)
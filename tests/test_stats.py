@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from array import array
+from unittest import TestCase, skipIf
+from unittest.mock import patch
+
+from hx711 import stats
+from hx711.simulator import create_simulated_hx711
+
+VALUES = [10, 12, 11, 13, 9, 10, 11, 12, 10, 500]
+
+
+class StatsTests(object):
+    """Tests run with and without NumPy."""
+
+    def test_01_mean_and_median(self):
+        self.assertAlmostEqual(59.8, stats.mean(VALUES))
+        self.assertEqual(11.0, stats.median(VALUES))
+        self.assertEqual(10.5, stats.median(array('i', [10, 11])))
+        with self.assertRaises(ValueError):
+            stats.mean([])
+
+    def test_02_trimmed_mean(self):
+        # 9 and 500 are cut off
+        self.assertAlmostEqual(11.125, stats.trimmed_mean(VALUES, proportion=0.1))
+        self.assertAlmostEqual(stats.mean(VALUES), stats.trimmed_mean(VALUES, proportion=0))
+        with self.assertRaises(ValueError):
+            stats.trimmed_mean(VALUES, proportion=0.5)
+
+    def test_03_reject_outliers(self):
+        self.assertEqual(VALUES[:-1], list(stats.reject_outliers(VALUES, method='mad')))
+        self.assertEqual(VALUES[:-1], list(stats.reject_outliers(VALUES, threshold=2, method='sigma')))
+        self.assertEqual([5, 5, 5], list(stats.reject_outliers([5, 5, 5], method='mad')))
+        self.assertAlmostEqual(10.888888, stats.robust_mean(VALUES), places=5)
+        with self.assertRaises(ValueError):
+            stats.reject_outliers(VALUES, method='iqr')
+
+    def test_04_large_values(self):
+        # sums of many 24 bit values exceed int32
+        values = array('i', [0x7ffffe]) * 10000
+        self.assertEqual(0x7ffffe, stats.mean(values))
+        self.assertEqual(0x7ffffe, stats.robust_mean(values))
+
+
+class TestStatsPurePython(StatsTests, TestCase):
+    """Tests for the fallback without NumPy."""
+
+    def setUp(self):
+        patcher = patch.object(stats, 'numpy', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_05_to_array(self):
+        values = stats.to_array([1, -2])
+        self.assertEqual(array('i', [1, -2]), values)
+        self.assertIs(values, stats.to_array(values))
+
+
+@skipIf(stats.numpy is None, "NumPy is not installed")
+class TestStatsNumPy(StatsTests, TestCase):
+    """Tests for the vectorized aggregation."""
+
+    def test_05_to_array(self):
+        values = stats.to_array([1, -2])
+        self.assertEqual(stats.numpy.int32, values.dtype)
+        self.assertEqual([1, -2], values.tolist())
+        # no copy of arrays of the ring buffer
+        buffer = array('i', [3, 4])
+        shared = stats.to_array(buffer)
+        buffer[0] = 5
+        self.assertEqual(5, shared[0])
+
+
+class TestGetRawDataAsArray(TestCase):
+    """Tests for HX711.get_raw_data returning an array."""
+
+    def test_01_as_array(self):
+        hx711, chip = create_simulated_hx711(value=1234, power_down_time=1)
+        values = hx711.get_raw_data(times=3, as_array=True)
+        self.assertEqual(3, len(values))
+        self.assertEqual(1234, stats.median(values))
+        self.assertEqual([1234] * 3, list(values))